@@ -402,28 +402,12 @@ See full documentation for paper links and implementation details.
         return [e.strip() for e in entries if e.strip()]
     
     def _get_pattern_explanation(self, pattern_name: str) -> str:
-        """Get explanation for a pattern type."""
-        explanations = {
-            "Quantum breakthrough": (
-                "This breakthrough leverages quantum mechanical phenomena that were previously "
-                "only accessible in specialized laboratories. The suggested experiment makes "
-                "quantum effects visible using inexpensive, readily available components."
-            ),
-            "Metamaterial lens": (
-                "Negative-index metamaterials were once theoretical constructs. This approach "
-                "demonstrates the effect using everyday materials, bridging the gap between "
-                "theoretical physics and hands-on experimentation."
-            ),
-            "Temporal periodicity": (
-                "Time crystals represent a new phase of matter. This simple analog demonstrates "
-                "the core concept of discrete time-translation symmetry breaking in an accessible way."
-            ),
-            "AI physics": (
-                "Machine learning is revolutionizing how we discover physical laws. This approach "
-                "shows how neural networks can rediscover classical mechanics from raw data."
-            ),
-        }
-        return explanations.get(pattern_name, "This breakthrough represents a significant finding in cross-disciplinary research.")
+        """Get explanation for a pattern type (from the rule registry)."""
+        from .rules import get_rules
+        rule = get_rules().get(pattern_name)
+        if rule and rule.details:
+            return rule.details
+        return "This breakthrough represents a significant finding in cross-disciplinary research."
     
     def _get_shopping_list(self, pattern_name: str) -> List[tuple]:
         """Get shopping list for a pattern."""
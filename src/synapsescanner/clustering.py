@@ -0,0 +1,167 @@
+"""Topic clustering over the connection graph.
+
+find_connections can return thousands of pairwise connections; clusters
+group them into the sets of related papers an analyst actually reads.
+
+- Union-find joins the two papers of every connection at or above a
+  strength threshold, giving connected components in near-linear time
+  (path halving plus union by size)
+- Optional label propagation splits large components into communities:
+  each paper repeatedly takes the label with the most connection
+  strength among its neighbours, until no label changes
+- Each cluster is described by the keywords and title words most of its
+  papers share
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, List, Tuple
+
+from .crossref import COMMON_TITLE_WORDS
+from .sources import Paper, Connection, Cluster
+
+
+class UnionFind:
+    """Disjoint sets over integers 0..n-1."""
+    
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+    
+    def find(self, x: int) -> int:
+        """Root of x's set (halving the path on the way)."""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    
+    def union(self, a: int, b: int) -> int:
+        """Merge the sets of a and b; return the new root."""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+
+def cluster_connections(connections: List[Connection], min_strength: int = 1,
+                        min_size: int = 2, communities: bool = False,
+                        max_iterations: int = 20, num_keywords: int = 5) -> List[Cluster]:
+    """Group connected papers into clusters.
+    
+    Args:
+        connections: Connections to cluster (e.g. from find_connections)
+        min_strength: Ignore connections weaker than this
+        min_size: Drop clusters with fewer papers
+        communities: Split components by label propagation
+        max_iterations: Label propagation rounds at most
+        num_keywords: Representative keywords per cluster
+        
+    Returns:
+        Clusters, largest (then strongest) first
+    """
+    index: Dict[Hashable, int] = {}
+    papers: List[Paper] = []
+    edges: List[Tuple[int, int, int]] = []
+    for conn in connections:
+        if conn.strength < min_strength:
+            continue
+        ends = []
+        for paper in (conn.paper_a, conn.paper_b):
+            key = (paper.id, paper.source)
+            if key not in index:
+                index[key] = len(papers)
+                papers.append(paper)
+            ends.append(index[key])
+        edges.append((ends[0], ends[1], conn.strength))
+    
+    if communities:
+        labels = _propagate_labels(len(papers), edges, max_iterations)
+    else:
+        sets = UnionFind(len(papers))
+        for a, b, _ in edges:
+            sets.union(a, b)
+        labels = [sets.find(i) for i in range(len(papers))]
+    
+    members = defaultdict(list)
+    for i, label in enumerate(labels):
+        members[label].append(i)
+    strengths = defaultdict(list)
+    for a, b, strength in edges:
+        if labels[a] == labels[b]:
+            strengths[labels[a]].append(strength)
+    
+    clusters = []
+    for label, nodes in members.items():
+        if len(nodes) < min_size:
+            continue
+        cluster_papers = [papers[i] for i in nodes]
+        edge_strengths = strengths[label]
+        clusters.append(Cluster(
+            papers=cluster_papers,
+            keywords=representative_keywords(cluster_papers, num_keywords),
+            connections=len(edge_strengths),
+            strength=sum(edge_strengths) / len(edge_strengths) if edge_strengths else 0.0,
+        ))
+    
+    clusters.sort(key=lambda c: (-len(c.papers), -c.strength))
+    return clusters
+
+
+def _propagate_labels(n: int, edges: List[Tuple[int, int, int]],
+                      max_iterations: int) -> List[int]:
+    """Community label per node by weighted label propagation.
+    
+    Nodes are visited in order and updated in place; ties keep the
+    current label if it is among the best, else take the smallest, so the
+    result is deterministic.
+    """
+    neighbours = [[] for _ in range(n)]
+    for a, b, strength in edges:
+        neighbours[a].append((b, strength))
+        neighbours[b].append((a, strength))
+    
+    labels = list(range(n))
+    for _ in range(max_iterations):
+        changed = False
+        for node in range(n):
+            if not neighbours[node]:
+                continue
+            weights = defaultdict(int)
+            for other, strength in neighbours[node]:
+                weights[labels[other]] += strength
+            best = max(weights.values())
+            if weights.get(labels[node]) == best:
+                continue
+            labels[node] = min(label for label, weight in weights.items() if weight == best)
+            changed = True
+        if not changed:
+            break
+    return labels
+
+
+def representative_keywords(papers: List[Paper], limit: int = 5) -> List[str]:
+    """Terms shared by the most papers of a cluster.
+    
+    Keywords count ahead of title words (minus common ones) on ties;
+    terms seen in a single paper are used only if nothing is shared.
+    """
+    counts: Counter = Counter()
+    for paper in papers:
+        keywords = {k.lower() for k in paper.keywords}
+        title_words = paper.title_words - COMMON_TITLE_WORDS - keywords
+        counts.update((term, 0) for term in keywords)
+        counts.update((term, 1) for term in title_words)
+    
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0][1], item[0][0]))
+    shared = [term for (term, _), count in ranked if count > 1]
+    terms = shared or [term for (term, _), _ in ranked]
+    
+    seen, result = set(), []
+    for term in terms:
+        if term not in seen:
+            seen.add(term)
+            result.append(term)
+    return result[:limit]
@@ -0,0 +1,129 @@
+"""Compressed column storage for the SynapseScanner cache.
+
+Values are deflated with zlib using an optional preset dictionary trained
+on the cached corpus. Short abstracts and JSON arrays share most of their
+vocabulary, so a preset dictionary lets zlib reference it from the first
+byte instead of having to learn it again in every row.
+
+Encoded values are BLOBs laid out as::
+    
+    version (1 byte) | dictionary id (4 bytes, 0 = none) | zlib stream
+
+Plain TEXT values are passed through untouched, so compressed and
+uncompressed rows can live side by side in the same table.
+"""
+import re
+import struct
+import zlib
+from collections import Counter
+from typing import Callable, Iterable, Optional, Union
+
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(">BI")
+
+# zlib only looks back 32 KiB, so a larger preset dictionary is wasted
+MAX_DICT_SIZE = 32 * 1024
+
+# Values shorter than this rarely shrink enough to pay for the header
+MIN_COMPRESS_SIZE = 64
+
+_TOKEN_RE = re.compile(r"\S+")
+
+
+def encode_text(text: Optional[str], dict_id: int = 0,
+                zdict: Optional[bytes] = None, level: int = 6) -> Union[str, bytes, None]:
+    """Compress text for storage, or return it unchanged if too short.
+    
+    Args:
+        text: Value to store
+        dict_id: ID of the preset dictionary (0 for none)
+        zdict: Preset dictionary bytes matching dict_id
+        level: zlib compression level
+    
+    Returns:
+        Encoded BLOB, or the original text when compression does not pay off
+    """
+    if not text or len(text) < MIN_COMPRESS_SIZE:
+        return text
+    
+    if zdict:
+        compressor = zlib.compressobj(level, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(level)
+        dict_id = 0
+    raw = text.encode("utf-8")
+    blob = _HEADER.pack(FORMAT_VERSION, dict_id) + compressor.compress(raw) + compressor.flush()
+    
+    return blob if len(blob) < len(raw) else text
+
+
+def decode_text(value: Union[str, bytes, None],
+                load_dict: Callable[[int], Optional[bytes]]) -> Optional[str]:
+    """Decode a stored value produced by encode_text.
+    
+    Args:
+        value: Column value (TEXT passes through, BLOB is decompressed)
+        load_dict: Returns preset dictionary bytes for a dictionary ID
+    
+    Returns:
+        Decoded text
+    """
+    if not isinstance(value, bytes):
+        return value
+    
+    version, dict_id = _HEADER.unpack_from(value)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compressed value version: {version}")
+    
+    if dict_id:
+        zdict = load_dict(dict_id)
+        if zdict is None:
+            raise ValueError(f"Missing compression dictionary: {dict_id}")
+        decompressor = zlib.decompressobj(zdict=zdict)
+    else:
+        decompressor = zlib.decompressobj()
+    data = decompressor.decompress(value[_HEADER.size:]) + decompressor.flush()
+    
+    return data.decode("utf-8")
+
+
+def train_dictionary(samples: Iterable[str], size: int = MAX_DICT_SIZE) -> bytes:
+    """Build a zlib preset dictionary from sample values.
+    
+    Frequent tokens and token pairs are scored by the bytes they would save
+    (frequency x length) and packed until the size budget is used. The most
+    valuable strings go last, since zlib finds nearer matches cheaper.
+    
+    Args:
+        samples: Representative column values (abstracts, JSON arrays)
+        size: Maximum dictionary size in bytes
+    
+    Returns:
+        Dictionary bytes (may be empty if there were no samples)
+    """
+    size = min(size, MAX_DICT_SIZE)
+    counts: Counter = Counter()
+    
+    for sample in samples:
+        if not sample:
+            continue
+        tokens = _TOKEN_RE.findall(sample)
+        counts.update(tokens)
+        counts.update(" ".join(pair) for pair in zip(tokens, tokens[1:]))
+    
+    # Strings seen once cannot save anything across rows
+    scored = sorted(
+        ((count * len(token), token) for token, count in counts.items() if count > 1),
+        reverse=True,
+    )
+    
+    chosen, used = [], 0
+    for _, token in scored:
+        piece = (token + " ").encode("utf-8")
+        if used + len(piece) > size:
+            continue
+        chosen.append(piece)
+        used += len(piece)
+    
+    chosen.reverse()
+    return b"".join(chosen)
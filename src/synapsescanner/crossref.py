@@ -1,142 +1,925 @@
 """Cross-reference engine for finding hidden connections between papers."""
-from typing import List, Set, Tuple
+import heapq
+import math
+import os
+import random
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 from collections import defaultdict
 from .sources import Paper, Connection
 
+try:
+    import numpy as np
+    from scipy import sparse
+    SPARSE_AVAILABLE = True
+except ImportError:
+    SPARSE_AVAILABLE = False
 
-def find_connections(papers: List[Paper], keyword_threshold: int = 3) -> List[Connection]:
+# Title words too common to suggest a shared topic
+COMMON_TITLE_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'of', 'in', 'on', 'to', 'for',
+    'with', 'by', 'from', 'as', 'is', 'are', 'was', 'were',
+    'study', 'analysis', 'research', 'using', 'based',
+})
+
+# Feature kinds, in PaperFeatures field order
+AUTHORS, KEYWORDS, TITLE_WORDS = range(3)
+
+
+def normalize_term(term: str) -> str:
+    """Normalized form of an author name or keyword: lowercased, whitespace collapsed.
+    
+    Both the in-memory vocabulary and the cache's term tables use this, so a
+    term has the same spelling wherever it is compared or looked up.
+    """
+    return " ".join(term.lower().split())
+
+
+@dataclass(frozen=True)
+class PaperFeatures:
+    """A paper's normalized comparison features, as interned term IDs."""
+    authors: FrozenSet[int]
+    keywords: FrozenSet[int]
+    title_words: FrozenSet[int]
+    
+    def kinds(self) -> Tuple[FrozenSet[int], FrozenSet[int], FrozenSet[int]]:
+        """Feature sets indexed by AUTHORS, KEYWORDS and TITLE_WORDS."""
+        return self.authors, self.keywords, self.title_words
+
+
+class FeatureVocabulary:
+    """Interns normalized author names, keywords and title words as integers.
+    
+    Features of every paper compared together must come from the same
+    vocabulary, since the IDs are only meaningful within it.
+    """
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self.terms)
+    
+    def intern(self, term: str) -> int:
+        """Return the ID for a term, assigning the next one if new."""
+        term_id = self._ids.get(term)
+        if term_id is None:
+            term_id = self._ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+    
+    def names(self, term_ids: Set[int]) -> List[str]:
+        """Terms for a set of IDs, alphabetically."""
+        return sorted(self.terms[i] for i in term_ids)
+    
+    def extract(self, paper: Paper) -> PaperFeatures:
+        """Compute a paper's features (see normalize_term; title minus common words)."""
+        intern = self.intern
+        title_words = paper.title_words - COMMON_TITLE_WORDS
+        return PaperFeatures(
+            authors=self._terms(paper.authors),
+            keywords=self._terms(paper.keywords),
+            title_words=frozenset(intern(w) for w in title_words),
+        )
+    
+    def _terms(self, values: List[str]) -> FrozenSet[int]:
+        """IDs of the normalized, non-blank values."""
+        terms = (normalize_term(value) for value in values)
+        return frozenset(self.intern(term) for term in terms if term)
+
+
+def extract_features(papers: List[Paper],
+                     vocabulary: Optional[FeatureVocabulary] = None
+                     ) -> Tuple[List[PaperFeatures], FeatureVocabulary]:
+    """Compute every paper's features once, in one shared vocabulary.
+    
+    Args:
+        papers: Papers to extract features from
+        vocabulary: Vocabulary to extend (default: a new one)
+        
+    Returns:
+        Tuple of (features in paper order, vocabulary)
+    """
+    vocabulary = vocabulary if vocabulary is not None else FeatureVocabulary()
+    return [vocabulary.extract(paper) for paper in papers], vocabulary
+
+
+def find_connections(papers: List[Paper], keyword_threshold: int = 3,
+                     max_posting: Optional[int] = None,
+                     vectorized: Optional[bool] = None,
+                     top_k: Optional[int] = None,
+                     min_strength: int = 1,
+                     workers: Optional[int] = None) -> List[Connection]:
     """Find connections between papers from different sources.
     
     Detects connections based on:
     - Shared authors
     - Shared keywords (case-insensitive)
+    - Shared title words
+    
+    Each paper's features are extracted once (see extract_features).
+    Papers are indexed by author, keyword and title word, and only
+    cross-source pairs whose overlap can give a non-zero strength are
+    scored, so the cost follows the number of real overlaps rather than
+    the number of pairs. The result is the same as comparing every pair.
+    
+    With NumPy and SciPy installed, overlap counts come from sparse
+    paper x term incidence matrices multiplied in bulk, and candidates are
+    the pairs the strength formula, applied to whole arrays, rates above
+    zero. Otherwise the same candidates come from posting lists in pure
+    Python.
+    
+    With ``top_k`` only a bounded heap of the best connections is kept
+    while scoring, so memory is O(top_k) rather than O(connections); the
+    result equals the first top_k of the full list.
+    
+    With ``workers`` > 1 the papers are split into shards scored in a
+    process pool (see _parallel_connections); the result is unchanged.
     
     Args:
         papers: List of papers to analyze
         keyword_threshold: Minimum number of shared keywords for a connection
+        max_posting: Ignore authors/keywords/title words shared by more than
+            this many papers when looking for candidates. Faster on large
+            corpora, but misses connections made only through such common
+            features (None = exact)
+        vectorized: Use the NumPy/SciPy backend (None = when installed)
+        top_k: Return only the strongest top_k connections (None = all)
+        min_strength: Drop connections weaker than this
+        workers: Worker processes for the pure-Python scorer (0 = one per
+            CPU, None/1 = score in this process); takes precedence over
+            ``vectorized``
         
     Returns:
-        List of Connection objects
+        List of Connection objects, strongest first
+        
+    Raises:
+        ImportError: If vectorized=True but NumPy/SciPy are missing
     """
-    connections = []
+    ranks = _source_ranks(papers)
+    features, vocabulary = extract_features(papers)
     
-    # Group papers by source for comparison
-    papers_by_source = defaultdict(list)
-    for paper in papers:
-        papers_by_source[paper.source].append(paper)
-    
-    sources = list(papers_by_source.keys())
-    
-    # Compare papers from different sources
-    for i, source_a in enumerate(sources):
-        for source_b in sources[i+1:]:
-            for paper_a in papers_by_source[source_a]:
-                for paper_b in papers_by_source[source_b]:
-                    strength, reason = _calculate_connection(
-                        paper_a, paper_b, keyword_threshold
-                    )
-                    
-                    if strength > 0:
-                        connections.append(Connection(
-                            paper_a=paper_a,
-                            paper_b=paper_b,
-                            strength=strength,
-                            reason=reason
-                        ))
-    
-    # Sort by strength (descending)
-    connections.sort(key=lambda c: c.strength, reverse=True)
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers and workers > 1 and len(papers) > 1:
+        return _parallel_connections(papers, features, vocabulary, ranks, keyword_threshold,
+                                     max_posting, min_strength, top_k, workers)
+    
+    pairs = _candidate_pairs(features, ranks, keyword_threshold, max_posting,
+                             len(vocabulary), vectorized)
+    return _rank_connections(papers, features, vocabulary, pairs, ranks,
+                             keyword_threshold, min_strength, top_k)
+
+
+def iter_connections(papers: List[Paper], keyword_threshold: int = 3,
+                     max_posting: Optional[int] = None,
+                     vectorized: Optional[bool] = None,
+                     min_strength: int = 1) -> Iterator[Connection]:
+    """Yield connections lazily as they are scored, without sorting.
+    
+    Takes the same options as find_connections. Connections are not
+    strongest first, and their order depends on the backend:
+    
+    - Pure Python: paper by paper in input order (each paper paired with
+      later-source partners as the posting lists find them); only the
+      posting lists are held between connections
+    - Vectorized (numpy/scipy): one batch per source of the first paper,
+      in order of first appearance, each covering every later source and
+      ordered by first paper (partners in no set order); one batch's
+      overlap matrices are held while it is yielded
+    
+    Callers that need a stable order should sort, as find_connections does.
+    """
+    ranks = _source_ranks(papers)
+    features, vocabulary = extract_features(papers)
+    for i, j in _candidate_pairs(features, ranks, keyword_threshold, max_posting,
+                                 len(vocabulary), vectorized):
+        strength, reason = score_features(features[i], features[j],
+                                          keyword_threshold, vocabulary)
+        if strength >= max(min_strength, 1):
+            yield Connection(paper_a=papers[i], paper_b=papers[j],
+                             strength=strength, reason=reason)
+
+
+def _candidate_pairs(features: List[PaperFeatures], ranks: List[int],
+                     keyword_threshold: int, max_posting: Optional[int],
+                     num_terms: int, vectorized: Optional[bool]) -> Iterator[Tuple[int, int]]:
+    """Cross-source (i, j) pairs, ranks[i] < ranks[j], that may connect."""
+    if vectorized and not SPARSE_AVAILABLE:
+        raise ImportError("vectorized crossref needs numpy and scipy")
+    if vectorized is not False and SPARSE_AVAILABLE:
+        return _sparse_pairs(features, ranks, keyword_threshold, max_posting, num_terms)
+    return _indexed_pairs(features, ranks, keyword_threshold, max_posting)
+
+
+def _build_index(features: List[PaperFeatures]) -> Dict[Tuple[int, int], List[int]]:
+    """Posting lists: (feature kind, term ID) -> indexes of papers having it."""
+    index = defaultdict(list)
+    for i, paper_features in enumerate(features):
+        for kind, values in enumerate(paper_features.kinds()):
+            for value in values:
+                index[(kind, value)].append(i)
+    return index
+
+
+def _indexed_pairs(features: List[PaperFeatures], ranks: List[int],
+                   keyword_threshold: int, max_posting: Optional[int],
+                   index: Optional[Dict[Tuple[int, int], List[int]]] = None,
+                   rows: Optional[range] = None) -> Iterator[Tuple[int, int]]:
+    """Candidate pairs from author/keyword/title-word posting lists.
     
+    ``rows`` restricts the pairs to those whose first paper is in it.
+    """
+    if index is None:
+        index = _build_index(features)
+    
+    # Overlap each feature kind needs to add strength (see score_features)
+    min_shared = (1, max(keyword_threshold, 1), 2)
+    
+    for i in rows if rows is not None else range(len(features)):
+        paper_features = features[i]
+        shared = defaultdict(lambda: [0, 0, 0])
+        for kind, values in enumerate(paper_features.kinds()):
+            for value in values:
+                posting = index[(kind, value)]
+                if max_posting is not None and len(posting) > max_posting:
+                    continue
+                for j in posting:
+                    if ranks[j] > ranks[i]:
+                        shared[j][kind] += 1
+        for j, counts in shared.items():
+            if any(count >= needed for count, needed in zip(counts, min_shared)):
+                yield i, j
+
+
+def _parallel_connections(papers: List[Paper], features: List[PaperFeatures],
+                          vocabulary: FeatureVocabulary, ranks: List[int],
+                          keyword_threshold: int, max_posting: Optional[int],
+                          min_strength: int, top_k: Optional[int],
+                          workers: int) -> List[Connection]:
+    """Score candidate pairs in a process pool, sharded by first paper.
+    
+    Workers receive the features once, packed as flat integer arrays, and
+    build their own posting lists. Each shard returns only numeric
+    (strength, position) results (its own top_k when set), which are
+    merged here; reason strings are built for the final connections only.
+    """
+    n = len(features)
+    # Several shards per worker to even out uneven posting lists
+    size = max(1, -(-n // (workers * 4)))
+    shards = [range(start, min(start + size, n)) for start in range(0, n, size)]
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(_pack_features(features), ranks,
+                                       keyword_threshold, max_posting)) as pool:
+        results = pool.map(_score_shard, shards,
+                           [min_strength] * len(shards), [top_k] * len(shards))
+        items = [item for shard in results for item in shard]
+    
+    if top_k is None:
+        items.sort(reverse=True)
+    else:
+        items = heapq.nlargest(top_k, items)
+    
+    connections = []
+    for strength, _, i, j in items:
+        _, reason = score_features(features[i], features[j], keyword_threshold, vocabulary)
+        connections.append(Connection(paper_a=papers[i], paper_b=papers[j],
+                                      strength=strength, reason=reason))
     return connections
 
 
-def _calculate_connection(paper_a: Paper, paper_b: Paper, 
-                          keyword_threshold: int) -> Tuple[int, str]:
-    """Calculate connection strength between two papers.
+def _pack_features(features: List[PaperFeatures]) -> Tuple[array, array]:
+    """Flatten features into (offsets, term IDs) arrays.
+    
+    Feature kind k of paper i is ``terms[offsets[3*i + k]:offsets[3*i + k + 1]]``.
+    """
+    offsets, terms = array("q", [0]), array("q")
+    for paper_features in features:
+        for values in paper_features.kinds():
+            terms.extend(values)
+            offsets.append(len(terms))
+    return offsets, terms
+
+
+def _unpack_features(offsets: array, terms: array) -> List[PaperFeatures]:
+    """Inverse of _pack_features."""
+    features = []
+    for i in range(0, len(offsets) - 1, 3):
+        kinds = [frozenset(terms[offsets[i + k]:offsets[i + k + 1]]) for k in range(3)]
+        features.append(PaperFeatures(*kinds))
+    return features
+
+
+# Per-process state of crossref pool workers (set by _init_worker)
+_worker_state: Dict[str, object] = {}
+
+
+def _init_worker(packed: Tuple[array, array], ranks: List[int],
+                 keyword_threshold: int, max_posting: Optional[int]):
+    features = _unpack_features(*packed)
+    _worker_state.update(
+        features=features,
+        ranks=ranks,
+        index=_build_index(features),
+        keyword_threshold=keyword_threshold,
+        max_posting=max_posting,
+    )
+
+
+def _score_shard(rows: range, min_strength: int,
+                 top_k: Optional[int]) -> List[Tuple[int, int, int, int]]:
+    """Score one shard in a worker: [(strength, -position, i, j), ...]."""
+    state = _worker_state
+    features, ranks = state["features"], state["ranks"]
+    keyword_threshold = state["keyword_threshold"]
+    min_strength = max(min_strength, 1)
+    n = len(features)
+    
+    items = []
+    for i, j in _indexed_pairs(features, ranks, keyword_threshold,
+                               state["max_posting"], state["index"], rows):
+        a, b = features[i], features[j]
+        strength = connection_strength(len(a.authors & b.authors),
+                                       len(a.keywords & b.keywords),
+                                       len(a.title_words & b.title_words),
+                                       keyword_threshold)
+        if strength >= min_strength:
+            position = ((ranks[i] * n + ranks[j]) * n + i) * n + j
+            items.append((strength, -position, i, j))
     
+    return items if top_k is None else heapq.nlargest(top_k, items)
+
+
+def _sparse_pairs(features: List[PaperFeatures], ranks: List[int],
+                  keyword_threshold: int, max_posting: Optional[int],
+                  num_terms: int) -> Iterator[Tuple[int, int]]:
+    """Cross-source pairs with non-zero strength, via sparse matrix products.
+    
+    One CSR incidence matrix per feature kind; for each source, its rows
+    times the transpose of all later sources' rows gives every overlap
+    count at once. Terms in more than max_posting papers are zeroed out,
+    matching the posting-list cap of the pure-Python path.
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    matrices = []
+    for kind in (AUTHORS, KEYWORDS, TITLE_WORDS):
+        indptr, indices = [0], []
+        for paper_features in features:
+            indices.extend(paper_features.kinds()[kind])
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr),
+            shape=(len(features), num_terms),
+        )
+        if max_posting is not None:
+            keep = matrix.getnnz(axis=0) <= max_posting
+            matrix.data[~keep[matrix.indices]] = 0
+            matrix.eliminate_zeros()
+        matrices.append(matrix)
+    
+    for rank in range(int(ranks.max()) + 1 if len(ranks) else 0):
+        rows_a = np.flatnonzero(ranks == rank)
+        rows_b = np.flatnonzero(ranks > rank)
+        if not len(rows_a) or not len(rows_b):
+            continue
+        authors, keywords, title_words = (
+            (matrix[rows_a] @ matrix[rows_b].T).tocsr() for matrix in matrices
+        )
+        strength = _strength_matrix(authors, keywords, title_words, keyword_threshold).tocoo()
+        yield from zip(rows_a[strength.row].tolist(), rows_b[strength.col].tolist())
+
+
+def _strength_matrix(authors, keywords, title_words, keyword_threshold: int):
+    """score_features' strength formula over sparse overlap-count matrices."""
+    authors.data = np.minimum(authors.data * 3, 7)
+    keywords.data = np.where(keywords.data >= keyword_threshold,
+                             np.minimum(keywords.data, 5), 0)
+    title_words.data = np.where(title_words.data >= 2, np.minimum(title_words.data, 3), 0)
+    
+    total = (authors + keywords + title_words).tocsr()
+    total.data = np.minimum(total.data, 10)
+    total.eliminate_zeros()
+    return total
+
+
+def find_connections_approx(papers: List[Paper], keyword_threshold: int = 3,
+                            similarity: float = 0.2, num_perm: int = 64,
+                            bands: Optional[int] = None, seed: int = 1,
+                            max_posting: Optional[int] = 100,
+                            top_k: Optional[int] = None,
+                            min_strength: int = 1) -> List[Connection]:
+    """Find connections approximately, for corpora too large for exact search.
+    
+    Each paper's keywords and title words are summarized by a MinHash
+    signature, and LSH banding buckets papers whose signatures agree on a
+    whole band. Cross-source papers sharing a bucket (likely Jaccard
+    similarity of at least ``similarity``) become candidates, along with
+    papers sharing an author, and every candidate is rescored exactly, so
+    reported strengths and reasons are always correct; only recall is
+    approximate. Cost grows near-linearly with the number of papers.
+    
+    Raising ``num_perm`` makes the similarity cut-off sharper; lowering
+    ``similarity`` (or using more ``bands``) finds more connections at the
+    price of more candidates to rescore.
+    
+    Args:
+        papers: List of papers to analyze
+        keyword_threshold: Minimum number of shared keywords for a connection
+        similarity: Jaccard similarity of keyword+title sets to look for
+        num_perm: MinHash signature length
+        bands: LSH bands (default: chosen from similarity and num_perm)
+        seed: Seed for the MinHash permutations
+        max_posting: Ignore authors shared by more than this many papers
+            when looking for shared-author candidates (None = no cap)
+        top_k: Return only the strongest top_k connections (None = all)
+        min_strength: Drop connections weaker than this
+        
     Returns:
-        Tuple of (strength 1-10, reason string)
+        List of Connection objects, strongest first
+        
+    Raises:
+        ValueError: If bands is not between 1 and num_perm
     """
-    strength = 0
-    reasons = []
+    if bands is not None and not 1 <= bands <= num_perm:
+        raise ValueError(f"bands must be between 1 and num_perm ({num_perm}), got {bands}")
+    ranks = _source_ranks(papers)
+    features, vocabulary = extract_features(papers)
     
-    # Check for shared authors
-    authors_a = {a.lower() for a in paper_a.authors}
-    authors_b = {b.lower() for b in paper_b.authors}
-    shared_authors = authors_a & authors_b
+    if bands is None:
+        bands, rows = lsh_params(similarity, num_perm)
+    else:
+        rows = num_perm // bands
+    hasher = MinHasher(num_perm, seed)
     
-    if shared_authors:
-        # Strength based on number of shared authors
-        author_strength = min(len(shared_authors) * 3, 7)
-        strength += author_strength
-        author_names = list(shared_authors)[:3]
-        reasons.append(f"Shared authors: {', '.join(author_names)}")
+    buckets = defaultdict(list)
+    authors = defaultdict(list)
+    for i, paper_features in enumerate(features):
+        for author in paper_features.authors:
+            authors[author].append(i)
+        terms = paper_features.keywords | paper_features.title_words
+        if not terms:
+            continue
+        signature = hasher.signature(terms)
+        for band in range(bands):
+            buckets[(band, *signature[band * rows:(band + 1) * rows])].append(i)
     
-    # Check for shared keywords
-    keywords_a = {k.lower() for k in paper_a.keywords}
-    keywords_b = {k.lower() for k in paper_b.keywords}
-    shared_keywords = keywords_a & keywords_b
+    postings = list(buckets.values())
+    postings.extend(p for p in authors.values()
+                    if max_posting is None or len(p) <= max_posting)
     
-    if len(shared_keywords) >= keyword_threshold:
-        # Strength based on number of shared keywords
-        keyword_strength = min(len(shared_keywords), 5)
-        strength += keyword_strength
-        keyword_list = list(shared_keywords)[:5]
-        reasons.append(f"Shared keywords: {', '.join(keyword_list)}")
-    
-    # Check for title similarity (simple word overlap)
-    title_words_a = set(paper_a.title.lower().split())
-    title_words_b = set(paper_b.title.lower().split())
-    # Remove common words
-    common_words = {'the', 'a', 'an', 'and', 'or', 'of', 'in', 'on', 'to', 'for',
-                    'with', 'by', 'from', 'as', 'is', 'are', 'was', 'were',
-                    'study', 'analysis', 'research', 'using', 'based'}
-    title_words_a -= common_words
-    title_words_b -= common_words
-    
-    shared_title_words = title_words_a & title_words_b
-    if len(shared_title_words) >= 2:
-        title_strength = min(len(shared_title_words), 3)
-        strength += title_strength
-        reasons.append(f"Similar topics: {', '.join(list(shared_title_words)[:3])}")
+    pairs = set()
+    for posting in postings:
+        if len(posting) < 2:
+            continue
+        for x, i in enumerate(posting):
+            for j in posting[x + 1:]:
+                if ranks[i] < ranks[j]:
+                    pairs.add((i, j))
+                elif ranks[j] < ranks[i]:
+                    pairs.add((j, i))
+    
+    return _rank_connections(papers, features, vocabulary, pairs, ranks,
+                             keyword_threshold, min_strength, top_k)
+
+
+class MinHasher:
+    """MinHash signatures of integer sets, from seeded universal hashes."""
+    
+    # Mersenne prime larger than any term ID
+    PRIME = (1 << 61) - 1
+    
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [(rng.randrange(1, self.PRIME), rng.randrange(self.PRIME))
+                       for _ in range(num_perm)]
+    
+    def signature(self, terms: FrozenSet[int]) -> List[int]:
+        """Per-permutation minimum hash over a non-empty set."""
+        prime = self.PRIME
+        hashes = [[(a * term + b) % prime for a, b in self._perms] for term in terms]
+        return list(map(min, zip(*hashes)))
+
+
+def lsh_params(similarity: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) so LSH candidates start at about ``similarity``.
+    
+    Two sets with Jaccard similarity s share a bucket with probability
+    1 - (1 - s^rows)^bands, an S-curve whose midpoint is roughly
+    (1/bands)^(1/rows); the divisor of num_perm putting it nearest the
+    requested similarity wins, preferring more bands (higher recall).
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        distance = abs((1 / bands) ** (1 / rows) - similarity)
+        if best is None or distance < best[0]:
+            best = (distance, bands, rows)
+    return best[1], best[2]
+
+
+@dataclass
+class DocumentFrequencies:
+    """How many papers carry each feature, for IDF weighting.
+    
+    ``counts`` is keyed by (feature kind, normalized term). The cache keeps
+    these up to date as papers are saved (Cache.document_frequencies), so
+    weights can reflect the whole cached corpus rather than one scan.
+    """
+    num_docs: int
+    counts: Dict[Tuple[int, str], int]
+    
+    @classmethod
+    def from_features(cls, features: List[PaperFeatures],
+                      vocabulary: FeatureVocabulary) -> "DocumentFrequencies":
+        """Document frequencies of the papers being compared."""
+        counts = defaultdict(int)
+        for paper_features in features:
+            for kind, values in enumerate(paper_features.kinds()):
+                for value in values:
+                    counts[(kind, vocabulary.terms[value])] += 1
+        return cls(num_docs=len(features), counts=dict(counts))
+    
+    def idf(self, kind: int, term: str) -> float:
+        """Smoothed inverse document frequency, ln((N + 1) / (df + 1)) + 1."""
+        df = self.counts.get((kind, term), 0)
+        return math.log((self.num_docs + 1) / (df + 1)) + 1
+
+
+def find_connections_tfidf(papers: List[Paper], min_similarity: float = 0.3,
+                           doc_freq: Optional[DocumentFrequencies] = None,
+                           top_k: Optional[int] = None,
+                           min_strength: int = 1) -> List[Connection]:
+    """Find connections by TF-IDF weighted cosine similarity.
+    
+    Each paper becomes a unit vector over its authors, keywords and title
+    words, each weighted by IDF, so terms shared by much of the corpus
+    ("model", "system") count for little and rare shared terms dominate.
+    Cross-source pairs with cosine similarity of at least min_similarity
+    become connections of strength round(10 x similarity).
+    
+    The threshold prunes candidates before scoring: a paper's terms are
+    ordered by weight, and only its shortest prefix whose remaining
+    suffix has norm below min_similarity is looked up. Any pair reaching
+    the threshold must share a term in that prefix, so the long posting
+    lists of common terms are never walked and the result is exact.
+    
+    Args:
+        papers: List of papers to analyze
+        min_similarity: Cosine similarity cut-off (0-1)
+        doc_freq: Corpus document frequencies (default: from these papers)
+        top_k: Return only the top_k most similar pairs (None = all)
+        min_strength: Drop connections weaker than this
+        
+    Returns:
+        List of Connection objects, most similar first
+    """
+    ranks = _source_ranks(papers)
+    features, vocabulary = extract_features(papers)
+    local = DocumentFrequencies.from_features(features, vocabulary)
+    if doc_freq is None:
+        doc_freq = local
+    else:
+        # Papers not saved to the cache yet still count towards their terms
+        doc_freq = DocumentFrequencies(
+            num_docs=max(doc_freq.num_docs, local.num_docs),
+            counts={key: max(count, doc_freq.counts.get(key, 0))
+                    for key, count in local.counts.items()},
+        )
+    
+    # Unit vectors keyed by (kind, term ID), terms by decreasing weight
+    vectors = []
+    for paper_features in features:
+        weights = {
+            (kind, value): doc_freq.idf(kind, vocabulary.terms[value])
+            for kind, values in enumerate(paper_features.kinds()) for value in values
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        vectors.append(sorted(((w / norm, term) for term, w in weights.items()), reverse=True))
+    
+    index = defaultdict(list)
+    for i, vector in enumerate(vectors):
+        for _, term in vector:
+            index[term].append(i)
+    lookup = [dict((term, w) for w, term in vector) for vector in vectors]
+    
+    threshold = max(min_similarity, 1e-9)
+    min_strength = max(min_strength, 1)
+    n = len(papers)
+    
+    def scored() -> Iterator[Tuple[float, int, int, int]]:
+        for i, vector in enumerate(vectors):
+            # Shortest prefix whose suffix norm falls below the threshold
+            suffix = sum(w * w for w, _ in vector)
+            candidates = set()
+            for w, term in vector:
+                if math.sqrt(max(suffix, 0.0)) < threshold - 1e-9:
+                    break
+                suffix -= w * w
+                candidates.update(j for j in index[term] if ranks[j] > ranks[i])
+            mine = lookup[i]
+            for j in candidates:
+                theirs = lookup[j]
+                small, large = (mine, theirs) if len(mine) <= len(theirs) else (theirs, mine)
+                similarity = sum(w * large[t] for t, w in small.items() if t in large)
+                if similarity >= threshold and _similarity_strength(similarity) >= min_strength:
+                    position = ((ranks[i] * n + ranks[j]) * n + i) * n + j
+                    yield similarity, -position, i, j
+    
+    if top_k is None:
+        best = sorted(scored(), reverse=True)
+    else:
+        best = heapq.nlargest(top_k, scored())
+    
+    connections = []
+    for similarity, _, i, j in best:
+        shared = sorted(set(lookup[i]) & set(lookup[j]), key=lambda t: -lookup[i][t])
+        terms = ", ".join(vocabulary.terms[value] for _, value in shared[:5])
+        connections.append(Connection(
+            paper_a=papers[i], paper_b=papers[j],
+            strength=_similarity_strength(similarity),
+            reason=f"TF-IDF similarity {similarity:.2f}: {terms}",
+        ))
+    return connections
+
+
+def _similarity_strength(similarity: float) -> int:
+    """Connection strength (1-10) for a cosine similarity."""
+    return max(1, min(10, round(similarity * 10)))
+
+
+def _source_ranks(papers: List[Paper]) -> List[int]:
+    """Rank of each paper's source, in order of first appearance."""
+    source_rank = {}
+    for paper in papers:
+        source_rank.setdefault(paper.source, len(source_rank))
+    return [source_rank[paper.source] for paper in papers]
+
+
+def _rank_connections(papers: List[Paper], features: List[PaperFeatures],
+                      vocabulary: FeatureVocabulary, pairs: Iterable[Tuple[int, int]],
+                      ranks: List[int], keyword_threshold: int,
+                      min_strength: int = 1, top_k: Optional[int] = None) -> List[Connection]:
+    """Score candidate (i, j) pairs (ranks[i] < ranks[j]) into connections.
+    
+    Connections are ordered strongest first, ties in the order a full
+    pairwise comparison meets them: source by source, then paper by paper
+    within each source. With top_k, a min-heap of the best top_k is kept
+    instead of the full list.
+    """
+    min_strength = max(min_strength, 1)
+    n = len(papers)
+    
+    def position(i: int, j: int) -> int:
+        return ((ranks[i] * n + ranks[j]) * n + i) * n + j
+    
+    if top_k is None:
+        scored = []
+        for i, j in pairs:
+            strength, reason = score_features(features[i], features[j],
+                                              keyword_threshold, vocabulary)
+            if strength >= min_strength:
+                scored.append((-strength, position(i, j), i, j, reason))
+        scored.sort()
+    else:
+        # Heap root is the weakest kept connection (latest on ties)
+        heap = []
+        for i, j in pairs:
+            strength, reason = score_features(features[i], features[j],
+                                              keyword_threshold, vocabulary)
+            if strength < min_strength:
+                continue
+            item = (strength, -position(i, j), i, j, reason)
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif heap and item > heap[0]:
+                heapq.heapreplace(heap, item)
+        scored = sorted((-strength, -neg, i, j, reason)
+                        for strength, neg, i, j, reason in heap)
     
-    # Cap strength at 10
-    strength = min(strength, 10)
+    return [
+        Connection(paper_a=papers[i], paper_b=papers[j], strength=-neg, reason=reason)
+        for neg, _, i, j, reason in scored
+    ]
+
+
+def connection_strength(shared_authors: int, shared_keywords: int,
+                        shared_title_words: int, keyword_threshold: int) -> int:
+    """Connection strength (0-10) from overlap counts.
+    
+    Authors count 3 each (up to 7), keywords 1 each (up to 5) once
+    keyword_threshold are shared, and title words 1 each (up to 3) from two.
+    """
+    strength = 0
+    if shared_authors:
+        strength += min(shared_authors * 3, 7)
+    if shared_keywords >= keyword_threshold:
+        strength += min(shared_keywords, 5)
+    if shared_title_words >= 2:
+        strength += min(shared_title_words, 3)
+    return min(strength, 10)
+
+
+def score_features(features_a: PaperFeatures, features_b: PaperFeatures,
+                   keyword_threshold: int,
+                   vocabulary: FeatureVocabulary) -> Tuple[int, str]:
+    """Calculate connection strength from two papers' precomputed features.
+    
+    Returns:
+        Tuple of (strength 1-10, reason string)
+    """
+    shared_authors = features_a.authors & features_b.authors
+    shared_keywords = features_a.keywords & features_b.keywords
+    shared_title_words = features_a.title_words & features_b.title_words
     
+    strength = connection_strength(len(shared_authors), len(shared_keywords),
+                                   len(shared_title_words), keyword_threshold)
     if strength == 0:
         return 0, ""
     
-    # Build reason string
-    reason = "; ".join(reasons)
+    # Build reason string from the parts that added strength
+    reasons = []
+    if shared_authors:
+        reasons.append(f"Shared authors: {', '.join(vocabulary.names(shared_authors)[:3])}")
+    if len(shared_keywords) >= keyword_threshold:
+        reasons.append(f"Shared keywords: {', '.join(vocabulary.names(shared_keywords)[:5])}")
+    if len(shared_title_words) >= 2:
+        reasons.append(f"Similar topics: {', '.join(vocabulary.names(shared_title_words)[:3])}")
     
-    return strength, reason
+    return strength, "; ".join(reasons)
+
+
+def _calculate_connection(paper_a: Paper, paper_b: Paper, 
+                          keyword_threshold: int) -> Tuple[int, str]:
+    """Calculate connection strength between two papers.
+    
+    Kept for callers comparing a single pair; extracts both papers'
+    features and scores them with score_features.
+    
+    Returns:
+        Tuple of (strength 1-10, reason string)
+    """
+    vocabulary = FeatureVocabulary()
+    return score_features(vocabulary.extract(paper_a), vocabulary.extract(paper_b),
+                          keyword_threshold, vocabulary)
 
 
 def find_citation_trails(papers: List[Paper]) -> List[Tuple[Paper, Paper]]:
     """Find citation trails (Paper A → cited by → Paper B).
     
+    References are matched to papers by normalized ID (see
+    normalize_paper_id), whatever source the paper came from. Each
+    citation is reported once; self-citations are ignored. For adjacency
+    or multi-hop queries use CitationIndex directly.
+    
     Args:
         papers: List of papers to analyze
         
     Returns:
         List of (citing_paper, cited_paper) tuples
     """
-    trails = []
+    return CitationIndex(papers).trails()
+
+
+# Prefixes that name the same ID space as the bare ID
+_ID_PREFIX_RE = re.compile(
+    r"^(?:https?://(?:www\.|dx\.)?(?:arxiv\.org/(?:abs|pdf)/|doi\.org/|"
+    r"pubmed\.ncbi\.nlm\.nih\.gov/)|arxiv:|doi:|pmid:)"
+)
+# arXiv IDs (new and old style) with a version suffix
+_ARXIV_VERSION_RE = re.compile(r"^((?:\d{4}\.\d{4,5})|(?:[a-z\-]+(?:\.[a-z]{2})?/\d{7}))v\d+$")
+
+
+def normalize_paper_id(paper_id: str) -> str:
+    """Canonical form of a paper ID for matching references to papers.
     
-    # Build lookup by ID
-    paper_by_id = {}
-    for paper in papers:
-        if paper.id:
-            paper_by_id[(paper.id, paper.source)] = paper
+    Lowercases, drops URL and scheme prefixes (``https://arxiv.org/abs/``,
+    ``doi.org/``, ``arXiv:``, ``DOI:``, ``PMID:``), a ``.pdf`` suffix and
+    arXiv version suffixes, so ``arXiv:2301.01234v2`` and ``2301.01234``
+    match, as do a DOI and its doi.org URL.
+    """
+    normalized = paper_id.strip().lower()
+    normalized = _ID_PREFIX_RE.sub("", normalized)
+    if normalized.endswith(".pdf"):
+        normalized = normalized[:-4]
+    normalized = normalized.rstrip("/")
+    return _ARXIV_VERSION_RE.sub(r"\1", normalized)
+
+
+class CitationIndex:
+    """Citation graph of a set of papers, indexed once.
     
-    # Check each paper's references
-    for paper in papers:
-        for ref_id in paper.references:
-            # Look for referenced paper in our set
-            for source in set(p.source for p in papers):
-                key = (ref_id, source)
-                if key in paper_by_id:
-                    trails.append((paper, paper_by_id[key]))
-                    break
+    ``cites[i]`` lists the indexes of papers that paper i references and
+    ``cited_by[i]`` the papers referencing it, in first-seen order. A
+    normalized ID found in several sources resolves to the first paper
+    carrying it.
+    """
+    
+    def __init__(self, papers: List[Paper]):
+        self.papers = papers
+        self._by_id: Dict[str, int] = {}
+        for i, paper in enumerate(papers):
+            if paper.id:
+                self._by_id.setdefault(normalize_paper_id(paper.id), i)
+        
+        self.cites: List[List[int]] = [[] for _ in papers]
+        self.cited_by: List[List[int]] = [[] for _ in papers]
+        for i, paper in enumerate(papers):
+            seen = {i}
+            for ref_id in paper.references:
+                j = self._by_id.get(normalize_paper_id(ref_id))
+                if j is not None and j not in seen:
+                    seen.add(j)
+                    self.cites[i].append(j)
+                    self.cited_by[j].append(i)
+    
+    def find(self, paper_id: str) -> Optional[Paper]:
+        """Paper carrying an ID (any spelling normalize_paper_id accepts)."""
+        i = self._by_id.get(normalize_paper_id(paper_id))
+        return self.papers[i] if i is not None else None
+    
+    def trails(self) -> List[Tuple[Paper, Paper]]:
+        """All (citing_paper, cited_paper) pairs."""
+        return [(self.papers[i], self.papers[j])
+                for i, targets in enumerate(self.cites) for j in targets]
     
-    return trails
+    def adjacency(self) -> Dict[Tuple[str, str], List[Tuple[str, str]]]:
+        """Citations as {(id, source): [(cited id, cited source), ...]}."""
+        papers = self.papers
+        return {
+            (papers[i].id, papers[i].source): [(papers[j].id, papers[j].source) for j in targets]
+            for i, targets in enumerate(self.cites) if targets
+        }
+    
+    def paths(self, min_hops: int = 2, max_hops: int = 3,
+              start: Optional[Paper] = None,
+              limit: Optional[int] = 1000) -> Iterator[List[Paper]]:
+        """Yield multi-hop trails A → B → C ... following citations.
+        
+        Trails are simple paths (no paper twice) found depth-first, with
+        between min_hops and max_hops citations each.
+        
+        Args:
+            min_hops: Shortest trail to report
+            max_hops: Longest trail to follow (bounds the search)
+            start: Only trails starting at this paper (default: all papers)
+            limit: Stop after this many trails (None = no limit)
+        """
+        starts = range(len(self.papers)) if start is None else [
+            i for i, paper in enumerate(self.papers) if paper is start
+        ]
+        found = 0
+        for first in starts:
+            # Stack of (path, position in its last node's citations)
+            path, stack = [first], [0]
+            while stack:
+                node, position = path[-1], stack[-1]
+                targets = self.cites[node]
+                if position >= len(targets) or len(path) > max_hops:
+                    path.pop()
+                    stack.pop()
+                    continue
+                stack[-1] += 1
+                nxt = targets[position]
+                if nxt in path:
+                    continue
+                path.append(nxt)
+                stack.append(0)
+                if len(path) - 1 >= min_hops:
+                    yield [self.papers[i] for i in path]
+                    found += 1
+                    if limit is not None and found >= limit:
+                        return
+    
+    def shortest_path(self, start: Paper, target: Paper,
+                      max_hops: int = 3) -> Optional[List[Paper]]:
+        """Shortest citation trail from start to target, if within max_hops."""
+        index = {id(paper): i for i, paper in enumerate(self.papers)}
+        if id(start) not in index or id(target) not in index:
+            return None
+        first, goal = index[id(start)], index[id(target)]
+        
+        parents = {first: None}
+        frontier = [first]
+        for _ in range(max_hops):
+            next_frontier = []
+            for node in frontier:
+                for nxt in self.cites[node]:
+                    if nxt in parents:
+                        continue
+                    parents[nxt] = node
+                    if nxt == goal:
+                        trail = [nxt]
+                        while parents[trail[-1]] is not None:
+                            trail.append(parents[trail[-1]])
+                        return [self.papers[i] for i in reversed(trail)]
+                    next_frontier.append(nxt)
+            frontier = next_frontier
+        return None
@@ -1,22 +1,25 @@
 """JSON exporter for SynapseScanner."""
 import json
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from . import BaseExporter
-from ..sources import Paper, Connection
+from ..sources import Paper, Connection, Cluster
 
 
 class JSONExporter(BaseExporter):
     """Export papers to JSON format for piping and programmatic use."""
     
     def export(self, papers: List[Paper], connections: Optional[List[Connection]] = None,
-               include_raw: bool = True) -> str:
+               include_raw: bool = True, clusters: Optional[List[Cluster]] = None,
+               trending: Optional[List[Tuple[str, int]]] = None) -> str:
         """Export papers to JSON string.
         
         Args:
             papers: List of papers to export
             connections: Optional list of connections between papers
             include_raw: Include full paper data (not just IDs) in connections
+            clusters: Optional topic clusters (see clustering.py)
+            trending: Optional (term, papers) pairs, e.g. TermSketch.top()
             
         Returns:
             JSON string
@@ -53,9 +56,17 @@ class JSONExporter(BaseExporter):
                 ]
             data["connection_count"] = len(connections)
         
+        if clusters:
+            data["clusters"] = [self._cluster_dict(cluster) for cluster in clusters]
+            data["cluster_count"] = len(clusters)
+        
+        if trending:
+            data["trending_terms"] = [{"term": term, "papers": count} for term, count in trending]
+        
         return json.dumps(data, indent=2, ensure_ascii=False)
     
-    def export_compact(self, papers: List[Paper], connections: Optional[List[Connection]] = None) -> str:
+    def export_compact(self, papers: List[Paper], connections: Optional[List[Connection]] = None,
+                       clusters: Optional[List[Cluster]] = None) -> str:
         """Export to compact JSON (single line) for piping."""
         data = {
             "version": "1.3.0",
@@ -75,4 +86,17 @@ class JSONExporter(BaseExporter):
                 for conn in connections
             ]
         
+        if clusters:
+            data["clusters"] = [self._cluster_dict(cluster) for cluster in clusters]
+        
         return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    
+    def _cluster_dict(self, cluster: Cluster) -> dict:
+        """Cluster with its papers as ID/source references."""
+        return {
+            "size": len(cluster.papers),
+            "keywords": cluster.keywords,
+            "connections": cluster.connections,
+            "strength": round(cluster.strength, 2),
+            "papers": [{"id": p.id, "source": p.source} for p in cluster.papers],
+        }
@@ -5,7 +5,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 from . import BaseExporter
-from ..sources import Paper, Connection
+from ..sources import Paper, Connection, Cluster
 
 
 class ObsidianExporter(BaseExporter):
@@ -18,7 +18,7 @@ class ObsidianExporter(BaseExporter):
         super().__init__(output_path)
     
     def export(self, papers: List[Paper], connections: Optional[List[Connection]] = None,
-               query: str = "") -> str:
+               query: str = "", clusters: Optional[List[Cluster]] = None) -> str:
         """Export papers to Obsidian markdown files.
         
         Returns summary of exported files.
@@ -49,10 +49,20 @@ class ObsidianExporter(BaseExporter):
             
             exported.append(conn_filename)
         
+        # Export clusters if any
+        if clusters:
+            cluster_filename = f"clusters_{self._sanitize_filename(query) or 'all'}"
+            cluster_filepath = os.path.join(self.output_path, f"{cluster_filename}.md")
+            
+            with open(cluster_filepath, 'w', encoding='utf-8') as f:
+                f.write(self._format_clusters(clusters, query))
+            
+            exported.append(cluster_filename)
+        
         return f"Exported {len(exported)} files to {self.output_path}"
     
     def export_to_string(self, papers: List[Paper], connections: Optional[List[Connection]] = None,
-                        query: str = "") -> str:
+                        query: str = "", clusters: Optional[List[Cluster]] = None) -> str:
         """Export papers to a single markdown string (for stdout redirection)."""
         sections = []
         
@@ -62,6 +72,9 @@ class ObsidianExporter(BaseExporter):
         if connections:
             sections.append(self._format_connections(connections, query))
         
+        if clusters:
+            sections.append(self._format_clusters(clusters, query))
+        
         return "\n\n---\n\n".join(sections)
     
     def _format_paper(self, paper: Paper, query: str) -> str:
@@ -143,6 +156,29 @@ class ObsidianExporter(BaseExporter):
         
         return "\n".join(lines)
     
+    def _format_clusters(self, clusters: List[Cluster], query: str) -> str:
+        """Format topic clusters as markdown."""
+        lines = ["---"]
+        lines.append(f'title: "Topic Clusters - {self._escape_yaml(query) or "Research"}"')
+        lines.append('type: clusters')
+        lines.append(f'fetched: {datetime.now().strftime("%Y-%m-%d")}')
+        lines.append("---")
+        lines.append("")
+        lines.append("# Topic Clusters")
+        lines.append("")
+        
+        for number, cluster in enumerate(clusters, 1):
+            lines.append(f"## Cluster {number}: {', '.join(cluster.keywords) or 'untitled'}")
+            lines.append("")
+            lines.append(f"**Papers:** {len(cluster.papers)} · **Connections:** {cluster.connections}"
+                         f" · **Mean strength:** {cluster.strength:.1f}")
+            lines.append("")
+            for paper in cluster.papers:
+                lines.append(f"- [{paper.title}]({self._sanitize_filename(paper.title)}.md) ({paper.source})")
+            lines.append("")
+        
+        return "\n".join(lines)
+    
     def _sanitize_filename(self, title: str) -> str:
         """Convert title to safe filename."""
         # Remove/replace unsafe characters
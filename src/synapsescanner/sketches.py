@@ -0,0 +1,251 @@
+"""Bounded-memory streaming term statistics for SynapseScanner.
+
+Counting every distinct term across a whole cache needs memory that grows
+with the vocabulary. These sketches stay a fixed size however many papers
+are streamed through them:
+
+- SpaceSaving keeps the ``capacity`` most frequent terms. A term's
+  reported count overestimates its true count by at most its ``error``,
+  and any term occurring more than N / capacity times is guaranteed to
+  be kept
+- CountMinSketch estimates the count of any term from ``depth`` rows of
+  ``width`` counters, overestimating by at most ~e·N / width with
+  probability 1 - e^-depth
+- TermSketch combines the two: Space-Saving picks the heavy hitters and
+  each count is tightened to the smaller of the two estimates
+
+Hashing is seeded and stable across processes, so sketches built on
+different shards or machines can be merged (``merge``) or shipped as JSON
+(``to_dict`` / ``from_dict``) as long as they share their dimensions.
+"""
+import hashlib
+import heapq
+from array import array
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from .sources import KEYWORD_STOP_WORDS, Paper
+
+
+def paper_terms(paper: Paper) -> Set[str]:
+    """Distinct candidate terms of a paper's title and abstract.
+    
+    Words are cleaned as keywords are (see BaseSource._extract_keywords):
+    punctuation stripped, longer than three characters, not a stop word.
+    """
+    terms = set()
+    for word in paper.tokens:
+        clean = ''.join(c for c in word if c.isalnum())
+        if len(clean) > 3 and clean not in KEYWORD_STOP_WORDS:
+            terms.add(clean)
+    return terms
+
+
+class CountMinSketch:
+    """Approximate counts of arbitrary items in fixed memory."""
+    
+    def __init__(self, width: int = 2048, depth: int = 4, seed: int = 0):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self._key = seed.to_bytes(8, "little", signed=True)
+        self._table = array("q", bytes(8 * width * depth))
+    
+    def _cells(self, item: str) -> List[int]:
+        """Table index of the item's counter in each row (double hashing)."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16, key=self._key).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+    
+    def add(self, item: str, count: int = 1):
+        """Count an item."""
+        table = self._table
+        for cell in self._cells(item):
+            table[cell] += count
+        self.total += count
+    
+    def estimate(self, item: str) -> int:
+        """Upper bound on the item's count (exact unless hashes collide)."""
+        table = self._table
+        return min(table[cell] for cell in self._cells(item))
+    
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        """Sketch of both streams.
+        
+        Raises:
+            ValueError: If the sketches' dimensions or seeds differ
+        """
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Count-Min sketches must share width, depth and seed to merge")
+        merged = CountMinSketch(self.width, self.depth, self.seed)
+        merged._table = array("q", (a + b for a, b in zip(self._table, other._table)))
+        merged.total = self.total + other.total
+        return merged
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form."""
+        return {"width": self.width, "depth": self.depth, "seed": self.seed,
+                "total": self.total, "table": self._table.tolist()}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CountMinSketch":
+        """Rebuild a sketch from to_dict() output."""
+        sketch = cls(data["width"], data["depth"], data["seed"])
+        sketch._table = array("q", data["table"])
+        sketch.total = data["total"]
+        return sketch
+
+
+class SpaceSaving:
+    """The most frequent items of a stream, in at most ``capacity`` counters.
+    
+    A new item arriving when all counters are taken replaces the item with
+    the smallest count and inherits that count as its error.
+    """
+    
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # One (count, item) entry per kept item; counts may lag behind
+        self._heap: List[Tuple[int, str]] = []
+    
+    def __len__(self) -> int:
+        return len(self.counts)
+    
+    def _min_item(self) -> str:
+        """Kept item with the smallest count (refreshing stale heap entries)."""
+        heap, counts = self._heap, self.counts
+        while heap[0][0] != counts[heap[0][1]]:
+            item = heap[0][1]
+            heapq.heapreplace(heap, (counts[item], item))
+        return heap[0][1]
+    
+    def min_count(self) -> int:
+        """Smallest kept count, or 0 while counters are free."""
+        if len(self.counts) < self.capacity or not self.counts:
+            return 0
+        return self.counts[self._min_item()]
+    
+    def add(self, item: str, count: int = 1):
+        """Count an item."""
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+            return
+        if len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+            return
+        
+        victim = self._min_item()
+        floor = counts.pop(victim)
+        del self.errors[victim]
+        counts[item] = floor + count
+        self.errors[item] = floor
+        heapq.heapreplace(self._heap, (floor + count, item))
+    
+    def top(self, k: int = 10) -> List[Tuple[str, int, int]]:
+        """The k largest (item, count, error), count descending."""
+        best = heapq.nlargest(k, self.counts.items(), key=lambda kv: (kv[1], kv[0]))
+        return [(item, count, self.errors[item]) for item, count in best]
+    
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Summary of both streams, keeping this summary's capacity.
+        
+        An item missing from a full summary may have occurred up to its
+        minimum count there, so that much is added to its count and error.
+        """
+        floor_a, floor_b = self.min_count(), other.min_count()
+        combined = {}
+        for item in self.counts.keys() | other.counts.keys():
+            count = self.counts.get(item, floor_a) + other.counts.get(item, floor_b)
+            error = self.errors.get(item, floor_a) + other.errors.get(item, floor_b)
+            combined[item] = (count, error)
+        
+        merged = SpaceSaving(self.capacity)
+        kept = heapq.nlargest(self.capacity, combined.items(), key=lambda kv: (kv[1][0], kv[0]))
+        for item, (count, error) in kept:
+            merged.counts[item] = count
+            merged.errors[item] = error
+            merged._heap.append((count, item))
+        heapq.heapify(merged._heap)
+        return merged
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form."""
+        return {"capacity": self.capacity,
+                "items": [[item, count, self.errors[item]] for item, count in self.counts.items()]}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        """Rebuild a summary from to_dict() output."""
+        summary = cls(data["capacity"])
+        for item, count, error in data["items"]:
+            summary.counts[item] = count
+            summary.errors[item] = error
+            summary._heap.append((count, item))
+        heapq.heapify(summary._heap)
+        return summary
+
+
+class TermSketch:
+    """Trending terms across any number of papers in fixed memory."""
+    
+    def __init__(self, capacity: int = 200, width: int = 2048, depth: int = 4, seed: int = 0):
+        self.heavy = SpaceSaving(capacity)
+        self.counts = CountMinSketch(width, depth, seed)
+        self.papers = 0
+    
+    def add_paper(self, paper: Paper):
+        """Count each of a paper's terms once."""
+        for term in paper_terms(paper):
+            self.heavy.add(term)
+            self.counts.add(term)
+        self.papers += 1
+    
+    def add_papers(self, papers: Iterable[Paper]) -> "TermSketch":
+        """Count every paper's terms; returns self for chaining."""
+        for paper in papers:
+            self.add_paper(paper)
+        return self
+    
+    def estimate(self, term: str) -> int:
+        """Estimated number of papers mentioning a term."""
+        estimate = self.counts.estimate(term)
+        if term in self.heavy.counts:
+            estimate = min(estimate, self.heavy.counts[term])
+        return estimate
+    
+    def top(self, k: int = 10) -> List[Tuple[str, int]]:
+        """The k terms in the most papers, as (term, estimated papers)."""
+        candidates = self.heavy.top(max(k * 2, k + 10))
+        ranked = sorted(((term, min(count, self.counts.estimate(term)))
+                         for term, count, _ in candidates),
+                        key=lambda tc: (-tc[1], tc[0]))
+        return ranked[:k]
+    
+    def merge(self, other: "TermSketch") -> "TermSketch":
+        """Sketch of both paper streams (e.g. two shards or nodes)."""
+        merged = TermSketch.__new__(TermSketch)
+        merged.heavy = self.heavy.merge(other.heavy)
+        merged.counts = self.counts.merge(other.counts)
+        merged.papers = self.papers + other.papers
+        return merged
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form."""
+        return {"papers": self.papers, "heavy": self.heavy.to_dict(),
+                "counts": self.counts.to_dict()}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TermSketch":
+        """Rebuild a sketch from to_dict() output."""
+        sketch = cls.__new__(cls)
+        sketch.heavy = SpaceSaving.from_dict(data["heavy"])
+        sketch.counts = CountMinSketch.from_dict(data["counts"])
+        sketch.papers = data["papers"]
+        return sketch
@@ -1,8 +1,23 @@
 """Multi-source adapter architecture for SynapseScanner."""
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, FrozenSet, Sequence, Tuple, Union
 from datetime import datetime
+from ..query import canonicalize_query
+
+
+# Words too common to be keywords (see BaseSource._extract_keywords)
+KEYWORD_STOP_WORDS = frozenset({
+    'the', 'and', 'or', 'a', 'an', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were',
+    'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'may', 'might', 'must',
+    'this', 'that', 'these', 'those', 'we', 'our', 'us', 'you',
+    'they', 'them', 'their', 'it', 'its', 'he', 'she', 'his', 'her',
+    'paper', 'study', 'research', 'method', 'methods', 'result',
+    'results', 'conclusion', 'conclusions', 'using', 'based', 'new',
+    'approach', 'proposed', 'analysis', 'data', 'show', 'shown'
+})
 
 
 @dataclass
@@ -19,6 +34,39 @@ class Paper:
     citations: int = 0               # 0 if unknown
     references: List[str] = field(default_factory=list)  # paper IDs this paper cites
     keywords: List[str] = field(default_factory=list)    # extracted keywords
+    # Normalized text derived on first use (see text, tokens, title_words)
+    _derived: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _normalized(self) -> Dict[str, Any]:
+        """Derived-text cache, reset whenever title or abstract is replaced."""
+        cache = self._derived
+        if cache is None or cache["title"] is not self.title or cache["abstract"] is not self.abstract:
+            cache = self._derived = {"title": self.title, "abstract": self.abstract}
+        return cache
+    
+    @property
+    def text(self) -> str:
+        """Lowercased title and abstract, as pattern and keyword scans read them."""
+        cache = self._normalized()
+        if "text" not in cache:
+            cache["text"] = (self.title + " " + self.abstract).lower()
+        return cache["text"]
+    
+    @property
+    def tokens(self) -> Tuple[str, ...]:
+        """Whitespace-separated words of text."""
+        cache = self._normalized()
+        if "tokens" not in cache:
+            cache["tokens"] = tuple(self.text.split())
+        return cache["tokens"]
+    
+    @property
+    def title_words(self) -> FrozenSet[str]:
+        """Distinct lowercased words of the title."""
+        cache = self._normalized()
+        if "title_words" not in cache:
+            cache["title_words"] = frozenset(self.title.lower().split())
+        return cache["title_words"]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -63,20 +111,36 @@ class Connection:
     reason: str                      # e.g., "Shared authors: Smith et al."
 
 
+@dataclass
+class Cluster:
+    """A group of papers linked by connections."""
+    papers: List[Paper]
+    keywords: List[str] = field(default_factory=list)  # most representative first
+    connections: int = 0             # edges inside the cluster
+    strength: float = 0.0            # mean connection strength
+
+
 class BaseSource(ABC):
     """Abstract base class for all paper sources."""
     
+    # Upstream HTTP requests one search() costs (used for cache accounting)
+    requests_per_search = 1
+    
+    # Whether search() can start at an offset upstream (used for delta fetches)
+    supports_offset = False
+    
     def __init__(self, name: str):
         self.name = name
         self._session = None
     
     @abstractmethod
-    def search(self, query: str, limit: int = 10) -> List[Paper]:
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Paper]:
         """Search for papers matching the query.
         
         Args:
             query: Search query string
             limit: Maximum number of results to return
+            offset: Number of leading results to skip
             
         Returns:
             List of Paper objects
@@ -95,35 +159,32 @@ class BaseSource(ABC):
         """
         pass
     
-    def _extract_keywords(self, text: str) -> List[str]:
+    def canonical_query(self, query: str) -> str:
+        """Canonical form of a query for this source (see query.py).
+        
+        Adapters search with this form so equivalent spellings of a query
+        send the same upstream request and share a cache entry.
+        """
+        return canonicalize_query(query, self.name)
+    
+    def _extract_keywords(self, text: Union[str, Sequence[str]]) -> List[str]:
         """Extract keywords from text for cross-referencing.
         
         Args:
-            text: Text to extract keywords from
+            text: Text to extract keywords from, or its lowercased words
+                (e.g. Paper.tokens, so the text is not split again)
             
         Returns:
             List of keywords (lowercase)
         """
         # Simple keyword extraction - can be enhanced with NLP
-        common_words = {
-            'the', 'and', 'or', 'a', 'an', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were',
-            'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-            'will', 'would', 'could', 'should', 'may', 'might', 'must',
-            'this', 'that', 'these', 'those', 'we', 'our', 'us', 'you',
-            'they', 'them', 'their', 'it', 'its', 'he', 'she', 'his', 'her',
-            'paper', 'study', 'research', 'method', 'methods', 'result',
-            'results', 'conclusion', 'conclusions', 'using', 'based', 'new',
-            'approach', 'proposed', 'analysis', 'data', 'show', 'shown'
-        }
-        
         # Split and clean
-        words = text.lower().split()
+        words = text.lower().split() if isinstance(text, str) else text
         keywords = []
         for word in words:
             # Remove punctuation
             clean = ''.join(c for c in word if c.isalnum())
-            if len(clean) > 3 and clean not in common_words:
+            if len(clean) > 3 and clean not in KEYWORD_STOP_WORDS:
                 keywords.append(clean)
         
         # Return unique keywords
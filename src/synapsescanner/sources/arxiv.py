@@ -9,13 +9,16 @@ class ArXivSource(BaseSource):
     
     API_URL = "https://export.arxiv.org/api/query"
     
+    supports_offset = True
+    
     def __init__(self, name: str = "arxiv"):
         super().__init__(name)
         self.ns = {"atom": "http://www.w3.org/2005/Atom"}
     
-    def search(self, query: str, limit: int = 10) -> List[Paper]:
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Paper]:
         """Search ArXiv for papers matching the query."""
         papers = []
+        query = self.canonical_query(query)
         
         # Build search query
         search_query = f"all:{query}" if query else "all"
@@ -26,7 +29,7 @@ class ArXivSource(BaseSource):
                 self.API_URL,
                 params={
                     "search_query": search_query,
-                    "start": 0,
+                    "start": offset,
                     "max_results": limit,
                     "sortBy": "submittedDate",
                     "sortOrder": "descending"
@@ -88,11 +91,7 @@ class ArXivSource(BaseSource):
             if term:
                 keywords.append(term.lower())
         
-        # Extract additional keywords from title and abstract
-        text_keywords = self._extract_keywords(title + " " + abstract)
-        keywords.extend([k for k in text_keywords if k not in keywords])
-        
-        return Paper(
+        paper = Paper(
             id=arxiv_id,
             title=title,
             authors=authors,
@@ -102,8 +101,13 @@ class ArXivSource(BaseSource):
             published=published,
             source="arxiv",
             citations=0,  # ArXiv doesn't provide citation counts
-            keywords=keywords[:20]  # Limit keywords
         )
+        
+        # Extract additional keywords from the paper's normalized words
+        text_keywords = self._extract_keywords(paper.tokens)
+        keywords.extend([k for k in text_keywords if k not in keywords])
+        paper.keywords = keywords[:20]  # Limit keywords
+        return paper
     
     def fetch_references(self, paper: Paper) -> List[Paper]:
         """ArXiv doesn't provide citation/reference data via API."""
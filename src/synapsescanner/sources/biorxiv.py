@@ -10,12 +10,19 @@ class BioRxivSource(BaseSource):
     BASE_URL = "https://api.biorxiv.org/correspondence"
     DETAILS_URL = "https://api.biorxiv.org/details"
     
+    # biorxiv, then medrxiv when biorxiv alone does not fill the limit
+    requests_per_search = 2
+    
     def __init__(self, name: str = "biorxiv"):
         super().__init__(name)
     
-    def search(self, query: str, limit: int = 10) -> List[Paper]:
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Paper]:
         """Search BioRxiv for papers matching the query."""
         papers = []
+        query = self.canonical_query(query)
+        
+        # Matching happens locally, so an offset cannot be skipped upstream
+        wanted = offset + limit
         
         try:
             session = self._requests_session()
@@ -27,12 +34,12 @@ class BioRxivSource(BaseSource):
             
             # Try biorxiv first
             papers.extend(self._fetch_from_server(
-                session, "biorxiv", start_date, end_date, query, limit
+                session, "biorxiv", start_date, end_date, query, wanted
             ))
             
             # If we need more, try medrxiv
-            if len(papers) < limit:
-                remaining = limit - len(papers)
+            if len(papers) < wanted:
+                remaining = wanted - len(papers)
                 papers.extend(self._fetch_from_server(
                     session, "medrxiv", start_date, end_date, query, remaining
                 ))
@@ -40,7 +47,7 @@ class BioRxivSource(BaseSource):
         except Exception:
             pass
         
-        return papers[:limit]
+        return papers[offset:wanted]
     
     def _fetch_from_server(self, session, server: str, start_date: datetime,
                           end_date: datetime, query: str, limit: int) -> List[Paper]:
@@ -117,10 +124,7 @@ class BioRxivSource(BaseSource):
         url = f"https://www.{server}.org/content/{doi}" if doi else ""
         pdf_url = f"https://www.{server}.org/content/{doi}.full.pdf" if doi else ""
         
-        # Extract keywords
-        keywords = self._extract_keywords(title + " " + abstract)
-        
-        return Paper(
+        paper = Paper(
             id=doi,
             title=title,
             authors=authors,
@@ -130,8 +134,11 @@ class BioRxivSource(BaseSource):
             published=published,
             source=server,  # "biorxiv" or "medrxiv"
             citations=0,
-            keywords=keywords[:20]
         )
+        
+        # Extract keywords from the paper's normalized words
+        paper.keywords = self._extract_keywords(paper.tokens)[:20]
+        return paper
     
     def fetch_references(self, paper: Paper) -> List[Paper]:
         """BioRxiv doesn't provide citation/reference data."""
@@ -2,13 +2,14 @@
 __version__ = "1.4.0"
 
 # Make key components available at package level
-from .sources import Paper, BaseSource, Connection, get_source, list_sources
+from .sources import Paper, BaseSource, Connection, Cluster, get_source, list_sources
 
 __all__ = [
     "__version__",
     "Paper",
     "BaseSource", 
     "Connection",
+    "Cluster",
     "get_source",
     "list_sources",
 ]
@@ -2,16 +2,365 @@
 import sqlite3
 import json
 import os
+import atexit
+import gzip
+import queue
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from .sources import Paper
+from typing import List, Optional, Dict, Any, Callable, Hashable, Iterator, NamedTuple, Set, Tuple
+from .sources import Paper, Connection
+from .crossref import (COMMON_TITLE_WORDS, DocumentFrequencies, FeatureVocabulary,
+                       normalize_term, score_features)
+from .compression import encode_text, decode_text, train_dictionary
+from .cache_metrics import COUNTERS, CacheMetrics, percentiles
+from .query import canonicalize_query
+
+
+class _LRUCache:
+    """Bounded, thread-safe LRU map with hit/miss counters."""
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value for key (marking it recently used) or None."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key: Hashable, value: Any):
+        """Insert or refresh a value, evicting the least recently used entry."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def discard(self, key: Hashable):
+        """Drop a single key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def discard_where(self, predicate: Callable[[Hashable], bool]):
+        """Drop every key matching predicate."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+    
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+@dataclass
+class CacheEntry:
+    """Result of a cache lookup."""
+    papers: List[Paper]
+    last_queried: str                # ISO timestamp of the newest matching query
+    stale: bool = False              # past max_age but still within the stale window
+    depth: Optional[int] = None      # upstream ranks fetched (None: unknown, legacy entry)
+    exhausted: bool = False          # the source returned fewer results than asked for
+    
+    def covers(self, limit: int) -> bool:
+        """Whether this entry can answer a search for ``limit`` results."""
+        return self.depth is None or self.exhausted or self.depth >= limit
+
+
+class _QueryRows(NamedTuple):
+    """Query lookup result as kept in the LRU."""
+    last_queried: str
+    cutoff: str                      # window the rows were loaded with
+    rows: List[Tuple[str, Paper]]    # (fetched_at, paper)
+    ranked: bool                     # rows are this query's results, in rank order
+    max_results: int
+    result_count: int
+
+
+class BackgroundRefresher:
+    """Small worker pool for stale-while-revalidate refreshes.
+    
+    Each (query, source) is refreshed at most once at a time. Finished
+    refreshes are collected by wait() so the caller can tell the user the
+    cache was updated behind their back.
+    """
+    
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="synapse-refresh")
+        self._pending: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, query: str, source: str, refresh: Callable[[], int]) -> bool:
+        """Schedule refresh() for (query, source) unless one is already running.
+        
+        Args:
+            query: Search query being refreshed
+            source: Source name being refreshed
+            refresh: Callable doing the upstream fetch; returns papers saved
+        
+        Returns:
+            True if a new refresh was scheduled
+        """
+        key = (query, source)
+        with self._lock:
+            running = self._pending.get(key)
+            if running is not None and not running.done():
+                return False
+            self._pending[key] = self._executor.submit(refresh)
+        return True
+    
+    def pending(self) -> int:
+        """Number of refreshes still running."""
+        with self._lock:
+            return sum(1 for future in self._pending.values() if not future.done())
+    
+    def wait(self, timeout: Optional[float] = None) -> List[Tuple[str, str, int]]:
+        """Wait for scheduled refreshes and collect the finished ones.
+        
+        Failed refreshes are dropped silently; the stale entry stays usable.
+        
+        Returns:
+            List of (query, source, papers_saved) for finished refreshes
+        """
+        with self._lock:
+            scheduled = list(self._pending.items())
+        if scheduled:
+            wait_futures([future for _, future in scheduled], timeout=timeout)
+        
+        completed = []
+        with self._lock:
+            for key, future in scheduled:
+                if not future.done() or self._pending.get(key) is not future:
+                    continue
+                del self._pending[key]
+                if not future.cancelled() and future.exception() is None:
+                    completed.append((key[0], key[1], future.result()))
+        return completed
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    """True if an OperationalError means another connection holds the lock."""
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class _WriteQueue:
+    """Single writer thread that batches cache writes into one transaction.
+    
+    Every write is a callable taking a connection. The thread drains up to
+    ``max_batch`` queued writes and applies them under ``BEGIN IMMEDIATE``,
+    so a process holds the write lock once per batch instead of once per
+    call. If the database stays locked past the busy timeout, the batch is
+    retried with exponential backoff; after ``retries`` attempts it is
+    dropped (the cache is best-effort) and counted in ``dropped``.
+    """
+    
+    def __init__(self, connect: Callable[[], sqlite3.Connection],
+                 max_batch: int = 256, retries: int = 3, backoff: float = 0.5):
+        self._connect = connect
+        self.max_batch = max_batch
+        self.retries = retries
+        self.backoff = backoff
+        self.batches = 0
+        self.writes = 0
+        self.dropped = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._last: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="synapse-cache-writer",
+                                        daemon=True)
+        self._thread.start()
+    
+    def submit(self, write: Callable[[sqlite3.Connection], Any]) -> Future:
+        """Queue a write; the returned future resolves to its result once committed."""
+        future: Future = Future()
+        with self._lock:
+            self._queue.put((write, future))
+            self._last = future
+        return future
+    
+    def flush(self, timeout: Optional[float] = None):
+        """Block until everything queued so far is committed or dropped."""
+        if threading.current_thread() is self._thread:
+            return
+        with self._lock:
+            last = self._last
+        if last is not None:
+            wait_futures([last], timeout=timeout)
+    
+    def close(self, timeout: Optional[float] = None):
+        """Flush pending writes and stop the writer thread."""
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+    
+    def on_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._commit(batch)
+                    return
+                batch.append(item)
+            self._commit(batch)
+    
+    def _commit(self, batch: List[Tuple[Callable, Future]]):
+        error: Optional[Exception] = None
+        results: List[Any] = []
+        for attempt in range(self.retries + 1):
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                results = [write(conn) for write, _ in batch]
+                conn.commit()
+                error = None
+                break
+            except sqlite3.OperationalError as e:
+                conn.rollback()
+                error = e
+                if not _is_busy(e):
+                    break
+                time.sleep(self.backoff * (2 ** attempt))
+            except Exception as e:
+                conn.rollback()
+                error = e
+                break
+            finally:
+                conn.close()
+        
+        if error is None:
+            self.batches += 1
+            self.writes += len(batch)
+        else:
+            self.dropped += len(batch)
+        for i, (_, future) in enumerate(batch):
+            if error is None:
+                future.set_result(results[i])
+            else:
+                future.set_exception(error)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self._queue.qsize(),
+            "writes": self.writes,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
+
+
+# Bumped whenever a migration is added to Cache._migrate
+SCHEMA_VERSION = 7
+
+# Join tables indexing crossref features, in crossref kind order
+_FEATURE_TABLES = (
+    ("paper_authors", "author_id"),
+    ("paper_keywords", "keyword_id"),
+    ("paper_title_words", "word_id"),
+)
+
+# Interned terms behind each join table, with their document frequency
+_FEATURE_VOCABULARIES = (
+    ("authors", "name"),
+    ("keywords", "term"),
+    ("title_words", "word"),
+)
+
+# Columns of the connections table, as named in snapshot records
+_CONNECTION_FIELDS = ("paper_a", "source_a", "paper_b", "source_b", "strength", "reason", "found_at")
+
+# Fields a snapshot record must carry, and fields that must be lists, per kind
+_SNAPSHOT_REQUIRED = {
+    "paper": ("id", "source"),
+    "query": ("query", "source", "timestamp"),
+    "connection": ("paper_a", "source_a", "paper_b", "source_b", "strength", "found_at"),
+}
+_SNAPSHOT_LISTS = {
+    "paper": ("authors", "references", "keywords"),
+    "query": ("results",),
+}
+
+# Cache snapshots: gzip'd JSON Lines, one header line then one record per line
+SNAPSHOT_FORMAT = "synapsescanner-cache-snapshot"
+SNAPSHOT_VERSION = 1
 
 
 class Cache:
-    """SQLite cache for paper data and search history."""
+    """SQLite cache for paper data and search history.
+    
+    Decoded papers and query results are kept in a bounded in-process LRU
+    in front of SQLite, so repeated lookups (watch mode, long-running
+    services) skip the database and JSON decoding entirely. Writes go
+    through to SQLite and update or invalidate the affected LRU entries.
+    Papers handed out from the LRU are shared; treat them as read-only.
     
-    def __init__(self, db_path: Optional[str] = None):
+    With ``compress=True`` the abstract and JSON columns are stored as
+    zlib BLOBs (see compression.py), using a preset dictionary trained on
+    the cached corpus once enough papers are available. Reads decode both
+    compressed and plain rows transparently.
+    
+    With ``multiprocess=True`` the cache is safe to share between several
+    scanner processes: the database runs in WAL mode so readers never block
+    the writer, every connection waits up to ``busy_timeout`` seconds for a
+    lock, and writes go through one per-process queue that batches them
+    into a single transaction (see _WriteQueue). Reads flush this
+    process's queue first, so a process always sees its own writes. A read
+    that still finds the database locked is treated as a cache miss.
+    """
+    
+    # Papers needed before a compression dictionary is trained automatically
+    DICT_TRAIN_MIN_PAPERS = 500
+    
+    def __init__(self, db_path: Optional[str] = None, memory_items: int = 1024,
+                 compress: bool = False, multiprocess: bool = False,
+                 busy_timeout: float = 30.0):
+        """Initialize the cache.
+        
+        Args:
+            db_path: SQLite file path (default: ~/.synapse/cache.db)
+            memory_items: Max entries in the in-process LRU (0 disables it)
+            compress: Store abstracts and JSON columns compressed
+            multiprocess: Use WAL mode and a batching writer queue
+            busy_timeout: Seconds to wait for a lock held by another process
+        """
         if db_path is None:
             # Default location: ~/.synapse/cache.db
             home = Path.home()
@@ -20,11 +369,62 @@ class Cache:
             db_path = str(cache_dir / "cache.db")
         
         self.db_path = db_path
+        self.compress = compress
+        self._memory = _LRUCache(memory_items)
+        self._dicts: Dict[int, bytes] = {}
+        self._active_dict_id: Optional[int] = None
+        self.busy_timeout = busy_timeout
+        self.metrics = CacheMetrics()
+        self._writer: Optional[_WriteQueue] = None
         self._init_db()
+        
+        if multiprocess:
+            with self._open() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+            self._writer = _WriteQueue(self._open)
+            atexit.register(self.close)
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open a connection that waits busy_timeout for locks."""
+        return sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection after committing this process's queued writes."""
+        if self._writer and not self._writer.on_writer_thread():
+            self._writer.flush()
+        return self._open()
+    
+    def _write(self, write: Callable[[sqlite3.Connection], Any], wait: bool = False) -> Any:
+        """Apply a write now, or hand it to the writer queue.
+        
+        A queued write returns None straight away unless ``wait`` is set,
+        in which case its result is returned (or its error raised) once
+        the writer has committed it. Writes may be retried, so they must
+        not have side effects outside the connection.
+        """
+        if self._writer:
+            future = self._writer.submit(write)
+            return future.result() if wait else None
+        with self._connect() as conn:
+            result = write(conn)
+            conn.commit()
+            return result
+    
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until queued writes are committed (no-op without a queue)."""
+        if self._writer:
+            self._writer.flush(timeout)
+    
+    def close(self):
+        """Persist metrics, commit queued writes and stop the writer thread."""
+        self.flush_metrics()
+        if self._writer:
+            self._writer.close()
+            self._writer = None
     
     def _init_db(self):
         """Initialize database tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS papers (
                     id TEXT NOT NULL,
@@ -54,6 +454,14 @@ class Cache:
                 )
             """)
             
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS compression_dicts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    data BLOB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_papers_source 
                 ON papers(source)
@@ -64,32 +472,306 @@ class Cache:
                 ON queries(timestamp)
             """)
             
+            self._migrate(conn)
             conn.commit()
+            
+            row = conn.execute("SELECT MAX(id) FROM compression_dicts").fetchone()
+            self._active_dict_id = row[0]
+    
+    def _migrate(self, conn):
+        """Bring an existing database up to SCHEMA_VERSION (PRAGMA user_version).
+        
+        All pending steps run in one BEGIN IMMEDIATE transaction, and the
+        version is read again once the write lock is held, so processes
+        opening an old database together migrate it once, and an upgrade
+        that fails part-way leaves the old schema as it was.
+        """
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        # Join tables are backfilled once all their tables exist
+        reindex = False
+        
+        if version < 1:
+            # v1: interned authors/keywords with join tables, so author and
+            # keyword lookups use an index instead of scanning JSON blobs
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS authors (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE  -- normalized (lowercase)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS keywords (
+                    id INTEGER PRIMARY KEY,
+                    term TEXT NOT NULL UNIQUE  -- normalized (lowercase)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS paper_authors (
+                    paper_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    author_id INTEGER NOT NULL,
+                    position INTEGER,
+                    PRIMARY KEY (paper_id, source, author_id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS paper_keywords (
+                    paper_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    keyword_id INTEGER NOT NULL,
+                    PRIMARY KEY (paper_id, source, keyword_id)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_paper_authors_author
+                ON paper_authors(author_id)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_paper_keywords_keyword
+                ON paper_keywords(keyword_id)
+            """)
+            
+            reindex = True
+        
+        if version < 2:
+            # v2: daily per-source cache counters and latency histograms
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_metrics (
+                    day TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    hits INTEGER DEFAULT 0,
+                    misses INTEGER DEFAULT 0,
+                    stale_hits INTEGER DEFAULT 0,
+                    bytes_saved INTEGER DEFAULT 0,
+                    requests_saved INTEGER DEFAULT 0,
+                    PRIMARY KEY (day, source)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_latency (
+                    day TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    PRIMARY KEY (day, source, bucket)
+                )
+            """)
+        
+        if version < 3:
+            # v3: queries are keyed by their canonical form (see query.py)
+            conn.create_function("canonical_query", 2, canonicalize_query)
+            conn.execute("UPDATE queries SET query = canonical_query(query, source)")
+        
+        if version < 4:
+            # v4: ranked results per query, so deeper searches fetch only the tail
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_results (
+                    query TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    paper_id TEXT NOT NULL,
+                    PRIMARY KEY (query, source, rank)
+                )
+            """)
+        
+        if version < 5:
+            # v5: connection graph (scored edges) plus a title-word index, so
+            # new papers are scored only against the papers they overlap
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS title_words (
+                    id INTEGER PRIMARY KEY,
+                    word TEXT NOT NULL UNIQUE  -- lowercase, common words dropped
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS paper_title_words (
+                    paper_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    word_id INTEGER NOT NULL,
+                    PRIMARY KEY (paper_id, source, word_id)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_paper_title_words_word
+                ON paper_title_words(word_id)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS graph_papers (
+                    paper_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    PRIMARY KEY (paper_id, source)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS connections (
+                    paper_a TEXT NOT NULL,
+                    source_a TEXT NOT NULL,
+                    paper_b TEXT NOT NULL,
+                    source_b TEXT NOT NULL,
+                    strength INTEGER NOT NULL,
+                    reason TEXT,
+                    found_at TEXT NOT NULL,
+                    PRIMARY KEY (paper_a, source_a, paper_b, source_b)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_connections_b
+                ON connections(paper_b, source_b)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_connections_found
+                ON connections(found_at)
+            """)
+            reindex = True
+        
+        if version < 6:
+            # v6: document frequency per author/keyword/title word, kept up
+            # to date by _index_paper, for IDF-weighted crossref scoring
+            for (vocabulary, _), (table, column) in zip(_FEATURE_VOCABULARIES, _FEATURE_TABLES):
+                columns = [row[1] for row in conn.execute(f"PRAGMA table_info({vocabulary})")]
+                if "df" not in columns:
+                    conn.execute(f"ALTER TABLE {vocabulary} ADD COLUMN df INTEGER NOT NULL DEFAULT 0")
+                conn.execute(f"""
+                    UPDATE {vocabulary} SET df =
+                        (SELECT COUNT(*) FROM {table} WHERE {table}.{column} = {vocabulary}.id)
+                """)
+        
+        if version < 7:
+            # v7: pattern matches and keyword counts per paper, valid for
+            # one rule-set version and one normalized text (see rules.py)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS paper_matches (
+                    paper_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    rules_version TEXT NOT NULL,
+                    text_crc INTEGER NOT NULL,
+                    patterns TEXT,  -- JSON array of pattern names
+                    keywords TEXT,  -- JSON object: keyword -> count
+                    PRIMARY KEY (paper_id, source)
+                )
+            """)
+        
+        if reindex:
+            for row in conn.execute("SELECT * FROM papers").fetchall():
+                self._index_paper(conn, self._row_to_paper(row))
+        
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def _index_paper(self, conn, paper: Paper):
+        """(Re)build the author/keyword/title-word join rows for one paper.
+        
+        Document frequencies of the paper's old terms are decremented and
+        those of its new terms incremented. If its features changed, the
+        paper also leaves the connection graph until update_connections
+        scores it again; an unchanged refetch keeps its edges as they are.
+        """
+        key = (paper.id, paper.source)
+        old_features = self._feature_ids(conn, key)
+        self._count_terms(conn, key, -1)
+        conn.execute("DELETE FROM paper_authors WHERE paper_id = ? AND source = ?", key)
+        conn.execute("DELETE FROM paper_keywords WHERE paper_id = ? AND source = ?", key)
+        conn.execute("DELETE FROM paper_title_words WHERE paper_id = ? AND source = ?", key)
+        
+        for position, author in enumerate(paper.authors):
+            author_id = self._intern(conn, "authors", "name", author)
+            if author_id is not None:
+                conn.execute("""
+                    INSERT OR IGNORE INTO paper_authors (paper_id, source, author_id, position)
+                    VALUES (?, ?, ?, ?)
+                """, (*key, author_id, position))
+        
+        for keyword in paper.keywords:
+            keyword_id = self._intern(conn, "keywords", "term", keyword)
+            if keyword_id is not None:
+                conn.execute("""
+                    INSERT OR IGNORE INTO paper_keywords (paper_id, source, keyword_id)
+                    VALUES (?, ?, ?)
+                """, (*key, keyword_id))
+        
+        for word in paper.title_words - COMMON_TITLE_WORDS:
+            word_id = self._intern(conn, "title_words", "word", word)
+            if word_id is not None:
+                conn.execute("""
+                    INSERT OR IGNORE INTO paper_title_words (paper_id, source, word_id)
+                    VALUES (?, ?, ?)
+                """, (*key, word_id))
+        
+        self._count_terms(conn, key, 1)
+        if self._feature_ids(conn, key) != old_features:
+            conn.execute("DELETE FROM graph_papers WHERE paper_id = ? AND source = ?", key)
+    
+    @staticmethod
+    def _feature_ids(conn, key: Tuple[str, str]) -> List[Set[int]]:
+        """IDs of a paper's authors, keywords and title words, per join table."""
+        return [
+            {row[0] for row in conn.execute(
+                f"SELECT {column} FROM {table} WHERE paper_id = ? AND source = ?", key)}
+            for table, column in _FEATURE_TABLES
+        ]
+    
+    @staticmethod
+    def _count_terms(conn, key: Tuple[str, str], delta: int):
+        """Add delta to the document frequency of every term a paper has."""
+        for (vocabulary, _), (table, column) in zip(_FEATURE_VOCABULARIES, _FEATURE_TABLES):
+            conn.execute(f"""
+                UPDATE {vocabulary} SET df = df + ?
+                WHERE id IN (SELECT {column} FROM {table} WHERE paper_id = ? AND source = ?)
+            """, (delta, *key))
+    
+    @staticmethod
+    def _intern(conn, table: str, column: str, value: str) -> Optional[int]:
+        """Return the ID for a normalized value, inserting it if new."""
+        value = normalize_term(value)
+        if not value:
+            return None
+        conn.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+        return conn.execute(
+            f"SELECT id FROM {table} WHERE {column} = ?", (value,)
+        ).fetchone()[0]
     
     def save_papers(self, papers: List[Paper]):
         """Save papers to cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            for paper in papers:
+        fetched_at = datetime.now().isoformat()
+        rows = [(
+            paper.id,
+            paper.source,
+            paper.title,
+            self._encode(json.dumps(paper.authors)),
+            self._encode(paper.abstract),
+            paper.url,
+            paper.pdf_url,
+            paper.published,
+            paper.citations,
+            self._encode(json.dumps(paper.references)),
+            self._encode(json.dumps(paper.keywords)),
+            fetched_at
+        ) for paper in papers]
+        
+        def write(conn):
+            for paper, row in zip(papers, rows):
                 conn.execute("""
                     INSERT OR REPLACE INTO papers
                     (id, source, title, authors, abstract, url, pdf_url, 
                      published, citations, references_data, keywords, fetched_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    paper.id,
-                    paper.source,
-                    paper.title,
-                    json.dumps(paper.authors),
-                    paper.abstract,
-                    paper.url,
-                    paper.pdf_url,
-                    paper.published,
-                    paper.citations,
-                    json.dumps(paper.references),
-                    json.dumps(paper.keywords),
-                    datetime.now().isoformat()
-                ))
-            conn.commit()
+                """, row)
+                self._index_paper(conn, paper)
+        
+        self._write(write)
+        
+        if self.compress and self._active_dict_id is None:
+            self._maybe_train_dictionary()
+        
+        # Write-through: refresh decoded papers, and drop query results for
+        # the touched sources since their row sets have changed.
+        touched = set()
+        for paper in papers:
+            self._memory.put(("paper", paper.id, paper.source), paper)
+            touched.add(paper.source)
+        self._memory.discard_where(lambda k: k[0] == "query" and k[2] in touched)
     
     def get_cached(self, query: str, source: str, max_age_hours: int = 24) -> Optional[List[Paper]]:
         """Get cached papers for a query if not expired.
@@ -98,81 +780,913 @@ class Cache:
             query: Search query string
             source: Source name
             max_age_hours: Maximum age of cache in hours
-            
+        
         Returns:
             List of papers if cache hit, None otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
+        entry = self.lookup(query, source, max_age_hours)
+        return entry.papers if entry else None
+    
+    def lookup(self, query: str, source: str, max_age_hours: int = 24,
+               stale_hours: int = 0, requests_per_search: int = 1,
+               limit: Optional[int] = None) -> Optional[CacheEntry]:
+        """Look up cached papers for a query, optionally accepting stale results.
+        
+        Every lookup is counted in ``self.metrics`` (hit, miss or stale hit,
+        latency, and bytes/requests saved on hits). A hit that is too
+        shallow for ``limit`` saves bytes but no requests, since the tail
+        still has to be fetched.
+        
+        Args:
+            query: Search query string
+            source: Source name
+            max_age_hours: Age after which results count as stale
+            stale_hours: How much longer stale results may still be served
+            requests_per_search: Upstream HTTP requests a search costs
+            limit: Number of results wanted (ranked entries are cut to it)
+        
+        Returns:
+            CacheEntry (with ``stale`` set past max_age_hours), None on miss
+        """
+        started = time.perf_counter()
+        query = canonicalize_query(query, source)
+        entry = self._lookup(query, source, max_age_hours, stale_hours)
+        if entry is not None and entry.depth is not None and limit is not None:
+            entry.papers = entry.papers[:limit]
+        elapsed = time.perf_counter() - started
+        
+        if entry is None:
+            self.metrics.record(source, "misses", elapsed)
+        else:
+            covered = limit is None or entry.covers(limit)
+            self.metrics.record(source, "stale_hits" if entry.stale else "hits", elapsed,
+                                papers=entry.papers,
+                                requests_saved=requests_per_search if covered else 0)
+        return entry
+    
+    def _lookup(self, query: str, source: str, max_age_hours: int,
+                stale_hours: int) -> Optional[CacheEntry]:
+        now = datetime.now()
+        fresh_cutoff = (now - timedelta(hours=max_age_hours)).isoformat()
+        window = (now - timedelta(hours=max_age_hours + stale_hours)).isoformat()
+        
+        try:
+            loaded = self._load_query(query, source, window)
+        except sqlite3.OperationalError as e:
+            # Another process kept the database locked past busy_timeout:
+            # behave like a miss rather than failing the scan.
+            if not _is_busy(e):
+                raise
+            return None
+        if loaded is None:
+            return None
+        
+        stale = loaded.last_queried <= fresh_cutoff
+        if loaded.ranked:
+            # The query's own results: their age is the age of the query
+            papers = [paper for _, paper in loaded.rows]
+        else:
+            # Entries recorded without results fall back to every recent
+            # paper from the source
+            rows = [row for row in loaded.rows if row[0] > window]
+            if stale:
+                papers = [paper for _, paper in rows]
+            else:
+                papers = [paper for fetched_at, paper in rows if fetched_at > fresh_cutoff]
+        if not papers:
+            return None
+        
+        if not loaded.ranked:
+            return CacheEntry(papers=papers, last_queried=loaded.last_queried, stale=stale)
+        return CacheEntry(
+            papers=papers,
+            last_queried=loaded.last_queried,
+            stale=stale,
+            # Repeats dropped from a fetched tail still count as fetched
+            depth=max(len(loaded.rows), loaded.result_count),
+            exhausted=loaded.result_count < (loaded.max_results or 0),
+        )
+    
+    def _load_query(self, query: str, source: str, cutoff: str) -> Optional[_QueryRows]:
+        """Load the newest query entry after cutoff and its result rows."""
+        # In-memory entries remember the newest query timestamp and the
+        # cutoff they were loaded with; they can answer any request whose
+        # window is no wider than that (ISO strings compare like SQLite does).
+        key = ("query", query, source)
+        entry = self._memory.get(key)
+        if entry is not None and cutoff >= entry.cutoff:
+            return entry if entry.last_queried > cutoff else None
+        
+        with self._connect() as conn:
             # Check if we have a recent query entry
-            cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat()
-            
             cursor = conn.execute("""
-                SELECT id FROM queries
+                SELECT timestamp, max_results, result_count FROM queries
                 WHERE query = ? AND source = ? AND timestamp > ?
                 ORDER BY timestamp DESC LIMIT 1
             """, (query, source, cutoff))
             
-            if not cursor.fetchone():
+            found = cursor.fetchone()
+            if not found:
                 return None
             
-            # Get papers for this query - simplified: return recent papers from this source
             cursor = conn.execute("""
-                SELECT * FROM papers
-                WHERE source = ? AND fetched_at > ?
-                ORDER BY fetched_at DESC
-            """, (source, cutoff))
-            
-            rows = cursor.fetchall()
-            if not rows:
-                return None
+                SELECT p.* FROM query_results r
+                JOIN papers p ON p.id = r.paper_id AND p.source = r.source
+                WHERE r.query = ? AND r.source = ?
+                ORDER BY r.rank
+            """, (query, source))
+            rows = [(row[11], self._paper_from_row(row)) for row in cursor.fetchall()]
+            ranked = bool(rows)
             
-            papers = []
-            for row in rows:
-                paper = self._row_to_paper(row)
-                papers.append(paper)
-            
-            return papers
+            if not ranked:
+                cursor = conn.execute("""
+                    SELECT * FROM papers
+                    WHERE source = ? AND fetched_at > ?
+                    ORDER BY fetched_at DESC
+                """, (source, cutoff))
+                rows = [(row[11], self._paper_from_row(row)) for row in cursor.fetchall()]
+        
+        entry = _QueryRows(found[0], cutoff, rows, ranked, found[1], found[2] or 0)
+        self._memory.put(key, entry)
+        return entry
     
-    def record_query(self, query: str, source: str, max_results: int, result_count: int):
-        """Record a query in the history."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO queries (query, source, max_results, result_count, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            """, (query, source, max_results, result_count, datetime.now().isoformat()))
-            conn.commit()
+    def record_query(self, query: str, source: str, max_results: int, result_count: int,
+                     papers: Optional[List[Paper]] = None, offset: int = 0):
+        """Record a query in the history (keyed by its canonical form).
+        
+        Args:
+            query: Search query string
+            source: Source name
+            max_results: Number of results asked for
+            result_count: Number of results the source returned (in total,
+                counting the ``offset`` results fetched earlier)
+            papers: Results in rank order, stored so later lookups return
+                exactly this query's papers
+            offset: Rank of the first paper; a non-zero offset extends the
+                latest entry with a fetched tail instead of adding a new one,
+                so the entry keeps the age of its first page
+        """
+        query = canonicalize_query(query, source)
+        key = (query, source)
+        timestamp = datetime.now().isoformat()
+        ranks = [(query, source, offset + i, p.id) for i, p in enumerate(papers or [])]
+        
+        def write(conn):
+            latest = None
+            if offset:
+                latest = conn.execute("""
+                    SELECT id FROM queries WHERE query = ? AND source = ?
+                    ORDER BY timestamp DESC LIMIT 1
+                """, key).fetchone()
+            if latest:
+                conn.execute("""
+                    UPDATE queries SET max_results = ?, result_count = ? WHERE id = ?
+                """, (max_results, result_count, latest[0]))
+            else:
+                conn.execute("""
+                    INSERT INTO queries (query, source, max_results, result_count, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (*key, max_results, result_count, timestamp))
+            
+            if papers is not None:
+                if not offset:
+                    conn.execute("DELETE FROM query_results WHERE query = ? AND source = ?", key)
+                conn.executemany("""
+                    INSERT OR REPLACE INTO query_results (query, source, rank, paper_id)
+                    VALUES (?, ?, ?, ?)
+                """, ranks)
+        
+        self._write(write)
+        self._memory.discard(("query", query, source))
     
     def get_paper_by_id(self, paper_id: str, source: str) -> Optional[Paper]:
         """Get a specific paper by ID and source."""
-        with sqlite3.connect(self.db_path) as conn:
+        paper = self._memory.get(("paper", paper_id, source))
+        if paper is not None:
+            return paper
+        
+        with self._connect() as conn:
             cursor = conn.execute(
                 "SELECT * FROM papers WHERE id = ? AND source = ?",
                 (paper_id, source)
             )
             row = cursor.fetchone()
             if row:
-                return self._row_to_paper(row)
+                return self._paper_from_row(row)
             return None
     
     def get_all_papers(self, limit: int = 1000) -> List[Paper]:
-        """Get all cached papers."""
-        with sqlite3.connect(self.db_path) as conn:
+        """Get the most recently fetched papers (see iter_papers for all)."""
+        with self._connect() as conn:
             cursor = conn.execute(
                 "SELECT * FROM papers ORDER BY fetched_at DESC LIMIT ?",
                 (limit,)
             )
             return [self._row_to_paper(row) for row in cursor.fetchall()]
     
+    def iter_papers(self, sources: Optional[List[str]] = None,
+                    since: Optional[str] = None, until: Optional[str] = None,
+                    fetched_after: Optional[str] = None,
+                    batch_size: int = 500) -> Iterator[Paper]:
+        """Stream every cached paper matching the filters, in constant memory.
+        
+        Rows are read in batches by keyset on the (id, source) primary key,
+        one short read per batch, so no connection or transaction is held
+        while the caller processes papers and writes made meanwhile do not
+        disturb the iteration. Papers are decoded fresh rather than going
+        through the LRU, so a full scan does not evict the working set.
+        
+        Args:
+            sources: Only papers from these sources
+            since: Only papers published on or after this ISO date
+            until: Only papers published on or before this ISO date
+            fetched_after: Only papers fetched after this ISO timestamp
+            batch_size: Rows per database read
+        
+        Yields:
+            Paper objects ordered by (id, source)
+        """
+        filters, params = [], []
+        if sources:
+            filters.append(f"source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if since:
+            filters.append("published >= ?")
+            params.append(since)
+        if until:
+            # Dates may carry a time part; compare the date prefix only
+            filters.append("substr(published, 1, ?) <= ?")
+            params.extend([len(until), until])
+        if fetched_after:
+            filters.append("fetched_at > ?")
+            params.append(fetched_after)
+        
+        where = " AND ".join(["(id, source) > (?, ?)"] + filters)
+        sql = f"SELECT * FROM papers WHERE {where} ORDER BY id, source LIMIT ?"
+        last = ("", "")
+        
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(sql, (*last, *params, batch_size)).fetchall()
+            for row in rows:
+                yield self._row_to_paper(row)
+            if len(rows) < batch_size:
+                return
+            last = (rows[-1][0], rows[-1][1])
+    
+    def get_papers_by_author(self, author: str, limit: int = 100) -> List[Paper]:
+        """Get cached papers listing an author (case-insensitive exact name).
+        
+        Args:
+            author: Author name as it appears on papers
+            limit: Maximum number of papers to return
+        
+        Returns:
+            Papers, most recently fetched first
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                SELECT p.* FROM authors a
+                JOIN paper_authors pa ON pa.author_id = a.id
+                JOIN papers p ON p.id = pa.paper_id AND p.source = pa.source
+                WHERE a.name = ?
+                ORDER BY p.fetched_at DESC LIMIT ?
+            """, (normalize_term(author), limit))
+            return [self._paper_from_row(row) for row in cursor.fetchall()]
+    
+    def get_papers_by_keyword(self, keyword: str, limit: int = 100) -> List[Paper]:
+        """Get cached papers tagged with a keyword (case-insensitive).
+        
+        Args:
+            keyword: Keyword to look up
+            limit: Maximum number of papers to return
+        
+        Returns:
+            Papers, most recently fetched first
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                SELECT p.* FROM keywords k
+                JOIN paper_keywords pk ON pk.keyword_id = k.id
+                JOIN papers p ON p.id = pk.paper_id AND p.source = pk.source
+                WHERE k.term = ?
+                ORDER BY p.fetched_at DESC LIMIT ?
+            """, (normalize_term(keyword), limit))
+            return [self._paper_from_row(row) for row in cursor.fetchall()]
+    
+    def get_papers_sharing_keywords(self, paper_id: str, source: str,
+                                    min_shared: int = 1,
+                                    limit: int = 100) -> List[Tuple[Paper, int]]:
+        """Get cached papers sharing keywords with a given paper.
+        
+        Args:
+            paper_id: ID of the reference paper
+            source: Source of the reference paper
+            min_shared: Minimum number of shared keywords
+            limit: Maximum number of papers to return
+        
+        Returns:
+            List of (paper, shared_keyword_count), most shared first
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                SELECT other.paper_id, other.source, COUNT(*) AS shared
+                FROM paper_keywords mine
+                JOIN paper_keywords other ON other.keyword_id = mine.keyword_id
+                WHERE mine.paper_id = ? AND mine.source = ?
+                  AND NOT (other.paper_id = mine.paper_id AND other.source = mine.source)
+                GROUP BY other.paper_id, other.source
+                HAVING shared >= ?
+                ORDER BY shared DESC LIMIT ?
+            """, (paper_id, source, min_shared, limit))
+            matches = cursor.fetchall()
+        
+        results = []
+        for other_id, other_source, shared in matches:
+            paper = self.get_paper_by_id(other_id, other_source)
+            if paper:
+                results.append((paper, shared))
+        return results
+    
+    def update_connections(self, keyword_threshold: int = 3, batch_size: int = 500) -> int:
+        """Add papers not yet in the connection graph, scoring only overlaps.
+        
+        Each new (or changed) paper is looked up in the author, keyword and
+        title-word join tables to find the graphed papers from other sources
+        it overlaps with. Those pairs are scored as find_connections would,
+        and edges with non-zero strength are stored. Work is proportional to
+        the new papers and their overlaps, not to the size of the cache.
+        
+        Args:
+            keyword_threshold: Minimum number of shared keywords for a connection
+            batch_size: Papers per transaction
+        
+        Returns:
+            Number of papers added to the graph
+        """
+        found_at = datetime.now().isoformat()
+        added = 0
+        
+        def write(conn):
+            rows = conn.execute("""
+                SELECT p.* FROM papers p
+                LEFT JOIN graph_papers g ON g.paper_id = p.id AND g.source = p.source
+                WHERE g.paper_id IS NULL
+                LIMIT ?
+            """, (batch_size,)).fetchall()
+            for row in rows:
+                self._graph_paper(conn, self._row_to_paper(row), keyword_threshold, found_at)
+            return len(rows)
+        
+        while True:
+            graphed = self._write(write, wait=True)
+            added += graphed
+            if graphed < batch_size:
+                return added
+    
+    def _graph_paper(self, conn, paper: Paper, keyword_threshold: int, found_at: str):
+        """Replace a paper's edges by scoring it against the graphed papers."""
+        key = (paper.id, paper.source)
+        touching = "(paper_a = ? AND source_a = ?) OR (paper_b = ? AND source_b = ?)"
+        # Rescored edges keep the time they were first found
+        first_found = {
+            tuple(row[:4]): row[4] for row in conn.execute(f"""
+                SELECT paper_a, source_a, paper_b, source_b, found_at
+                FROM connections WHERE {touching}
+            """, key + key)
+        }
+        # Edges to papers still waiting to be graphed are left for them to
+        # rescore, so the edge (and its first-found time) survives until then
+        conn.execute("""
+            DELETE FROM connections
+            WHERE (paper_a = ? AND source_a = ? AND EXISTS (
+                       SELECT 1 FROM graph_papers g
+                       WHERE g.paper_id = paper_b AND g.source = source_b))
+               OR (paper_b = ? AND source_b = ? AND EXISTS (
+                       SELECT 1 FROM graph_papers g
+                       WHERE g.paper_id = paper_a AND g.source = source_a))
+        """, key + key)
+        
+        shared = defaultdict(lambda: [0, 0, 0])
+        for kind, (table, column) in enumerate(_FEATURE_TABLES):
+            for other_id, other_source, count in conn.execute(f"""
+                SELECT other.paper_id, other.source, COUNT(*)
+                FROM {table} mine
+                JOIN {table} other ON other.{column} = mine.{column}
+                JOIN graph_papers g ON g.paper_id = other.paper_id AND g.source = other.source
+                WHERE mine.paper_id = ? AND mine.source = ? AND other.source != mine.source
+                GROUP BY other.paper_id, other.source
+            """, key):
+                shared[(other_id, other_source)][kind] = count
+        
+        # Overlap each feature kind needs to add strength (as in crossref)
+        min_shared = (1, max(keyword_threshold, 1), 2)
+        vocabulary = FeatureVocabulary()
+        features = vocabulary.extract(paper)
+        
+        for other_key, counts in shared.items():
+            if not any(count >= needed for count, needed in zip(counts, min_shared)):
+                continue
+            row = conn.execute("SELECT * FROM papers WHERE id = ? AND source = ?",
+                               other_key).fetchone()
+            if row is None:
+                continue
+            strength, reason = score_features(features, vocabulary.extract(self._row_to_paper(row)),
+                                              keyword_threshold, vocabulary)
+            if strength:
+                # Edges are stored once, ordered by (source, id)
+                (source_a, id_a), (source_b, id_b) = sorted([key[::-1], other_key[::-1]])
+                edge = (id_a, source_a, id_b, source_b)
+                conn.execute("""
+                    INSERT OR REPLACE INTO connections
+                    (paper_a, source_a, paper_b, source_b, strength, reason, found_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (*edge, strength, reason, first_found.get(edge, found_at)))
+        
+        conn.execute("INSERT OR IGNORE INTO graph_papers (paper_id, source) VALUES (?, ?)", key)
+    
+    def get_pattern_matches(self, papers: List[Paper], rules_version: str,
+                            batch_size: int = 500) -> Dict[Tuple[str, str], Tuple[List[str], Dict[str, int]]]:
+        """Stored pattern matches for papers scanned under a rule-set version.
+        
+        A stored result only counts if it was made by the same rules
+        (RuleSet.version) on the same title and abstract; anything else
+        is left out and has to be scanned again.
+        
+        Args:
+            papers: Papers to look up
+            rules_version: Version of the rules in use
+            batch_size: Paper IDs per query
+        
+        Returns:
+            Dict of (paper_id, source) -> (pattern names, {keyword: count})
+        """
+        wanted = {(p.id, p.source): _text_crc(p) for p in papers}
+        ids = sorted({paper_id for paper_id, _ in wanted})
+        found = {}
+        
+        with self._connect() as conn:
+            for start in range(0, len(ids), batch_size):
+                chunk = ids[start:start + batch_size]
+                rows = conn.execute(f"""
+                    SELECT paper_id, source, text_crc, patterns, keywords
+                    FROM paper_matches
+                    WHERE rules_version = ? AND paper_id IN ({",".join("?" * len(chunk))})
+                """, (rules_version, *chunk)).fetchall()
+                for paper_id, source, text_crc, patterns, keywords in rows:
+                    if wanted.get((paper_id, source)) == text_crc:
+                        found[(paper_id, source)] = (json.loads(patterns), json.loads(keywords))
+        return found
+    
+    def save_pattern_matches(self, rules_version: str,
+                             results: List[Tuple[Paper, List[str], Dict[str, int]]]):
+        """Store pattern matches, replacing any older result for each paper.
+        
+        Args:
+            rules_version: Version of the rules that produced the results
+            results: (paper, pattern names, {keyword: count}) per paper
+        """
+        rows = [(paper.id, paper.source, rules_version, _text_crc(paper),
+                 json.dumps(patterns), json.dumps(keywords))
+                for paper, patterns, keywords in results]
+        
+        def write(conn):
+            conn.executemany("""
+                INSERT OR REPLACE INTO paper_matches
+                (paper_id, source, rules_version, text_crc, patterns, keywords)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+        
+        self._write(write)
+    
+    def document_frequencies(self) -> DocumentFrequencies:
+        """Document frequency of every cached author, keyword and title word.
+        
+        Maintained incrementally as papers are saved, so this is a scan of
+        the (small) term tables rather than of the papers. Feed it to
+        crossref.find_connections_tfidf to weight terms by the whole cache.
+        """
+        counts = {}
+        with self._connect() as conn:
+            num_docs = conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            for kind, (vocabulary, column) in enumerate(_FEATURE_VOCABULARIES):
+                for term, df in conn.execute(f"SELECT {column}, df FROM {vocabulary} WHERE df > 0"):
+                    counts[(kind, term)] = df
+        return DocumentFrequencies(num_docs=num_docs, counts=counts)
+    
+    def get_connections(self, since: Optional[str] = None, min_strength: int = 1,
+                        paper: Optional[Tuple[str, str]] = None,
+                        limit: int = 100) -> List[Connection]:
+        """Get stored connections, strongest (then newest) first.
+        
+        Args:
+            since: Only edges found after this ISO timestamp
+            min_strength: Minimum connection strength
+            paper: Only edges touching this (paper_id, source)
+            limit: Maximum number of connections to return
+        
+        Returns:
+            List of Connection objects
+        """
+        filters, params = ["strength >= ?"], [min_strength]
+        if since:
+            filters.append("found_at > ?")
+            params.append(since)
+        if paper:
+            filters.append("((paper_a = ? AND source_a = ?) OR (paper_b = ? AND source_b = ?))")
+            params.extend(paper + paper)
+        
+        with self._connect() as conn:
+            rows = conn.execute(f"""
+                SELECT paper_a, source_a, paper_b, source_b, strength, reason
+                FROM connections WHERE {" AND ".join(filters)}
+                ORDER BY strength DESC, found_at DESC LIMIT ?
+            """, (*params, limit)).fetchall()
+        
+        connections = []
+        for id_a, source_a, id_b, source_b, strength, reason in rows:
+            paper_a = self.get_paper_by_id(id_a, source_a)
+            paper_b = self.get_paper_by_id(id_b, source_b)
+            if paper_a and paper_b:
+                connections.append(Connection(paper_a=paper_a, paper_b=paper_b,
+                                              strength=strength, reason=reason or ""))
+        return connections
+    
     def clear_cache(self):
         """Clear all cached data."""
-        with sqlite3.connect(self.db_path) as conn:
+        def write(conn):
             conn.execute("DELETE FROM papers")
             conn.execute("DELETE FROM queries")
-            conn.commit()
+            conn.execute("DELETE FROM query_results")
+            conn.execute("DELETE FROM paper_authors")
+            conn.execute("DELETE FROM paper_keywords")
+            conn.execute("DELETE FROM authors")
+            conn.execute("DELETE FROM keywords")
+            conn.execute("DELETE FROM paper_title_words")
+            conn.execute("DELETE FROM title_words")
+            conn.execute("DELETE FROM graph_papers")
+            conn.execute("DELETE FROM connections")
+            conn.execute("DELETE FROM paper_matches")
+        
+        self._write(write)
+        self._memory.clear()
+    
+    def export_snapshot(self, path: str) -> Dict[str, int]:
+        """Write a versioned, gzip-compressed snapshot of the cache.
+        
+        The snapshot holds one header line followed by one JSON record per
+        paper (with its references, i.e. the citation edges), per query and
+        per scored connection; the newest entry of each query also lists its
+        ranked result IDs.
+        Rows are streamed, so memory use does not grow with the cache.
+        Author/keyword index rows are derived data and are rebuilt on import.
+        
+        Args:
+            path: Output file (conventionally ``*.jsonl.gz``)
+        
+        Returns:
+            Counts of exported records by kind
+        """
+        counts = {"papers": 0, "queries": 0, "connections": 0}
+        
+        with self._connect() as conn, gzip.open(path, "wt", encoding="utf-8") as out:
+            header = {
+                "format": SNAPSHOT_FORMAT,
+                "version": SNAPSHOT_VERSION,
+                "schema_version": SCHEMA_VERSION,
+                "created_at": datetime.now().isoformat(),
+            }
+            out.write(json.dumps(header) + "\n")
+            
+            for row in conn.execute("SELECT * FROM papers"):
+                record = self._row_to_paper(row).to_dict()
+                record["kind"] = "paper"
+                record["fetched_at"] = row[11]
+                out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                counts["papers"] += 1
+            
+            for query, source, max_results, timestamp, result_count, latest in conn.execute("""
+                SELECT query, source, max_results, timestamp, result_count,
+                       timestamp = (SELECT MAX(timestamp) FROM queries q
+                                    WHERE q.query = queries.query AND q.source = queries.source)
+                FROM queries
+            """):
+                record = {
+                    "kind": "query",
+                    "query": query,
+                    "source": source,
+                    "max_results": max_results,
+                    "timestamp": timestamp,
+                    "result_count": result_count,
+                }
+                if latest:
+                    record["results"] = [row[0] for row in conn.execute("""
+                        SELECT paper_id FROM query_results
+                        WHERE query = ? AND source = ? ORDER BY rank
+                    """, (query, source))]
+                out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                counts["queries"] += 1
+            
+            for row in conn.execute("""
+                SELECT paper_a, source_a, paper_b, source_b, strength, reason, found_at
+                FROM connections
+            """):
+                record = dict(zip(_CONNECTION_FIELDS, row), kind="connection")
+                out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                counts["connections"] += 1
+        
+        return counts
+    
+    def import_snapshot(self, path: str, batch_size: int = 1000) -> Dict[str, int]:
+        """Merge a snapshot written by export_snapshot into this cache.
+        
+        Records are streamed and applied in batches. For each key the newest
+        row wins: a paper replaces the local copy only if its ``fetched_at``
+        is later, a query entry is added only if it is newer than the
+        latest local entry for the same (query, source), and a connection
+        replaces the local edge only if it was found later. Imported papers
+        are scored into the local graph by the next update_connections.
+        
+        Args:
+            path: Snapshot file
+            batch_size: Records per transaction
+        
+        Returns:
+            Counts of records read, and of papers/queries/connections merged
+        
+        Raises:
+            ValueError: If the file is not a snapshot, its version is newer,
+                or a record is malformed (batches before it stay merged)
+        """
+        counts = {"read": 0, "papers": 0, "queries": 0, "connections": 0}
+        
+        with gzip.open(path, "rt", encoding="utf-8") as src:
+            header = json.loads(src.readline() or "{}")
+            if not isinstance(header, dict) or header.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"Not a SynapseScanner cache snapshot: {path}")
+            if header.get("version", 0) > SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+            
+            batch = []
+            for line_no, line in enumerate(src, 2):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    _check_snapshot_record(record)
+                except ValueError as e:
+                    raise ValueError(f"Bad snapshot record on line {line_no} of {path}: {e}") from e
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    self._merge_records(batch, counts)
+                    batch = []
+            if batch:
+                self._merge_records(batch, counts)
+        
+        self._memory.clear()
+        return counts
+    
+    def _merge_records(self, records: List[Dict[str, Any]], counts: Dict[str, int]):
+        """Upsert one batch of snapshot records, keeping the newest row per key."""
+        def write(conn):
+            # Counted per attempt, since the writer may retry a batch
+            merged = dict.fromkeys(counts, 0)
+            for record in records:
+                merged["read"] += 1
+                kind = record.get("kind")
+                
+                if kind == "paper":
+                    paper = Paper.from_dict(record)
+                    cursor = conn.execute("""
+                        INSERT INTO papers
+                        (id, source, title, authors, abstract, url, pdf_url,
+                         published, citations, references_data, keywords, fetched_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(id, source) DO UPDATE SET
+                            title = excluded.title,
+                            authors = excluded.authors,
+                            abstract = excluded.abstract,
+                            url = excluded.url,
+                            pdf_url = excluded.pdf_url,
+                            published = excluded.published,
+                            citations = excluded.citations,
+                            references_data = excluded.references_data,
+                            keywords = excluded.keywords,
+                            fetched_at = excluded.fetched_at
+                        WHERE excluded.fetched_at > papers.fetched_at
+                    """, (
+                        paper.id,
+                        paper.source,
+                        paper.title,
+                        self._encode(json.dumps(paper.authors)),
+                        self._encode(paper.abstract),
+                        paper.url,
+                        paper.pdf_url,
+                        paper.published,
+                        paper.citations,
+                        self._encode(json.dumps(paper.references)),
+                        self._encode(json.dumps(paper.keywords)),
+                        record.get("fetched_at") or datetime.now().isoformat()
+                    ))
+                    if cursor.rowcount > 0:
+                        self._index_paper(conn, paper)
+                        merged["papers"] += 1
+                
+                elif kind == "query":
+                    cursor = conn.execute("""
+                        INSERT INTO queries (query, source, max_results, result_count, timestamp)
+                        SELECT ?, ?, ?, ?, ?
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM queries
+                            WHERE query = ? AND source = ? AND timestamp >= ?
+                        )
+                    """, (
+                        record["query"], record["source"], record.get("max_results"),
+                        record.get("result_count", 0), record["timestamp"],
+                        record["query"], record["source"], record["timestamp"]
+                    ))
+                    merged["queries"] += cursor.rowcount
+                    if cursor.rowcount > 0 and "results" in record:
+                        key = (record["query"], record["source"])
+                        conn.execute("DELETE FROM query_results WHERE query = ? AND source = ?", key)
+                        conn.executemany("""
+                            INSERT INTO query_results (query, source, rank, paper_id)
+                            VALUES (?, ?, ?, ?)
+                        """, [(*key, rank, paper_id)
+                              for rank, paper_id in enumerate(record["results"])])
+                
+                elif kind == "connection":
+                    cursor = conn.execute("""
+                        INSERT INTO connections
+                        (paper_a, source_a, paper_b, source_b, strength, reason, found_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(paper_a, source_a, paper_b, source_b) DO UPDATE SET
+                            strength = excluded.strength,
+                            reason = excluded.reason,
+                            found_at = excluded.found_at
+                        WHERE excluded.found_at > connections.found_at
+                    """, tuple(record.get(field) for field in _CONNECTION_FIELDS))
+                    merged["connections"] += cursor.rowcount
+            return merged
+        
+        for kind, count in self._write(write, wait=True).items():
+            counts[kind] += count
+    
+    def train_compression_dictionary(self, sample_size: int = 2000) -> Optional[int]:
+        """Train a preset compression dictionary on the cached corpus.
+        
+        New writes use the newest dictionary; rows written with older ones
+        stay readable because every BLOB records its dictionary ID.
+        
+        Args:
+            sample_size: Number of recent papers to sample
+        
+        Returns:
+            ID of the new dictionary, or None if the cache is empty
+        """
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT authors, abstract, keywords FROM papers
+                ORDER BY fetched_at DESC LIMIT ?
+            """, (sample_size,)).fetchall()
+        
+        samples = (self._decode(value) for row in rows for value in row)
+        zdict = train_dictionary(samples)
+        if not zdict:
+            return None
+        
+        created_at = datetime.now().isoformat()
+        
+        def write(conn):
+            cursor = conn.execute(
+                "INSERT INTO compression_dicts (data, created_at) VALUES (?, ?)",
+                (zdict, created_at)
+            )
+            return cursor.lastrowid
+        
+        dict_id = self._write(write, wait=True)
+        
+        self._dicts[dict_id] = zdict
+        self._active_dict_id = dict_id
+        return dict_id
+    
+    def recompress(self) -> int:
+        """Rewrite every paper's large columns with the current storage format.
+        
+        Use after enabling compression or training a new dictionary; run
+        VACUUM afterwards to return the freed pages to the filesystem.
+        
+        Returns:
+            Number of papers rewritten
+        """
+        def write(conn):
+            rows = conn.execute("""
+                SELECT id, source, authors, abstract, references_data, keywords
+                FROM papers
+            """).fetchall()
+            for paper_id, source, *values in rows:
+                conn.execute("""
+                    UPDATE papers
+                    SET authors = ?, abstract = ?, references_data = ?, keywords = ?
+                    WHERE id = ? AND source = ?
+                """, (*(self._encode(self._decode(v)) for v in values), paper_id, source))
+            return len(rows)
+        
+        return self._write(write, wait=True)
+    
+    def _maybe_train_dictionary(self):
+        """Train the first dictionary once the corpus is big enough."""
+        with self._connect() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+        if count >= self.DICT_TRAIN_MIN_PAPERS:
+            self.train_compression_dictionary()
+    
+    def _load_dict(self, dict_id: int) -> Optional[bytes]:
+        """Return preset dictionary bytes, loading them on first use."""
+        if dict_id not in self._dicts:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT data FROM compression_dicts WHERE id = ?", (dict_id,)
+                ).fetchone()
+            if row is None:
+                return None
+            self._dicts[dict_id] = row[0]
+        return self._dicts[dict_id]
+    
+    def _encode(self, text: Optional[str]):
+        """Encode a large column value for storage."""
+        if not self.compress:
+            return text
+        dict_id = self._active_dict_id or 0
+        zdict = self._load_dict(dict_id) if dict_id else None
+        return encode_text(text, dict_id, zdict)
+    
+    def _decode(self, value) -> Optional[str]:
+        """Decode a stored column value (plain TEXT or compressed BLOB)."""
+        return decode_text(value, self._load_dict)
+    
+    def flush_metrics(self):
+        """Add the in-memory metric deltas to today's rows in the database."""
+        counters, latency = self.metrics.drain()
+        if not counters:
+            return
+        day = datetime.now().strftime("%Y-%m-%d")
+        
+        def write(conn):
+            for source, values in counters.items():
+                conn.execute(f"""
+                    INSERT INTO cache_metrics (day, source, {", ".join(COUNTERS)})
+                    VALUES (?, ?, {", ".join("?" for _ in COUNTERS)})
+                    ON CONFLICT(day, source) DO UPDATE SET
+                    {", ".join(f"{c} = {c} + excluded.{c}" for c in COUNTERS)}
+                """, (day, source, *(values[c] for c in COUNTERS)))
+            for source, histogram in latency.items():
+                for bucket, count in histogram.items():
+                    conn.execute("""
+                        INSERT INTO cache_latency (day, source, bucket, count)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT(day, source, bucket) DO UPDATE SET
+                        count = count + excluded.count
+                    """, (day, source, bucket, count))
+        
+        self._write(write)
+    
+    def get_metrics(self, days: int = 30) -> Dict[str, Dict[str, Any]]:
+        """Get persisted cache metrics per source over the last N days.
+        
+        Args:
+            days: How many days of history to include
+        
+        Returns:
+            Dict of source -> counters, hit_ratio and p50/p95/p99 latency (ms)
+        """
+        self.flush_metrics()
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        
+        with self._connect() as conn:
+            rows = conn.execute(f"""
+                SELECT source, {", ".join(f"SUM({c})" for c in COUNTERS)}
+                FROM cache_metrics WHERE day >= ? GROUP BY source
+            """, (since,)).fetchall()
+            histograms: Dict[str, Dict[int, int]] = {}
+            for source, bucket, count in conn.execute("""
+                SELECT source, bucket, SUM(count) FROM cache_latency
+                WHERE day >= ? GROUP BY source, bucket
+            """, (since,)):
+                histograms.setdefault(source, {})[bucket] = count
+        
+        metrics = {}
+        for source, *values in rows:
+            entry = dict(zip(COUNTERS, values))
+            lookups = entry["hits"] + entry["stale_hits"] + entry["misses"]
+            entry["hit_ratio"] = (entry["hits"] + entry["stale_hits"]) / lookups if lookups else 0.0
+            entry.update(percentiles(histograms.get(source, {})))
+            metrics[source] = entry
+        return metrics
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             paper_count = conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
             query_count = conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
             
@@ -182,37 +1696,94 @@ class Cache:
             """)
             by_source = {row[0]: row[1] for row in cursor.fetchall()}
             
+            author_count = conn.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+            keyword_count = conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0]
+            
             return {
                 "total_papers": paper_count,
                 "total_queries": query_count,
+                "total_authors": author_count,
+                "total_keywords": keyword_count,
                 "by_source": by_source,
+                "memory": self._memory.stats(),
+                "writes": self._writer.stats() if self._writer else None,
+                "compression": {
+                    "enabled": self.compress,
+                    "dictionary_id": self._active_dict_id,
+                },
                 "db_path": self.db_path
             }
     
+    def _paper_from_row(self, row) -> Paper:
+        """Decode a row, reusing an already-decoded Paper from the LRU."""
+        key = ("paper", row[0], row[1])
+        paper = self._memory.get(key)
+        if paper is None:
+            paper = self._row_to_paper(row)
+            self._memory.put(key, paper)
+        return paper
+    
     def _row_to_paper(self, row) -> Paper:
         """Convert database row to Paper object."""
+        authors, abstract, references, keywords = (
+            self._decode(row[i]) for i in (3, 4, 9, 10)
+        )
         return Paper(
             id=row[0],
             source=row[1],
             title=row[2],
-            authors=json.loads(row[3]) if row[3] else [],
-            abstract=row[4] or "",
+            authors=json.loads(authors) if authors else [],
+            abstract=abstract or "",
             url=row[5] or "",
             pdf_url=row[6] or "",
             published=row[7] or "",
             citations=row[8] or 0,
-            references=json.loads(row[9]) if row[9] else [],
-            keywords=json.loads(row[10]) if row[10] else []
+            references=json.loads(references) if references else [],
+            keywords=json.loads(keywords) if keywords else []
         )
 
 
 # Global cache instance
 _cache_instance: Optional[Cache] = None
+_refresher_instance: Optional[BackgroundRefresher] = None
+
+
+def _check_snapshot_record(record: Any):
+    """Raise ValueError unless a snapshot record has what its kind needs.
+    
+    Records of unknown kinds are accepted (and skipped on merge), so newer
+    snapshots with extra record kinds still import.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record is not a JSON object")
+    kind = record.get("kind")
+    missing = [name for name in _SNAPSHOT_REQUIRED.get(kind, ()) if record.get(name) in (None, "")]
+    if missing:
+        raise ValueError(f"{kind} record missing {', '.join(missing)}")
+    for name in _SNAPSHOT_LISTS.get(kind, ()):
+        if name in record and not isinstance(record[name], list):
+            raise ValueError(f"{kind} record field {name} is not a list")
 
 
-def get_cache(db_path: Optional[str] = None) -> Cache:
-    """Get or create the global cache instance."""
+def _text_crc(paper: Paper) -> int:
+    """Checksum of the normalized text a pattern scan reads."""
+    return zlib.crc32(paper.text.encode("utf-8"))
+
+
+def get_cache(db_path: Optional[str] = None, **options) -> Cache:
+    """Get or create the global cache instance.
+    
+    Keyword options (e.g. memory_items, compress, multiprocess) are passed to Cache on first creation.
+    """
     global _cache_instance
     if _cache_instance is None:
-        _cache_instance = Cache(db_path)
+        _cache_instance = Cache(db_path, **options)
     return _cache_instance
+
+
+def get_refresher() -> BackgroundRefresher:
+    """Get or create the global background refresher."""
+    global _refresher_instance
+    if _refresher_instance is None:
+        _refresher_instance = BackgroundRefresher()
+    return _refresher_instance
@@ -0,0 +1,119 @@
+"""Cache instrumentation for SynapseScanner.
+
+Counts hits, misses and stale hits per source, estimates the bytes and
+upstream requests the cache saved, and records lookup latency in a
+log-scaled histogram so percentiles can be computed after merging any
+number of runs. Counters accumulate in memory and are added to the
+``cache_metrics`` / ``cache_latency`` tables by Cache.flush_metrics().
+"""
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .sources import Paper
+
+COUNTERS = ("hits", "misses", "stale_hits", "bytes_saved", "requests_saved")
+
+# Four buckets per doubling of latency (~19% resolution), in microseconds
+_BUCKETS_PER_OCTAVE = 4
+
+
+def latency_bucket(seconds: float) -> int:
+    """Histogram bucket for a latency."""
+    micros = max(seconds * 1_000_000, 1.0)
+    return int(math.log2(micros) * _BUCKETS_PER_OCTAVE)
+
+
+def bucket_ms(bucket: int) -> float:
+    """Representative latency (geometric bucket midpoint) in milliseconds."""
+    return 2 ** ((bucket + 0.5) / _BUCKETS_PER_OCTAVE) / 1000
+
+
+def percentiles(histogram: Dict[int, int],
+                points: Iterable[float] = (50, 95, 99)) -> Dict[str, Optional[float]]:
+    """Estimate latency percentiles (ms) from a bucket -> count histogram."""
+    total = sum(histogram.values())
+    result: Dict[str, Optional[float]] = {}
+    for point in points:
+        key = f"p{point:g}"
+        if not total:
+            result[key] = None
+            continue
+        rank = math.ceil(total * point / 100)
+        seen = 0
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen >= rank:
+                result[key] = bucket_ms(bucket)
+                break
+    return result
+
+
+def paper_size(paper: Paper) -> int:
+    """Approximate payload size of a paper as an upstream API would send it."""
+    size = len(paper.id) + len(paper.title) + len(paper.abstract)
+    size += len(paper.url) + len(paper.pdf_url) + len(paper.published)
+    size += sum(len(a) for a in paper.authors)
+    size += sum(len(k) for k in paper.keywords)
+    size += sum(len(r) for r in paper.references)
+    return size
+
+
+class CacheMetrics:
+    """Thread-safe per-source cache counters and latency histograms.
+    
+    ``pending`` holds deltas not yet persisted; ``session`` keeps running
+    totals for the current process (used by the scan summary).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = self._empty()
+        self._session = self._empty()
+    
+    @staticmethod
+    def _empty():
+        return {
+            "counters": defaultdict(lambda: dict.fromkeys(COUNTERS, 0)),
+            "latency": defaultdict(lambda: defaultdict(int)),
+        }
+    
+    def record(self, source: str, outcome: str, seconds: float,
+               papers: Optional[List[Paper]] = None, requests_saved: int = 0):
+        """Record one cache lookup.
+        
+        Args:
+            source: Source name
+            outcome: "hits", "misses" or "stale_hits"
+            seconds: Lookup latency
+            papers: Papers served from the cache (hits only)
+            requests_saved: Upstream HTTP requests the hit avoided
+        """
+        bucket = latency_bucket(seconds)
+        saved = sum(paper_size(p) for p in papers) if papers else 0
+        with self._lock:
+            for totals in (self._pending, self._session):
+                counters = totals["counters"][source]
+                counters[outcome] += 1
+                counters["bytes_saved"] += saved
+                counters["requests_saved"] += requests_saved
+                totals["latency"][source][bucket] += 1
+    
+    def drain(self) -> Tuple[Dict[str, Dict[str, int]], Dict[str, Dict[int, int]]]:
+        """Return and reset the deltas not yet persisted."""
+        with self._lock:
+            pending, self._pending = self._pending, self._empty()
+        return (
+            {s: dict(c) for s, c in pending["counters"].items()},
+            {s: dict(h) for s, h in pending["latency"].items()},
+        )
+    
+    def session(self) -> Dict[str, int]:
+        """Counters summed over all sources for this process."""
+        with self._lock:
+            totals = dict.fromkeys(COUNTERS, 0)
+            for counters in self._session["counters"].values():
+                for name in COUNTERS:
+                    totals[name] += counters[name]
+        return totals
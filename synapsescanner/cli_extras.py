@@ -147,37 +147,10 @@ def show_progress(url, current, total):
 
 
 # ── Results box (deduplicated, Unicode borders) ──
-_ICONS = {
-    "Quantum breakthrough": "⚛",
-    "Metamaterial lens":    "◈",
-    "Temporal periodicity": "◎",
-    "AI physics":           "◆",
-}
-
-_EXPLANATIONS = {
-    "Quantum breakthrough": (
-        "Quantum erasure can be demonstrated with inexpensive optical"
-        " components, opening a low-cost pathway for teaching advanced"
-        " quantum-mechanics experiments in undergraduate labs."
-    ),
-    "Metamaterial lens": (
-        "Stacking everyday glass slides with index-matching oil recreates"
-        " the negative-refraction effect normally seen only in engineered"
-        " nanostructures, making metamaterial optics accessible on a bench."
-    ),
-    "Temporal periodicity": (
-        "A simple 555-timer circuit can produce the same discrete time-"
-        "symmetry breaking that underpins time-crystal research, giving"
-        " students a hands-on analogy for cutting-edge condensed-matter physics."
-    ),
-    "AI physics": (
-        "Training a small neural network on pendulum data shows how machine"
-        " learning can rediscover Newtonian mechanics from raw observations,"
-        " illustrating physics-informed ML with zero hardware cost."
-    ),
-}
-
 def show_results(patterns):
+    from synapsescanner.rules import get_rules
+    rules = get_rules()
+
     seen, unique = set(), []
     for p in patterns:
         if p["pattern"] not in seen:
@@ -198,7 +171,8 @@ def show_results(patterns):
 
     lines = [f"\n  {bdr}╭{hline}╮{RESET}"]
     for p in unique:
-        icon = _ICONS.get(p["pattern"], "●")
+        rule = rules.get(p["pattern"])
+        icon = rule.icon if rule else "●"
         lines.append(f"  {bdr}│{RESET}  {BOLD}{icon}  {p['pattern']}{RESET}")
         lines.append(f"  {bdr}│{RESET}     {DIM}{p['hint']}{RESET}")
         lines.append(f"  {bdr}│{RESET}     {DIM}{p['cost']} · {p['difficulty']}{RESET}")
@@ -209,9 +183,9 @@ def show_results(patterns):
 
     # Explanation paragraph for each discovery
     for p in unique:
-        explanation = _EXPLANATIONS.get(p["pattern"])
-        if explanation:
-            icon = _ICONS.get(p["pattern"], "●")
+        rule = rules.get(p["pattern"])
+        if rule and rule.explanation:
+            explanation, icon = rule.explanation, rule.icon
             sys.stdout.write(f"\n  {BOLD}{icon}  {p['pattern']}{RESET}\n")
             # Word-wrap the explanation to fit the terminal
             max_w = min(cols - 6, 72)
@@ -229,14 +203,15 @@ def show_results(patterns):
 
 
 # ── Keywords (braille-dot sparklines) ──
-def show_keywords(counter, limit=6):
+def show_keywords(counter, limit=6, label="keywords"):
+    """counter: {term: count}, e.g. a Counter or dict(TermSketch.top())."""
     if not counter:
         return
     braille = " ⣀⣄⣤⣦⣶⣷⣿"
     peak  = max(counter.values())
     items = sorted(counter.items(), key=lambda x: -x[1])[:limit]
 
-    sys.stdout.write(f"\n  {DIM}keywords{RESET}  ")
+    sys.stdout.write(f"\n  {DIM}{label}{RESET}  ")
     for word, freq in items:
         t = freq / peak
         r, g, b = _lerp(THEME.c1, THEME.c2, t)
@@ -247,13 +222,22 @@ def show_keywords(counter, limit=6):
 
 
 # ── Summary (one-liner with clickable repo link) ──
-def show_summary(papers, patterns, elapsed, repo_url=None):
+def show_summary(papers, patterns, elapsed, repo_url=None, cache=None):
+    """cache: optional session counters from CacheMetrics.session()."""
     r, g, b = THEME.ok
+    cache_part = ""
+    if cache:
+        served = cache["hits"] + cache["stale_hits"]
+        lookups = served + cache["misses"]
+        if lookups:
+            cache_part = f" {DIM}·{RESET} cache {served}/{lookups}"
+            if cache["requests_saved"]:
+                cache_part += f" {DIM}({cache['requests_saved']} requests saved){RESET}"
     sys.stdout.write(
         f"\n  {rgb(r, g, b)}✔{RESET} {BOLD}Done{RESET}"
         f" {DIM}·{RESET} {papers} papers"
         f" {DIM}·{RESET} {patterns} patterns"
-        f" {DIM}·{RESET} {elapsed:.1f}s\n"
+        f" {DIM}·{RESET} {elapsed:.1f}s{cache_part}\n"
     )
     if repo_url:
         link = _hyperlink(repo_url, repo_url.replace("https://", ""))
@@ -262,6 +246,55 @@ def show_summary(papers, patterns, elapsed, repo_url=None):
     sys.stdout.flush()
 
 
+# ── Cache statistics (synapsescanner --cache stats) ──
+def _fmt_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def show_cache_stats(stats, metrics, days=30):
+    """Display cache size and per-source hit statistics.
+    
+    Args:
+        stats: Dict from Cache.get_stats()
+        metrics: Dict from Cache.get_metrics()
+        days: History window the metrics cover
+    """
+    sys.stdout.write(
+        f"\n  {BOLD}Cache{RESET} {DIM}{stats['db_path']}{RESET}\n"
+        f"  {stats['total_papers']} papers {DIM}·{RESET} {stats['total_queries']} queries"
+        f" {DIM}·{RESET} {stats.get('total_authors', 0)} authors"
+        f" {DIM}·{RESET} {stats.get('total_keywords', 0)} keywords\n"
+    )
+    
+    if not metrics:
+        sys.stdout.write(f"\n  {DIM}No lookups recorded in the last {days} days.{RESET}\n\n")
+        sys.stdout.flush()
+        return
+    
+    def _ms(v):
+        return f"{v:.1f}" if v is not None else "-"
+    
+    sys.stdout.write(
+        f"\n  {DIM}last {days} days{RESET}\n"
+        f"  {DIM}{'source':<18}{'hit%':>6}{'hits':>7}{'stale':>7}{'miss':>7}"
+        f"{'saved':>10}{'reqs':>7}{'p50':>7}{'p95':>7}{'p99':>7}{RESET}\n"
+    )
+    for source, m in sorted(metrics.items()):
+        ratio = m["hit_ratio"]
+        colour = THEME.ok if ratio >= 0.5 else THEME.wrn
+        sys.stdout.write(
+            f"  {source:<18}{rgb(*colour)}{ratio * 100:>5.0f}%{RESET}"
+            f"{m['hits']:>7}{m['stale_hits']:>7}{m['misses']:>7}"
+            f"{_fmt_bytes(m['bytes_saved']):>10}{m['requests_saved']:>7}"
+            f"{_ms(m['p50']):>7}{_ms(m['p95']):>7}{_ms(m['p99']):>7}\n"
+        )
+    sys.stdout.write(f"  {DIM}latency in ms{RESET}\n\n")
+    sys.stdout.flush()
+
+
 # ── Hidden Connections box (rounded corners) ──
 def show_connections(connections):
     """Display hidden connections between papers."""
@@ -294,6 +327,37 @@ def show_connections(connections):
     sys.stdout.flush()
 
 
+def show_clusters(clusters):
+    """Display topic clusters of connected papers."""
+    if not clusters:
+        return
+    
+    cols = shutil.get_terminal_size().columns
+    w = min(62, cols - 4)
+    br, bg, bb = _lerp(THEME.c1, THEME.c2, 0.25)
+    bdr = rgb(br, bg, bb)
+    
+    hdr = " Topic Clusters "
+    hline = "─" * 2 + hdr + "─" * max(0, w - 4 - len(hdr))
+    
+    lines = [f"\n  {bdr}╭{hline}╮{RESET}"]
+    
+    for cluster in clusters[:5]:  # Show top 5
+        sources = sorted({p.source for p in cluster.papers})
+        lines.append(f"  {bdr}│{RESET}  ◉  {len(cluster.papers)} papers · {', '.join(sources)}")
+        keywords = ", ".join(cluster.keywords)
+        lines.append(f"  {bdr}│{RESET}     {DIM}{keywords[:50]}...{RESET}" if len(keywords) > 50
+                     else f"  {bdr}│{RESET}     {DIM}{keywords}{RESET}")
+        stars = "★" * int(cluster.strength // 2)
+        lines.append(f"  {bdr}│{RESET}     {rgb(*THEME.ok)}{stars}{RESET}")
+        lines.append(f"  {bdr}│{RESET}")
+    
+    lines.append(f"  {bdr}╰{'─' * (w - 2)}╯{RESET}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 # ── AI Digest box ──
 def show_ai_digest(summary):
     """Display AI-generated summary in a rounded box.
@@ -495,6 +559,13 @@ def show_cheat():
     synapsescanner "quantum" --watch
     synapsescanner "AI" --watch --notify
 
+  {DIM}CACHE{RESET}
+    synapsescanner --cache export snap.jsonl.gz
+    synapsescanner --cache import snap.jsonl.gz
+    synapsescanner --cache stats --days 7
+    synapsescanner --cache connections --days 7
+    synapsescanner --cache trending --top 10
+
   {DIM}OPTIONS{RESET}
     --max-results N       Papers to fetch (default 15)
     --sources LIST        Comma-separated source list
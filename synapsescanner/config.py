@@ -1,8 +1,11 @@
 """Configuration system for SynapseScanner."""
 import os
+import re
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
+_FLOAT_RE = re.compile(r"[-+]?(\d+\.\d*|\.\d+|\d+)([eE][-+]?\d+)?")
+
 
 class Config:
     """SynapseScanner configuration management."""
@@ -37,6 +40,29 @@ obsidian_vault: "~/SynapseNotes"
 
 # Cache settings
 cache_hours: 24
+# Decoded papers/query results kept in memory per process (0 disables)
+cache_memory_items: 1024
+# "strict" refetches expired queries; "stale-while-revalidate" serves them
+# immediately and refreshes in the background for up to cache_stale_hours
+cache_mode: "strict"
+cache_stale_hours: 168
+# Store abstracts and JSON columns zlib-compressed in cache.db
+cache_compression: false
+# Share cache.db between several scanner processes (WAL + batched writer)
+cache_multiprocess: false
+# Seconds to wait for another process's lock before giving up
+cache_busy_timeout: 30
+
+# Strongest cross-source connections kept per scan (0 = all)
+crossref_top_k: 500
+# Processes scoring connections (0 = one per CPU, 1 = no pool)
+crossref_workers: 1
+# Score by TF-IDF cosine similarity with this cut-off (0 = shared-term counts)
+crossref_min_similarity: 0
+# Connections at least this strong join papers into topic clusters
+cluster_min_strength: 1
+# Split clusters into communities by label propagation
+cluster_communities: false
 
 # Default search depth for rabbit holes (0-3)
 default_depth: 0
@@ -140,6 +166,10 @@ include_connections: true
         except ValueError:
             pass
         
+        # Float (plain decimal literals only, so "nan" or "inf" stay strings)
+        if _FLOAT_RE.fullmatch(value):
+            return float(value)
+        
         # Return as string
         return value
     
@@ -238,6 +268,94 @@ include_connections: true
     def cache_hours(self, value: int):
         self._data["cache_hours"] = value
     
+    @property
+    def cache_memory_items(self) -> int:
+        return self._data.get("cache_memory_items", 1024)
+    
+    @cache_memory_items.setter
+    def cache_memory_items(self, value: int):
+        self._data["cache_memory_items"] = value
+    
+    @property
+    def cache_mode(self) -> str:
+        return self._data.get("cache_mode", "strict")
+    
+    @cache_mode.setter
+    def cache_mode(self, value: str):
+        self._data["cache_mode"] = value
+    
+    @property
+    def cache_stale_hours(self) -> int:
+        return self._data.get("cache_stale_hours", 168)
+    
+    @cache_stale_hours.setter
+    def cache_stale_hours(self, value: int):
+        self._data["cache_stale_hours"] = value
+    
+    @property
+    def cache_compression(self) -> bool:
+        return self._data.get("cache_compression", False)
+    
+    @cache_compression.setter
+    def cache_compression(self, value: bool):
+        self._data["cache_compression"] = value
+    
+    @property
+    def cache_multiprocess(self) -> bool:
+        return self._data.get("cache_multiprocess", False)
+    
+    @cache_multiprocess.setter
+    def cache_multiprocess(self, value: bool):
+        self._data["cache_multiprocess"] = value
+    
+    @property
+    def cache_busy_timeout(self) -> int:
+        return self._data.get("cache_busy_timeout", 30)
+    
+    @cache_busy_timeout.setter
+    def cache_busy_timeout(self, value: int):
+        self._data["cache_busy_timeout"] = value
+    
+    @property
+    def crossref_top_k(self) -> int:
+        return self._data.get("crossref_top_k", 500)
+    
+    @crossref_top_k.setter
+    def crossref_top_k(self, value: int):
+        self._data["crossref_top_k"] = value
+    
+    @property
+    def crossref_workers(self) -> int:
+        return self._data.get("crossref_workers", 1)
+    
+    @crossref_workers.setter
+    def crossref_workers(self, value: int):
+        self._data["crossref_workers"] = value
+    
+    @property
+    def crossref_min_similarity(self) -> float:
+        return self._data.get("crossref_min_similarity", 0)
+    
+    @crossref_min_similarity.setter
+    def crossref_min_similarity(self, value: float):
+        self._data["crossref_min_similarity"] = value
+    
+    @property
+    def cluster_min_strength(self) -> int:
+        return self._data.get("cluster_min_strength", 1)
+    
+    @cluster_min_strength.setter
+    def cluster_min_strength(self, value: int):
+        self._data["cluster_min_strength"] = value
+    
+    @property
+    def cluster_communities(self) -> bool:
+        return self._data.get("cluster_communities", False)
+    
+    @cluster_communities.setter
+    def cluster_communities(self, value: bool):
+        self._data["cluster_communities"] = value
+    
     @property
     def default_depth(self) -> int:
         return self._data.get("default_depth", 0)
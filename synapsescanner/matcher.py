@@ -0,0 +1,104 @@
+"""Multi-pattern substring matching for SynapseScanner.
+
+Pattern detection and keyword counting look for many fixed strings in
+every paper. MultiPatternMatcher compiles them once into an Aho-Corasick
+automaton (a trie whose failure links are folded into a full transition
+table), so one pass over a text finds every occurrence of every pattern,
+however many patterns there are.
+
+Counts follow ``str.count``: occurrences of one pattern are counted
+left to right without overlapping, while different patterns may overlap.
+
+Below AUTOMATON_MIN_PATTERNS the matcher scans once per pattern with
+``str.count`` instead; CPython's C substring search beats a Python-level
+automaton loop until there are about a hundred patterns.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+AUTOMATON_MIN_PATTERNS = 100
+
+
+class MultiPatternMatcher:
+    """Finds and counts a fixed set of substrings in one pass per text."""
+    
+    def __init__(self, patterns: Iterable[str], automaton: Optional[bool] = None):
+        """Compile the patterns.
+        
+        Args:
+            patterns: Substrings to look for (case-sensitive; duplicates ignored)
+            automaton: Force (True) or disable (False) the automaton
+                (None = by pattern count, see AUTOMATON_MIN_PATTERNS)
+                
+        Raises:
+            ValueError: If a pattern is empty
+        """
+        self.patterns: List[str] = list(dict.fromkeys(patterns))
+        if any(not pattern for pattern in self.patterns):
+            raise ValueError("Patterns must be non-empty")
+        if automaton is None:
+            automaton = len(self.patterns) >= AUTOMATON_MIN_PATTERNS
+        self.automaton = automaton
+        if automaton:
+            self._delta, self._outputs = self._compile(self.patterns)
+    
+    @staticmethod
+    def _compile(patterns: List[str]) -> Tuple[List[Dict[str, int]], List[Tuple[Tuple[str, int], ...]]]:
+        """Transition table and per-state (pattern, length) outputs."""
+        delta: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, int]]] = [[]]
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                if ch not in delta[state]:
+                    delta.append({})
+                    outputs.append([])
+                    delta[state][ch] = len(delta) - 1
+                state = delta[state][ch]
+            outputs[state].append((pattern, len(pattern)))
+        
+        # Breadth-first, so a state's failure target is complete before it
+        fail = [0] * len(delta)
+        trie_edges = [list(edges.items()) for edges in delta]
+        queue = deque(target for _, target in trie_edges[0])
+        while queue:
+            state = queue.popleft()
+            for ch, target in trie_edges[state]:
+                queue.append(target)
+                fail[target] = delta[fail[state]].get(ch, 0) if state else 0
+                outputs[target].extend(outputs[fail[target]])
+            # Missing transitions behave as from the failure state
+            for ch, target in delta[fail[state]].items():
+                delta[state].setdefault(ch, target)
+        
+        return delta, [tuple(out) for out in outputs]
+    
+    def counts(self, text: str) -> Dict[str, int]:
+        """Occurrences of each pattern found in text, as str.count would."""
+        if not self.automaton:
+            found = {}
+            for pattern in self.patterns:
+                n = text.count(pattern)
+                if n:
+                    found[pattern] = n
+            return found
+        
+        delta, outputs = self._delta, self._outputs
+        found: Dict[str, int] = {}
+        next_start: Dict[str, int] = {}
+        state = 0
+        for end, ch in enumerate(text, 1):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for pattern, length in outputs[state]:
+                    # Skip occurrences overlapping the previous one counted
+                    if end - length >= next_start.get(pattern, 0):
+                        found[pattern] = found.get(pattern, 0) + 1
+                        next_start[pattern] = end
+        return found
+    
+    def found(self, text: str) -> Set[str]:
+        """Patterns occurring in text at least once."""
+        if not self.automaton:
+            return {pattern for pattern in self.patterns if pattern in text}
+        return set(self.counts(text))
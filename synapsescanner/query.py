@@ -0,0 +1,88 @@
+"""Canonical query normalization for SynapseScanner.
+
+Equivalent spellings of a search ("Quantum Entanglement",
+"quantum  entanglement", "entanglement quantum") should share one cache
+entry and one upstream request. canonicalize_query() maps them to a single
+form that is still a valid query for the source:
+
+- Unicode is NFKC-normalized, terms are lowercased and whitespace collapsed
+- Boolean operators (AND, OR, NOT, ANDNOT) are only recognized in
+  uppercase, since PubMed and arXiv treat lowercase "or" as a search term
+- Quoted phrases are kept as units; their inner whitespace is collapsed
+- Field tags (PubMed's ``smith j[au]``, ``"gene therapy"[mh]``) stay
+  attached to their term, and a tagged query keeps its term order, since
+  reordering would change which terms a tag applies to
+- Plain bag-of-terms queries (no operators, quotes or parentheses) have
+  their terms deduplicated and sorted, unless the source matches the
+  query as a phrase
+- Redundant source syntax (arXiv's default ``all:`` prefix) is dropped
+  from every term; other field prefixes (``ti:``, ``au:``) keep the
+  query's term order
+"""
+import re
+import unicodedata
+from typing import List, Optional
+
+OPERATORS = {"AND", "OR", "NOT", "ANDNOT"}
+
+# Sources that match the raw query as a phrase, so term order matters
+ORDER_SENSITIVE_SOURCES = {"biorxiv", "medrxiv"}
+
+# Prefixes a source adds by default; spelling them out changes nothing
+_DEFAULT_PREFIXES = {
+    "arxiv": "all:",
+}
+
+# A phrase or a bare term, either optionally followed by [field tags]
+_TOKEN_RE = re.compile(r'"[^"]*"?(?:\[[^\]]*\]?)*|[()]|(?:[^\s()"\[]|\[[^\]]*\]?)+')
+_PHRASE_RE = re.compile(r'"([^"]*)"?(.*)', re.DOTALL)
+_FIELD_RE = re.compile(r"[a-z]+:")
+
+
+def _tokenize(query: str) -> List[str]:
+    return _TOKEN_RE.findall(query)
+
+
+def _normalize_tags(text: str) -> str:
+    # Whitespace inside a tag is significant only as a separator ("[mesh terms]")
+    return re.sub(r"\[([^\]]*)", lambda m: "[" + " ".join(m.group(1).split()), text.lower())
+
+
+def _normalize_token(token: str) -> str:
+    if token in OPERATORS:
+        return token
+    if token.startswith('"'):
+        inner, tags = _PHRASE_RE.match(token).groups()
+        return '"' + " ".join(inner.lower().split()) + '"' + _normalize_tags(tags)
+    return _normalize_tags(token)
+
+
+def canonicalize_query(query: Optional[str], source: Optional[str] = None) -> str:
+    """Return the canonical form of a search query.
+    
+    Args:
+        query: Raw query string
+        source: Source name for source-specific rules (None for generic)
+    
+    Returns:
+        Canonical query string ("" for an empty query)
+    """
+    if not query:
+        return ""
+    
+    text = unicodedata.normalize("NFKC", query).strip()
+    
+    tokens = [_normalize_token(t) for t in _tokenize(text)]
+    prefix = _DEFAULT_PREFIXES.get(source or "")
+    if prefix:
+        tokens = [t[len(prefix):] if t.startswith(prefix) else t for t in tokens]
+        tokens = [t for t in tokens if t]
+    if not tokens:
+        return ""
+    
+    structured = any(t in OPERATORS or t in ("(", ")") or t.startswith('"') or "[" in t
+                     or _FIELD_RE.match(t) for t in tokens)
+    if structured or source in ORDER_SENSITIVE_SOURCES:
+        return " ".join(tokens)
+    
+    return " ".join(sorted(set(tokens)))
@@ -0,0 +1,334 @@
+"""Breakthrough pattern rules for SynapseScanner.
+
+Each rule names a breakthrough pattern, the trigger terms that suggest it
+and the experiment to try. Rules and the notable keywords counted across
+papers come from DEFAULT_RULES / DEFAULT_KEYWORDS, extended or overridden
+by ``~/.synapse/rules.json``::
+    
+    {
+      "defaults": true,
+      "keywords": ["graphene", "qubit"],
+      "rules": [
+        {
+          "pattern": "Graphene transistor",
+          "triggers": ["graphene", {"term": "transistor", "weight": 0.5}],
+          "threshold": 1.0,
+          "hint": "Draw a graphite resistor with a pencil and measure it",
+          "cost": "~$5", "difficulty": "Easy", "icon": "⬡"
+        }
+      ]
+    }
+
+A rule fires when the weights of its distinct triggers found in a paper's
+lowercased title and abstract add up to its threshold (every weight and
+threshold defaults to 1, so by default any trigger fires it). Triggers and
+keywords from the file are lowercased to match. File rules
+replace built-in rules of the same name; ``"defaults": false`` drops the
+built-ins altogether.
+
+A RuleSet compiles every trigger and keyword into one MultiPatternMatcher,
+so adding rules costs nothing per paper once the automaton takes over.
+get_rules() keeps the compiled set and only reloads when the file's
+modification time or size changes. A rule file that cannot be read or
+parsed is reported on stderr and the built-in rules are used instead.
+"""
+import hashlib
+import json
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Container, Dict, List, Optional, Tuple
+
+from .matcher import MultiPatternMatcher
+
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "pattern": "Quantum breakthrough",
+        "triggers": ["quantum", "entanglement", "superposition"],
+        "hint": "Test quantum erasure with polarized lenses & laser pointer",
+        "cost": "~$30", "difficulty": "Easy", "icon": "⚛",
+        "explanation": (
+            "Quantum erasure can be demonstrated with inexpensive optical"
+            " components, opening a low-cost pathway for teaching advanced"
+            " quantum-mechanics experiments in undergraduate labs."
+        ),
+        "details": (
+            "This breakthrough leverages quantum mechanical phenomena that were previously "
+            "only accessible in specialized laboratories. The suggested experiment makes "
+            "quantum effects visible using inexpensive, readily available components."
+        ),
+    },
+    {
+        "pattern": "Metamaterial lens",
+        "triggers": ["metamaterial", "negative index"],
+        "hint": "Stack microscope slides + oil for negative index demo",
+        "cost": "~$20", "difficulty": "Easy", "icon": "◈",
+        "explanation": (
+            "Stacking everyday glass slides with index-matching oil recreates"
+            " the negative-refraction effect normally seen only in engineered"
+            " nanostructures, making metamaterial optics accessible on a bench."
+        ),
+        "details": (
+            "Negative-index metamaterials were once theoretical constructs. This approach "
+            "demonstrates the effect using everyday materials, bridging the gap between "
+            "theoretical physics and hands-on experimentation."
+        ),
+    },
+    {
+        "pattern": "Temporal periodicity",
+        "triggers": ["time crystal", "temporal", "periodic"],
+        "hint": "555 timer + LED at 1 Hz, observe after-image",
+        "cost": "~$5", "difficulty": "Easy", "icon": "◎",
+        "explanation": (
+            "A simple 555-timer circuit can produce the same discrete time-"
+            "symmetry breaking that underpins time-crystal research, giving"
+            " students a hands-on analogy for cutting-edge condensed-matter physics."
+        ),
+        "details": (
+            "Time crystals represent a new phase of matter. This simple analog demonstrates "
+            "the core concept of discrete time-translation symmetry breaking in an accessible way."
+        ),
+    },
+    {
+        # "AI" is matched against lowercased text, so only the other triggers fire
+        "pattern": "AI physics",
+        "triggers": ["neural", "AI", "machine learning"],
+        "hint": "Train tiny model on physics data, predict pendulum motion",
+        "cost": "~$0 (laptop)", "difficulty": "Research", "icon": "◆",
+        "explanation": (
+            "Training a small neural network on pendulum data shows how machine"
+            " learning can rediscover Newtonian mechanics from raw observations,"
+            " illustrating physics-informed ML with zero hardware cost."
+        ),
+        "details": (
+            "Machine learning is revolutionizing how we discover physical laws. This approach "
+            "shows how neural networks can rediscover classical mechanics from raw data."
+        ),
+    },
+]
+
+# Terms counted across papers for the keyword display
+DEFAULT_KEYWORDS: List[str] = [
+    "quantum", "entanglement", "superposition", "metamaterial",
+    "neural", "AI", "machine learning", "photon", "laser",
+    "gravitational", "time crystal", "topology", "spin",
+    "lattice", "superconductor", "plasma", "dark matter",
+]
+
+
+def rules_path() -> Path:
+    """Default location of the user's rule file."""
+    return Path.home() / ".synapse" / "rules.json"
+
+
+@dataclass
+class PatternRule:
+    """One breakthrough pattern and the triggers that suggest it."""
+    pattern: str
+    triggers: Dict[str, float]       # trigger term -> weight
+    hint: str = ""
+    cost: str = ""
+    difficulty: str = ""
+    threshold: float = 1.0           # summed trigger weight needed to fire
+    icon: str = "●"
+    explanation: str = ""            # short paragraph for the terminal
+    details: str = ""                # longer background for AutoDocs
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], lowercase: bool = True) -> "PatternRule":
+        """Build a rule from its JSON form.
+        
+        Args:
+            data: Rule object as in the rule file
+            lowercase: Lowercase the triggers to match the lowercased text
+                (off for the built-in rules, which keep their "AI" trigger)
+        
+        Raises:
+            ValueError: If the pattern name, triggers or numbers are missing or malformed
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Rule must be a JSON object: {data!r}")
+        name = data.get("pattern")
+        if not name or not isinstance(name, str):
+            raise ValueError(f"Rule without a pattern name: {data!r}")
+        
+        triggers: Dict[str, float] = {}
+        raw_triggers = data.get("triggers") or []
+        if not isinstance(raw_triggers, list):
+            raise ValueError(f"Triggers of rule {name!r} must be a list")
+        for trigger in raw_triggers:
+            if isinstance(trigger, str):
+                term, weight = trigger, 1.0
+            elif isinstance(trigger, dict) and isinstance(trigger.get("term"), str):
+                term, weight = trigger["term"], _number(trigger.get("weight", 1.0), name)
+            else:
+                raise ValueError(f"Bad trigger in rule {name!r}: {trigger!r}")
+            if term:
+                triggers[term.lower() if lowercase else term] = weight
+        if not triggers:
+            raise ValueError(f"Rule {name!r} has no triggers")
+        
+        return cls(
+            pattern=name,
+            triggers=triggers,
+            hint=data.get("hint", ""),
+            cost=data.get("cost", ""),
+            difficulty=data.get("difficulty", ""),
+            threshold=_number(data.get("threshold", 1.0), name),
+            icon=data.get("icon", "●"),
+            explanation=data.get("explanation", ""),
+            details=data.get("details", ""),
+        )
+    
+    def to_pattern(self) -> Dict[str, str]:
+        """The pattern dict reported for a paper that fires this rule."""
+        return {
+            "pattern": self.pattern,
+            "hint": self.hint,
+            "cost": self.cost,
+            "difficulty": self.difficulty,
+        }
+    
+    def fires(self, found: Container[str]) -> bool:
+        """Whether the triggers found in a text reach the threshold.
+        
+        Args:
+            found: Triggers found in the text, or the text itself (a
+                substring test per trigger, stopping once the rule fires)
+        """
+        score = 0.0
+        for term, weight in self.triggers.items():
+            if term in found:
+                score += weight
+                if score >= self.threshold:
+                    return True
+        return False
+
+
+def _number(value: Any, rule: str) -> float:
+    """A weight or threshold as a float, rejecting non-numbers."""
+    if isinstance(value, bool):
+        raise ValueError(f"Bad number in rule {rule!r}: {value!r}")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Bad number in rule {rule!r}: {value!r}") from None
+
+
+class RuleSet:
+    """Pattern rules and notable keywords compiled into one matcher."""
+    
+    def __init__(self, rules: List[PatternRule], keywords: List[str]):
+        self.rules = rules
+        self.keywords = list(dict.fromkeys(keywords))
+        self._by_name = {rule.pattern: rule for rule in rules}
+        triggers = [term for rule in rules for term in rule.triggers]
+        self.matcher = MultiPatternMatcher(triggers + self.keywords)
+        
+        # Identifies the rules' behaviour, e.g. to invalidate stored matches
+        canonical = json.dumps(
+            [[asdict(rule) for rule in rules], self.keywords], sort_keys=True
+        )
+        self.version = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def get(self, pattern: str) -> Optional[PatternRule]:
+        """Rule for a pattern name, if any."""
+        return self._by_name.get(pattern)
+    
+    def scan(self, text: str) -> Tuple[List[PatternRule], Dict[str, int]]:
+        """Rules fired by a text and its keyword counts, in one pass.
+        
+        Args:
+            text: Lowercased title and abstract
+        
+        Returns:
+            Tuple of (fired rules in rule order, {keyword: count})
+        """
+        if not self.matcher.automaton:
+            # Few patterns: C substring search per term beats one Python-level
+            # pass, and rules stop testing triggers as soon as they fire
+            fired = [rule for rule in self.rules if rule.fires(text)]
+            counts = {}
+            for kw in self.keywords:
+                n = text.count(kw)
+                if n:
+                    counts[kw] = n
+            return fired, counts
+        
+        found = self.matcher.counts(text)
+        if not found:
+            return [], {}
+        fired = [rule for rule in self.rules if rule.fires(found)]
+        counts = {kw: found[kw] for kw in self.keywords if kw in found}
+        return fired, counts
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RuleSet":
+        """Build a rule set from a rule file's contents merged over the defaults.
+        
+        Raises:
+            ValueError: If the contents are malformed
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Rule file must contain a JSON object")
+        use_defaults = data.get("defaults", True)
+        
+        file_rules = data.get("rules") or []
+        file_keywords = data.get("keywords") or []
+        if not isinstance(file_rules, list):
+            raise ValueError("\"rules\" must be a list of rule objects")
+        if not isinstance(file_keywords, list) or not all(isinstance(k, str) for k in file_keywords):
+            raise ValueError("\"keywords\" must be a list of strings")
+        
+        rules: Dict[str, PatternRule] = {}
+        if use_defaults:
+            for rule in DEFAULT_RULES:
+                rules[rule["pattern"]] = PatternRule.from_dict(rule, lowercase=False)
+        for rule in file_rules:
+            parsed = PatternRule.from_dict(rule)
+            rules[parsed.pattern] = parsed
+        
+        keywords = list(DEFAULT_KEYWORDS) if use_defaults else []
+        keywords.extend(k.lower() for k in file_keywords if k)
+        return cls(list(rules.values()), keywords)
+
+
+_lock = threading.Lock()
+_loaded: Dict[str, Tuple[Optional[Tuple[int, int]], RuleSet]] = {}
+
+
+def get_rules(path: Optional[str] = None) -> RuleSet:
+    """Compiled rule set from a rule file (default ~/.synapse/rules.json).
+    
+    The compiled set is cached per file and reused until the file's
+    modification time or size changes. A missing file gives the built-in
+    rules; so does an invalid one, after a warning on stderr (once per
+    version of the file), so a typo cannot abort a scan.
+    """
+    path = str(path or rules_path())
+    try:
+        stat = Path(path).stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        key = None
+    
+    with _lock:
+        cached = _loaded.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+    
+    rule_set = RuleSet.from_dict({})
+    if key is not None:
+        try:
+            rule_set = RuleSet.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+        except (OSError, ValueError) as e:
+            # JSONDecodeError is a ValueError too
+            print(f"[!] Ignoring invalid rule file {path}: {e}", file=sys.stderr)
+    
+    with _lock:
+        _loaded[path] = (key, rule_set)
+    return rule_set
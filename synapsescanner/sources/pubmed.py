@@ -11,14 +11,19 @@ class PubMedSource(BaseSource):
     ESUMMARY_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
     EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
     
+    # esearch + esummary + efetch
+    requests_per_search = 3
+    supports_offset = True
+    
     def __init__(self, name: str = "pubmed"):
         super().__init__(name)
         self.tool = "synapsescanner"
         self.email = "user@synapsescanner.local"  # Required by NCBI
     
-    def search(self, query: str, limit: int = 10) -> List[Paper]:
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Paper]:
         """Search PubMed for papers matching the query."""
         papers = []
+        query = self.canonical_query(query)
         
         try:
             session = self._requests_session()
@@ -27,6 +32,7 @@ class PubMedSource(BaseSource):
             search_params = {
                 "db": "pubmed",
                 "term": query,
+                "retstart": offset,
                 "retmax": limit,
                 "retmode": "json",
                 "tool": self.tool,
@@ -140,10 +146,7 @@ class PubMedSource(BaseSource):
         url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
         pdf_url = f"https://doi.org/{doi}" if doi else ""
         
-        # Extract keywords
-        keywords = self._extract_keywords(title + " " + abstract)
-        
-        return Paper(
+        paper = Paper(
             id=pmid,
             title=title,
             authors=authors,
@@ -153,8 +156,11 @@ class PubMedSource(BaseSource):
             published=published,
             source="pubmed",
             citations=0,  # PubMed doesn't provide citation counts in basic API
-            keywords=keywords[:20]
         )
+        
+        # Extract keywords from the paper's normalized words
+        paper.keywords = self._extract_keywords(paper.tokens)[:20]
+        return paper
     
     def fetch_references(self, paper: Paper) -> List[Paper]:
         """PubMed doesn't provide easy reference fetching."""
@@ -9,12 +9,15 @@ class SemanticScholarSource(BaseSource):
     
     BASE_URL = "https://api.semanticscholar.org/graph/v1"
     
+    supports_offset = True
+    
     def __init__(self, name: str = "semantic_scholar"):
         super().__init__(name)
     
-    def search(self, query: str, limit: int = 10) -> List[Paper]:
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Paper]:
         """Search Semantic Scholar for papers matching the query."""
         papers = []
+        query = self.canonical_query(query)
         
         try:
             session = self._requests_session()
@@ -24,6 +27,7 @@ class SemanticScholarSource(BaseSource):
             params = {
                 "query": query,
                 "fields": "paperId,title,authors,year,abstract,url,openAccessPdf,citationCount,referenceCount",
+                "offset": offset,
                 "limit": limit
             }
             
@@ -76,10 +80,7 @@ class SemanticScholarSource(BaseSource):
         # Get citation count
         citations = data.get("citationCount", 0) or 0
         
-        # Extract keywords from title and abstract
-        keywords = self._extract_keywords(title + " " + abstract)
-        
-        return Paper(
+        paper = Paper(
             id=paper_id,
             title=title,
             authors=authors,
@@ -88,9 +89,12 @@ class SemanticScholarSource(BaseSource):
             pdf_url=pdf_url,
             published=published,
             source="semantic_scholar",
-            citations=citations,
-            keywords=keywords[:20]
+            citations=citations
         )
+        
+        # Extract keywords from the paper's normalized words
+        paper.keywords = self._extract_keywords(paper.tokens)[:20]
+        return paper
     
     def fetch_references(self, paper: Paper) -> List[Paper]:
         """Fetch papers cited by the given paper."""
@@ -23,7 +23,7 @@ from synapsescanner.cli_extras import (
     show_keywords, show_summary, show_cheat, matrix_rain,
     apply_noir, hide_cursor, show_cursor,
     show_connections, show_ai_digest, notify_webhook,
-    show_breakthrough_preview,
+    show_breakthrough_preview, show_cache_stats, show_clusters,
 )
 
 # Import new modules (with graceful fallback)
@@ -34,15 +34,18 @@ try:
     from synapsescanner.sources.semantic_scholar import SemanticScholarSource
     from synapsescanner.sources.pubmed import PubMedSource
     from synapsescanner.sources.biorxiv import BioRxivSource
-    from synapsescanner.cache import get_cache
+    from synapsescanner.cache import get_cache, get_refresher
     from synapsescanner.config import get_config
+    from synapsescanner.rules import get_rules
+    from synapsescanner.sketches import TermSketch
     CACHE_AVAILABLE = True
 except ImportError as e:
     print(f"Import error: {e}")
     CACHE_AVAILABLE = False
 
 try:
-    from synapsescanner.crossref import find_connections
+    from synapsescanner.crossref import find_connections, find_connections_tfidf
+    from synapsescanner.clustering import cluster_connections
     CROSSREF_AVAILABLE = True
 except ImportError:
     CROSSREF_AVAILABLE = False
@@ -77,21 +80,40 @@ REPO_URL = "https://github.com/CrazhHolmes/SynapseScanner"
 VERSION = "1.4.0"
 
 
+def _get_cache():
+    """Return the shared cache, configured from ~/.synapse/config.yaml."""
+    config = get_config()
+    return get_cache(memory_items=config.cache_memory_items,
+                     compress=config.cache_compression,
+                     multiprocess=config.cache_multiprocess,
+                     busy_timeout=config.cache_busy_timeout)
+
+
 def fetch_from_sources(query: str, sources: List[str], limit: int, 
-                       use_cache: bool = True) -> List[Paper]:
+                       use_cache: bool = True,
+                       stale_while_revalidate: Optional[bool] = None) -> List[Paper]:
     """Fetch papers from multiple sources.
     
+    Fresh cache entries shallower than ``limit`` are topped up: sources
+    that support offsets fetch only the missing tail.
+    
     Args:
         query: Search query
         sources: List of source names
         limit: Max results per source
         use_cache: Whether to use cache
+        stale_while_revalidate: Serve expired cache entries immediately and
+            refresh them in the background (default: config ``cache_mode``)
         
     Returns:
         List of Paper objects
     """
     all_papers = []
     
+    config = get_config() if CACHE_AVAILABLE else None
+    if stale_while_revalidate is None:
+        stale_while_revalidate = bool(config) and config.cache_mode == "stale-while-revalidate"
+    
     for source_name in sources:
         source = get_source(source_name)
         if not source:
@@ -99,33 +121,107 @@ def fetch_from_sources(query: str, sources: List[str], limit: int,
             continue
         
         # Check cache first
+        cached, offset = [], 0
         if use_cache and CACHE_AVAILABLE:
-            cache = get_cache()
-            cached = cache.get_cached(query, source_name)
-            if cached:
+            cache = _get_cache()
+            entry = cache.lookup(
+                query, source_name,
+                max_age_hours=config.cache_hours,
+                stale_hours=config.cache_stale_hours if stale_while_revalidate else 0,
+                requests_per_search=source.requests_per_search,
+                limit=limit,
+            )
+            if entry and entry.stale:
+                get_refresher().submit(
+                    source.canonical_query(query), source_name,
+                    lambda s=source, n=source_name: _refresh_source(s, n, query, limit),
+                )
+                show_status(f"Using stale {source_name} results (refreshing in background)",
+                            "ok", done=True)
+                all_papers.extend(entry.papers)
+                continue
+            if entry and entry.covers(limit):
                 show_status(f"Using cached {source_name} results", "ok", done=True)
-                all_papers.extend(cached)
+                all_papers.extend(entry.papers)
                 continue
+            if entry and source.supports_offset:
+                cached, offset = entry.papers, entry.depth
         
-        show_status(f"Searching {source_name}...", "info")
+        if offset:
+            show_status(f"Fetching {source_name} results {offset + 1}-{limit}...", "info")
+        else:
+            show_status(f"Searching {source_name}...", "info")
         
         try:
-            papers = source.search(query, limit=limit)
+            papers = source.search(query, limit=limit - offset, offset=offset)
+            returned = len(papers)
+            if cached:
+                # Upstream rankings shift between requests; skip repeats
+                seen = {p.id for p in cached}
+                papers = [p for p in papers if p.id not in seen]
             
-            if use_cache and CACHE_AVAILABLE:
-                cache = get_cache()
+            # Adapters return [] on errors, so an empty tail is not recorded:
+            # it would mark the cached head as exhausted
+            if use_cache and CACHE_AVAILABLE and (returned or not offset):
+                cache = _get_cache()
                 cache.save_papers(papers)
-                cache.record_query(query, source_name, limit, len(papers))
+                cache.record_query(query, source_name, limit, offset + returned,
+                                   papers=papers, offset=offset)
             
-            all_papers.extend(papers)
-            show_status(f"Found {len(papers)} papers from {source_name}", "ok", done=True)
+            all_papers.extend(cached + papers)
+            if offset:
+                show_status(f"Found {len(papers)} more papers from {source_name} "
+                            f"({len(cached)} cached)", "ok", done=True)
+            else:
+                show_status(f"Found {len(papers)} papers from {source_name}", "ok", done=True)
             
         except Exception as e:
             show_status(f"{source_name} error: {str(e)[:40]}", "err", done=True)
+            all_papers.extend(cached)
+    
+    if use_cache and CACHE_AVAILABLE:
+        _get_cache().flush_metrics()
     
     return all_papers
 
 
+def _refresh_source(source, source_name: str, query: str, limit: int) -> int:
+    """Background stale-while-revalidate job: refetch and update the cache.
+    
+    Runs on a worker thread, so it must not write to the terminal. An empty
+    result is treated as a failed refresh and leaves the stale entry usable.
+    """
+    papers = source.search(query, limit=limit)
+    if papers:
+        cache = _get_cache()
+        cache.save_papers(papers)
+        cache.record_query(query, source_name, limit, len(papers), papers=papers)
+    return len(papers)
+
+
+def report_background_refreshes(silent: bool = False) -> int:
+    """Wait for background cache refreshes and report what they updated.
+    
+    Args:
+        silent: If True, wait without printing
+        
+    Returns:
+        Number of (query, source) entries that were refreshed
+    """
+    if not CACHE_AVAILABLE:
+        return 0
+    
+    refresher = get_refresher()
+    if refresher.pending() and not silent:
+        show_status("Finishing background cache refresh...", "info")
+    completed = refresher.wait()
+    
+    if not silent:
+        for _, source_name, count in completed:
+            show_status(f"Refreshed {source_name} cache ({count} papers)", "ok", done=True)
+    return len(completed)
+
+
 def fetch_references_recursive(papers: List[Paper], depth: int, 
                                max_per_paper: int = 5) -> List[Paper]:
     """Fetch references recursively (rabbit hole mode).
@@ -174,58 +270,59 @@ def fetch_references_recursive(papers: List[Paper], depth: int,
     return all_papers
 
 
-def detect_patterns(papers: List[Paper]):
-    """Find cross-disciplinary breakthrough hints."""
-    patterns = []
+def scan_papers(papers: List[Paper], cache=None):
+    """Pattern names and keyword counts for each paper (see rules.py).
     
+    With a cache, results stored for the current rule-set version are
+    reused and only new or changed papers (or papers last scanned by
+    other rules) are scanned, then stored.
+    
+    Returns:
+        Tuple of (rules, [(pattern names, {keyword: count}) per paper])
+    """
+    rules = get_rules()
+    stored = cache.get_pattern_matches(papers, rules.version) if cache else {}
+    
+    results, scanned = [], []
     for paper in papers:
-        txt = (paper.title + " " + paper.abstract).lower()
-        
-        if any(q in txt for q in ["quantum", "entanglement", "superposition"]):
-            patterns.append({
-                "pattern": "Quantum breakthrough",
-                "hint": "Test quantum erasure with polarized lenses & laser pointer",
-                "cost": "~$30", "difficulty": "Easy",
-            })
-        if any(m in txt for m in ["metamaterial", "negative index"]):
-            patterns.append({
-                "pattern": "Metamaterial lens",
-                "hint": "Stack microscope slides + oil for negative index demo",
-                "cost": "~$20", "difficulty": "Easy",
-            })
-        if any(t in txt for t in ["time crystal", "temporal", "periodic"]):
-            patterns.append({
-                "pattern": "Temporal periodicity",
-                "hint": "555 timer + LED at 1 Hz, observe after-image",
-                "cost": "~$5", "difficulty": "Easy",
-            })
-        if any(a in txt for a in ["neural", "AI", "machine learning"]):
-            patterns.append({
-                "pattern": "AI physics",
-                "hint": "Train tiny model on physics data, predict pendulum motion",
-                "cost": "~$0 (laptop)", "difficulty": "Research",
-            })
+        result = stored.get((paper.id, paper.source))
+        if result is None:
+            fired, counts = rules.scan(paper.text)
+            result = ([rule.pattern for rule in fired], counts)
+            scanned.append((paper, *result))
+        results.append(result)
+    
+    if cache and scanned:
+        cache.save_pattern_matches(rules.version, scanned)
+    return rules, results
+
+
+def detect_patterns(papers: List[Paper], cache=None, scan=None):
+    """Find cross-disciplinary breakthrough hints.
+    
+    scan: scan_papers() result for these papers, to reuse instead of scanning again.
+    """
+    patterns = []
+    rules, results = scan or scan_papers(papers, cache)
+    
+    for names, _ in results:
+        patterns.extend(rules.get(name).to_pattern() for name in names)
     
     return patterns
 
 
-def build_keyword_counter(papers: List[Paper]):
-    """Count notable keywords across papers."""
+def build_keyword_counter(papers: List[Paper], cache=None, scan=None):
+    """Count notable keywords across papers.
+    
+    scan: scan_papers() result for these papers, to reuse instead of scanning again.
+    """
     import collections
     counter = collections.Counter()
-    keywords = [
-        "quantum", "entanglement", "superposition", "metamaterial",
-        "neural", "AI", "machine learning", "photon", "laser",
-        "gravitational", "time crystal", "topology", "spin",
-        "lattice", "superconductor", "plasma", "dark matter",
-    ]
+    _, results = scan or scan_papers(papers, cache)
     
-    for paper in papers:
-        txt = (paper.title + " " + paper.abstract).lower()
-        for kw in keywords:
-            n = txt.count(kw)
-            if n:
-                counter[kw] += n
+    for _, counts in results:
+        for kw, n in counts.items():
+            counter[kw] += n
     
     return counter
 
@@ -241,11 +338,28 @@ def watch_mode(args, config):
     
     try:
         while True:
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            cycle_started = datetime.now()
+            now = cycle_started.strftime("%Y-%m-%d %H:%M:%S")
             show_status(f"[{now}] Scanning...", "info")
             
             # Run scan
             new_papers = run_scan(args, config, silent=True)
+            report_background_refreshes()
+            
+            # Score only the papers this cycle added to the cached graph, and
+            # scan only the papers without stored pattern matches
+            new_connections = []
+            cycle_patterns = []
+            if CACHE_AVAILABLE and not args.fresh:
+                cache = _get_cache()
+                cycle_patterns = sorted({p["pattern"] for p in detect_patterns(new_papers, cache=cache)})
+                if cycle_patterns:
+                    show_status(f"Patterns: {', '.join(cycle_patterns)}", "ok", done=True)
+                cache.update_connections()
+                new_connections = cache.get_connections(since=cycle_started.isoformat())
+                if new_connections:
+                    show_status(f"{len(new_connections)} new connections", "ok", done=True)
+                    show_connections(new_connections)
             
             if new_papers and args.notify:
                 # Send webhook notification
@@ -257,6 +371,8 @@ def watch_mode(args, config):
                         "query": args.query or "(recent)",
                         "new_papers": len(new_papers),
                         "top_discovery": top_paper,
+                        "new_connections": len(new_connections),
+                        "patterns": cycle_patterns,
                         "timestamp": now
                     }
                     if notify_webhook(webhook_url, payload):
@@ -308,6 +424,100 @@ def run_scan(args, config, silent: bool = False) -> List[Paper]:
     return papers
 
 
+def cache_command(argv: List[str]) -> int:
+    """Handle ``synapsescanner --cache <command>``.
+    
+    Args:
+        argv: Arguments after ``cache``
+        
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="synapsescanner --cache",
+        description="Manage the local paper cache (~/.synapse/cache.db)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    export_parser = commands.add_parser("export", help="Write a cache snapshot")
+    export_parser.add_argument("path", help="Snapshot file (e.g. cache.jsonl.gz)")
+    
+    import_parser = commands.add_parser("import", help="Merge a cache snapshot")
+    import_parser.add_argument("path", help="Snapshot file written by 'cache export'")
+    
+    stats_parser = commands.add_parser("stats", help="Show cache size and hit statistics")
+    stats_parser.add_argument("--days", type=int, default=30,
+                              help="Days of history to include (default: 30)")
+    
+    connections_parser = commands.add_parser(
+        "connections", help="Show the strongest connections found recently")
+    connections_parser.add_argument("--days", type=int, default=7,
+                                    help="Connections found in the last N days (default: 7)")
+    connections_parser.add_argument("--min-strength", type=int, default=1,
+                                    help="Minimum strength 1-10 (default: 1)")
+    
+    trending_parser = commands.add_parser(
+        "trending", help="Show the terms in the most cached papers")
+    trending_parser.add_argument("--days", type=int, default=None,
+                                 help="Only papers fetched in the last N days (default: all)")
+    trending_parser.add_argument("--top", type=int, default=10,
+                                 help="Terms to show (default: 10)")
+    
+    args = parser.parse_args(argv)
+    
+    if not CACHE_AVAILABLE:
+        show_status("Cache unavailable", "err", done=True)
+        return 1
+    
+    cache = _get_cache()
+    
+    if args.command == "export":
+        counts = cache.export_snapshot(args.path)
+        show_status(f"Exported {counts['papers']} papers, {counts['queries']} queries and"
+                    f" {counts['connections']} connections to {args.path}", "ok", done=True)
+    
+    elif args.command == "import":
+        try:
+            counts = cache.import_snapshot(args.path)
+        except (OSError, ValueError) as e:
+            show_status(f"Import failed: {e}", "err", done=True)
+            return 1
+        show_status(f"Merged {counts['papers']} papers, {counts['queries']} queries and"
+                    f" {counts['connections']} connections ({counts['read']} records read)",
+                    "ok", done=True)
+    
+    elif args.command == "stats":
+        show_cache_stats(cache.get_stats(), cache.get_metrics(args.days), args.days)
+    
+    elif args.command == "connections":
+        from datetime import datetime, timedelta
+        
+        added = cache.update_connections()
+        if added:
+            show_status(f"Scored {added} new papers into the connection graph", "ok", done=True)
+        since = (datetime.now() - timedelta(days=args.days)).isoformat()
+        connections = cache.get_connections(since=since, min_strength=args.min_strength)
+        if not connections:
+            show_status(f"No connections found in the last {args.days} days", "wrn", done=True)
+        show_connections(connections)
+    
+    elif args.command == "trending":
+        from datetime import datetime, timedelta
+        
+        # Streams the cache through a fixed-size sketch, however large it is
+        fetched_after = None
+        if args.days is not None:
+            fetched_after = (datetime.now() - timedelta(days=args.days)).isoformat()
+        sketch = TermSketch().add_papers(cache.iter_papers(fetched_after=fetched_after))
+        if not sketch.papers:
+            show_status("No cached papers to count", "wrn", done=True)
+            return 0
+        show_keywords(dict(sketch.top(args.top)), limit=args.top, label="trending")
+        show_status(f"Counted terms across {sketch.papers} cached papers", "ok", done=True)
+    
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="SynapseScanner v1.3.0 - Universal Research Intelligence",
@@ -318,6 +528,9 @@ def main():
                         help="Matrix rain easter egg")
     parser.add_argument("--cheat", action="store_true",
                         help="Show CLI reference")
+    parser.add_argument("--cache", nargs=argparse.REMAINDER, default=None, metavar="COMMAND",
+                        help="Manage the local cache: export, import, stats, connections,"
+                             " trending (see --cache -h)")
     parser.add_argument("--noir", action="store_true",
                         help="Greyscale mode")
     parser.add_argument("--max-results", type=int, default=None,
@@ -359,6 +572,10 @@ def main():
     
     args = parser.parse_args()
     
+    # Cache management instead of a scan
+    if args.cache is not None:
+        sys.exit(cache_command(args.cache))
+    
     # Load config
     config = get_config() if CACHE_AVAILABLE else None
     
@@ -400,7 +617,27 @@ def main():
         # Find connections
         connections = []
         if CROSSREF_AVAILABLE and len(papers) > 1:
-            connections = find_connections(papers)
+            top_k = config.crossref_top_k if config else 500
+            workers = config.crossref_workers if config else 1
+            min_similarity = config.crossref_min_similarity if config else 0
+            if min_similarity:
+                # Weight terms by the whole cache when there is one
+                doc_freq = None
+                if CACHE_AVAILABLE and not args.fresh:
+                    doc_freq = _get_cache().document_frequencies()
+                connections = find_connections_tfidf(papers, min_similarity, doc_freq=doc_freq,
+                                                     top_k=top_k or None)
+            else:
+                connections = find_connections(papers, top_k=top_k or None, workers=workers)
+        
+        # Group connected papers into topic clusters
+        clusters = []
+        if connections:
+            clusters = cluster_connections(
+                connections,
+                min_strength=config.cluster_min_strength if config else 1,
+                communities=config.cluster_communities if config else False,
+            )
         
         # AI Summarization
         ai_summaries = []
@@ -419,21 +656,22 @@ def main():
         # JSON output mode
         if args.json and EXPORTERS_AVAILABLE:
             exporter = JSONExporter()
-            output = exporter.export(papers, connections)
+            trending = TermSketch().add_papers(papers).top(10)
+            output = exporter.export(papers, connections, clusters=clusters, trending=trending)
             print(output)
             return
         
         # Markdown output mode
         if args.md and EXPORTERS_AVAILABLE:
             exporter = ObsidianExporter()
-            output = exporter.export_to_string(papers, connections, args.query or "")
+            output = exporter.export_to_string(papers, connections, args.query or "", clusters=clusters)
             print(output)
             return
         
         # Obsidian export
         if args.export_obsidian and EXPORTERS_AVAILABLE:
             exporter = ObsidianExporter(args.export_obsidian)
-            result = exporter.export(papers, connections, args.query or "")
+            result = exporter.export(papers, connections, args.query or "", clusters=clusters)
             show_status(result, "ok", done=True)
         
         # Standard UI output
@@ -444,7 +682,11 @@ def main():
         sys.stdout.write("\n")
         
         # Detect patterns
-        patterns = detect_patterns(papers)
+        # Reuse pattern matches stored for unchanged papers
+        match_cache = _get_cache() if CACHE_AVAILABLE and not args.fresh else None
+        # One scan per paper feeds both the patterns and the keyword counts
+        scan = scan_papers(papers, cache=match_cache)
+        patterns = detect_patterns(papers, scan=scan)
         show_results(patterns)
         
         # AutoDocs: Generate breakthrough documentation (v1.4.0)
@@ -527,6 +769,7 @@ def main():
         # Show connections
         if connections and not args.json and not args.md:
             show_connections(connections)
+            show_clusters(clusters)
         
         # Show AI digests
         if ai_summaries and not args.json and not args.md:
@@ -551,12 +794,18 @@ def main():
             show_status("Citation analysis complete", "ok", done=True)
         
         # Show keywords
-        counter = build_keyword_counter(papers)
+        counter = build_keyword_counter(papers, scan=scan)
         show_keywords(counter)
+        show_keywords(dict(TermSketch().add_papers(papers).top(6)), label="trending")
         
-        # Summary
+        # Summary, timed before waiting on any background refresh
         unique_patterns = len({p["pattern"] for p in patterns})
-        show_summary(len(papers), unique_patterns, time.time() - t0, REPO_URL)
+        cache_session = _get_cache().metrics.session() if CACHE_AVAILABLE else None
+        show_summary(len(papers), unique_patterns, time.time() - t0, REPO_URL,
+                     cache=cache_session)
+        
+        # Let stale-while-revalidate refreshes land before exiting
+        report_background_refreshes()
         
     except Exception as e:
         if not args.json and not args.md:
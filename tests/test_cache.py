@@ -0,0 +1,616 @@
+"""Test SQLite cache."""
+import pytest
+from datetime import datetime
+from synapsescanner.sources import Paper
+from synapsescanner.cache import Cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return Cache(str(tmp_path / "cache.db"))
+
+
+def _paper(paper_id, source="arxiv", **kwargs):
+    kwargs.setdefault("title", f"Paper {paper_id}")
+    return Paper(id=paper_id, source=source, **kwargs)
+
+
+class TestMemoryLayer:
+    """Test the in-process LRU in front of SQLite."""
+    
+    def test_paper_lookup_hits_memory(self, cache):
+        cache.save_papers([_paper("1", authors=["Jane Doe"])])
+        first = cache.get_paper_by_id("1", "arxiv")
+        second = cache.get_paper_by_id("1", "arxiv")
+        assert first is second
+        assert first.authors == ["Jane Doe"]
+        assert cache.get_stats()["memory"]["hits"] >= 2
+    
+    def test_query_results_cached_and_invalidated(self, cache):
+        cache.save_papers([_paper("1")])
+        cache.record_query("quantum", "arxiv", 10, 1)
+        assert [p.id for p in cache.get_cached("quantum", "arxiv")] == ["1"]
+        
+        hits = cache.get_stats()["memory"]["hits"]
+        cache.get_cached("quantum", "arxiv")
+        assert cache.get_stats()["memory"]["hits"] > hits
+        
+        # Write-through: new papers for the source are visible immediately
+        cache.save_papers([_paper("2")])
+        assert {p.id for p in cache.get_cached("quantum", "arxiv")} == {"1", "2"}
+    
+    def test_disabled_memory_layer(self, tmp_path):
+        cache = Cache(str(tmp_path / "cache.db"), memory_items=0)
+        cache.save_papers([_paper("1")])
+        assert cache.get_paper_by_id("1", "arxiv").id == "1"
+        assert cache.get_stats()["memory"]["size"] == 0
+    
+    def test_clear_cache_drops_memory(self, cache):
+        cache.save_papers([_paper("1")])
+        cache.clear_cache()
+        assert cache.get_paper_by_id("1", "arxiv") is None
+
+
+class TestStaleWhileRevalidate:
+    """Test stale lookups and the background refresher."""
+    
+    def _age_query(self, cache, hours):
+        import sqlite3
+        from datetime import datetime, timedelta
+        old = (datetime.now() - timedelta(hours=hours)).isoformat()
+        with sqlite3.connect(cache.db_path) as conn:
+            conn.execute("UPDATE queries SET timestamp = ?", (old,))
+            conn.execute("UPDATE papers SET fetched_at = ?", (old,))
+        cache._memory.clear()
+    
+    def test_stale_entry_served_within_window(self, cache):
+        cache.save_papers([_paper("1")])
+        cache.record_query("quantum", "arxiv", 10, 1)
+        self._age_query(cache, 30)
+        
+        assert cache.get_cached("quantum", "arxiv", max_age_hours=24) is None
+        entry = cache.lookup("quantum", "arxiv", max_age_hours=24, stale_hours=24)
+        assert entry.stale
+        assert [p.id for p in entry.papers] == ["1"]
+        assert cache.lookup("quantum", "arxiv", max_age_hours=24, stale_hours=1) is None
+    
+    def test_refresher_dedupes_and_reports(self):
+        import threading
+        from synapsescanner.cache import BackgroundRefresher
+        
+        release = threading.Event()
+        refresher = BackgroundRefresher()
+        assert refresher.submit("q", "arxiv", lambda: release.wait(5) and 3)
+        assert not refresher.submit("q", "arxiv", lambda: 0)
+        release.set()
+        assert refresher.wait(timeout=5) == [("q", "arxiv", 3)]
+        assert refresher.pending() == 0
+
+
+class TestDeltaFetch:
+    """Test ranked query results and fetching only the missing tail."""
+    
+    def test_ranked_results_and_depth(self, cache):
+        papers = [_paper("b"), _paper("a"), _paper("c")]
+        cache.save_papers(papers + [_paper("other")])
+        cache.record_query("quantum", "arxiv", 5, 3, papers=papers)
+        
+        entry = cache.lookup("quantum", "arxiv")
+        assert [p.id for p in entry.papers] == ["b", "a", "c"]
+        assert entry.depth == 3
+        assert entry.exhausted
+        assert entry.covers(50)
+        
+        assert [p.id for p in cache.lookup("quantum", "arxiv", limit=2).papers] == ["b", "a"]
+    
+    def test_tail_extends_entry(self, cache):
+        head = [_paper(str(i)) for i in range(3)]
+        cache.save_papers(head)
+        cache.record_query("quantum", "arxiv", 3, 3, papers=head)
+        before = cache.lookup("quantum", "arxiv")
+        assert not before.covers(5)
+        
+        tail = [_paper(str(i)) for i in range(3, 5)]
+        cache.save_papers(tail)
+        cache.record_query("quantum", "arxiv", 5, 5, papers=tail, offset=3)
+        
+        after = cache.lookup("quantum", "arxiv")
+        assert [p.id for p in after.papers] == ["0", "1", "2", "3", "4"]
+        assert after.covers(5) and not after.exhausted
+        # The entry keeps the age of its first page
+        assert after.last_queried == before.last_queried
+    
+    def test_scanner_fetches_only_tail(self, cache, monkeypatch):
+        from types import SimpleNamespace
+        from synapsescanner import universal_scanner
+        
+        calls = []
+        
+        class FakeSource:
+            name = "arxiv"
+            requests_per_search = 1
+            supports_offset = True
+            
+            def canonical_query(self, query):
+                return query
+            
+            def search(self, query, limit=10, offset=0):
+                calls.append((offset, limit))
+                return [_paper(str(i)) for i in range(offset, offset + limit)]
+        
+        config = SimpleNamespace(cache_hours=24, cache_mode="strict", cache_stale_hours=0)
+        monkeypatch.setattr(universal_scanner, "_get_cache", lambda: cache)
+        monkeypatch.setattr(universal_scanner, "get_config", lambda: config)
+        monkeypatch.setattr(universal_scanner, "get_source", lambda name: FakeSource())
+        
+        first = universal_scanner.fetch_from_sources("quantum", ["arxiv"], 3)
+        second = universal_scanner.fetch_from_sources("quantum", ["arxiv"], 5)
+        third = universal_scanner.fetch_from_sources("quantum", ["arxiv"], 4)
+        
+        assert calls == [(0, 3), (3, 2)]
+        assert [p.id for p in first] == ["0", "1", "2"]
+        assert [p.id for p in second] == ["0", "1", "2", "3", "4"]
+        assert [p.id for p in third] == ["0", "1", "2", "3"]
+    
+    def test_tail_with_repeats_is_covered(self, cache, monkeypatch):
+        from types import SimpleNamespace
+        from synapsescanner import universal_scanner
+        
+        calls = []
+        
+        class ShiftingSource:
+            name = "arxiv"
+            requests_per_search = 1
+            supports_offset = True
+            
+            def canonical_query(self, query):
+                return query
+            
+            def search(self, query, limit=10, offset=0):
+                calls.append((offset, limit))
+                # Rankings shifted by one since the head was fetched
+                start = offset - 1 if offset else 0
+                return [_paper(str(i)) for i in range(start, start + limit)]
+        
+        config = SimpleNamespace(cache_hours=24, cache_mode="strict", cache_stale_hours=0)
+        monkeypatch.setattr(universal_scanner, "_get_cache", lambda: cache)
+        monkeypatch.setattr(universal_scanner, "get_config", lambda: config)
+        monkeypatch.setattr(universal_scanner, "get_source", lambda name: ShiftingSource())
+        
+        universal_scanner.fetch_from_sources("quantum", ["arxiv"], 3)
+        second = universal_scanner.fetch_from_sources("quantum", ["arxiv"], 5)
+        third = universal_scanner.fetch_from_sources("quantum", ["arxiv"], 5)
+        
+        # The repeated "2" is dropped, but the source did return 5 results
+        assert calls == [(0, 3), (3, 2)]
+        assert [p.id for p in second] == [p.id for p in third] == ["0", "1", "2", "3"]
+        assert cache.lookup("quantum", "arxiv").depth == 5
+
+
+class TestIterPapers:
+    """Test keyset-paginated streaming over the whole cache."""
+    
+    def test_streams_past_batches(self, cache):
+        cache.save_papers([_paper(f"{i:04d}") for i in range(25)])
+        cache.save_papers([_paper("0003", source="pubmed")])
+        papers = list(cache.iter_papers(batch_size=4))
+        assert len(papers) == 26
+        assert [(p.id, p.source) for p in papers[3:5]] == [("0003", "arxiv"), ("0003", "pubmed")]
+    
+    def test_filters(self, cache):
+        cache.save_papers([
+            _paper("1", published="2023-05-01"),
+            _paper("2", published="2024-02-10T12:00:00Z"),
+            _paper("3", source="pubmed", published="2024-03-01"),
+        ])
+        ids = lambda **kw: [p.id for p in cache.iter_papers(batch_size=1, **kw)]
+        assert ids(sources=["arxiv"]) == ["1", "2"]
+        assert ids(since="2024-01-01") == ["2", "3"]
+        assert ids(until="2024-02-10") == ["1", "2"]
+        assert ids(sources=["pubmed"], since="2024-01-01") == ["3"]
+        assert ids(fetched_after="9999-01-01T00:00:00") == []
+    
+    def test_tolerates_writes_during_iteration(self, cache):
+        cache.save_papers([_paper(str(i)) for i in range(1, 6)])
+        seen = []
+        for paper in cache.iter_papers(batch_size=2):
+            seen.append(paper.id)
+            if paper.id == "2":
+                cache.save_papers([_paper("0"), _paper("9")])
+        # Rows behind the cursor are skipped, rows ahead of it are seen once
+        assert seen == ["1", "2", "3", "4", "5", "9"]
+
+
+class TestCompression:
+    """Test compressed column storage."""
+    
+    ABSTRACT = ("We study quantum entanglement in superconducting qubits and "
+                "report coherence times for entangled photon pairs. ") * 4
+    
+    def test_roundtrip_with_trained_dictionary(self, tmp_path):
+        import sqlite3
+        cache = Cache(str(tmp_path / "cache.db"), memory_items=0, compress=True)
+        papers = [_paper(str(i), authors=["Jane Doe", f"Author {i}"],
+                         abstract=self.ABSTRACT, keywords=["quantum", "qubits"])
+                  for i in range(20)]
+        cache.save_papers(papers)
+        assert cache.train_compression_dictionary() is not None
+        assert cache.recompress() == 20
+        
+        with sqlite3.connect(cache.db_path) as conn:
+            stored = conn.execute("SELECT abstract FROM papers LIMIT 1").fetchone()[0]
+        assert isinstance(stored, bytes)
+        assert len(stored) < len(self.ABSTRACT)
+        
+        paper = cache.get_paper_by_id("3", "arxiv")
+        assert paper.abstract == self.ABSTRACT
+        assert paper.authors == ["Jane Doe", "Author 3"]
+        assert paper.keywords == ["quantum", "qubits"]
+    
+    def test_plain_rows_still_readable(self, tmp_path):
+        db_path = str(tmp_path / "cache.db")
+        Cache(db_path).save_papers([_paper("1", abstract=self.ABSTRACT)])
+        cache = Cache(db_path, memory_items=0, compress=True)
+        assert cache.get_paper_by_id("1", "arxiv").abstract == self.ABSTRACT
+
+
+class TestAuthorKeywordIndex:
+    """Test normalized author/keyword tables."""
+    
+    def test_lookup_by_author_and_keyword(self, cache):
+        cache.save_papers([
+            _paper("1", authors=["Jane Doe"], keywords=["quantum", "optics"]),
+            _paper("2", source="pubmed", authors=["jane  doe", "Bob Wilson"],
+                   keywords=["Quantum", "biology"]),
+            _paper("3", authors=["Bob Wilson"], keywords=["optics"]),
+        ])
+        assert {p.id for p in cache.get_papers_by_author("JANE DOE")} == {"1", "2"}
+        assert {p.id for p in cache.get_papers_by_keyword("quantum")} == {"1", "2"}
+        
+        related = cache.get_papers_sharing_keywords("1", "arxiv")
+        assert {(p.id, n) for p, n in related} == {("2", 1), ("3", 1)}
+    
+    def test_reingest_replaces_join_rows(self, cache):
+        cache.save_papers([_paper("1", authors=["Jane Doe"])])
+        cache.save_papers([_paper("1", authors=["Bob Wilson"])])
+        assert cache.get_papers_by_author("Jane Doe") == []
+        assert [p.id for p in cache.get_papers_by_author("Bob Wilson")] == ["1"]
+    
+    def test_migration_backfills_existing_rows(self, tmp_path):
+        import sqlite3
+        db_path = str(tmp_path / "cache.db")
+        Cache(db_path).save_papers([_paper("1", authors=["Jane Doe"])])
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DROP TABLE paper_authors")
+            conn.execute("PRAGMA user_version = 0")
+        
+        cache = Cache(db_path)
+        assert [p.id for p in cache.get_papers_by_author("jane doe")] == ["1"]
+
+
+class TestMultiprocess:
+    """Test WAL mode, busy handling and the batching writer queue."""
+    
+    def test_queued_writes_visible_to_own_reads(self, tmp_path):
+        cache = Cache(str(tmp_path / "cache.db"), memory_items=0, multiprocess=True)
+        try:
+            cache.save_papers([_paper("1")])
+            cache.record_query("quantum", "arxiv", 10, 1)
+            assert [p.id for p in cache.get_cached("quantum", "arxiv")] == ["1"]
+            assert cache.get_stats()["writes"]["writes"] == 2
+        finally:
+            cache.close()
+    
+    def test_second_process_sees_committed_writes(self, tmp_path):
+        db_path = str(tmp_path / "cache.db")
+        writer = Cache(db_path, multiprocess=True)
+        reader = Cache(db_path, multiprocess=True)
+        try:
+            writer.save_papers([_paper("1")])
+            writer.flush()
+            assert reader.get_paper_by_id("1", "arxiv").id == "1"
+        finally:
+            writer.close()
+            reader.close()
+    
+    def test_writes_dropped_when_lock_held(self, tmp_path):
+        import sqlite3
+        db_path = str(tmp_path / "cache.db")
+        cache = Cache(db_path, memory_items=0, multiprocess=True, busy_timeout=0.05)
+        cache._writer.retries = 1
+        cache._writer.backoff = 0.01
+        
+        other = sqlite3.connect(db_path)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            cache.save_papers([_paper("1")])
+            cache.flush()
+            assert cache.get_stats()["writes"]["dropped"] == 1
+        finally:
+            other.rollback()
+            other.close()
+            cache.close()
+    
+    def test_bulk_writes_go_through_queue(self, tmp_path):
+        source = Cache(str(tmp_path / "source.db"))
+        source.save_papers([_paper("1", authors=["Jane Doe"]),
+                            _paper("2", source="pubmed", authors=["Jane Doe"])])
+        path = str(tmp_path / "snap.jsonl.gz")
+        source.export_snapshot(path)
+        
+        cache = Cache(str(tmp_path / "cache.db"), memory_items=0, multiprocess=True)
+        try:
+            assert cache.import_snapshot(path)["papers"] == 2
+            assert cache.update_connections() == 2
+            assert len(cache.get_connections()) == 1
+            assert cache.recompress() == 2
+            cache.clear_cache()
+            assert cache.get_all_papers() == []
+            assert cache.get_stats()["writes"]["writes"] == 4
+        finally:
+            cache.close()
+    
+    def test_failed_migration_keeps_old_schema(self, tmp_path, monkeypatch):
+        import sqlite3
+        db_path = str(tmp_path / "cache.db")
+        Cache(db_path).save_papers([_paper("1", authors=["Jane Doe"])])
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DROP TABLE paper_authors")
+            conn.execute("PRAGMA user_version = 0")
+        
+        def interrupted(self, conn, paper):
+            raise RuntimeError("interrupted")
+        
+        monkeypatch.setattr(Cache, "_index_paper", interrupted)
+        with pytest.raises(RuntimeError):
+            Cache(db_path)
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+            assert conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'paper_authors'").fetchone() is None
+        
+        monkeypatch.undo()
+        assert [p.id for p in Cache(db_path).get_papers_by_author("jane doe")] == ["1"]
+
+
+class TestSnapshot:
+    """Test cache snapshot export/import."""
+    
+    def test_cli_flag_routes_cache_commands(self, monkeypatch):
+        from synapsescanner import universal_scanner
+        
+        calls = []
+        monkeypatch.setattr(universal_scanner, "cache_command", lambda argv: calls.append(argv) or 0)
+        monkeypatch.setattr("sys.argv", ["synapsescanner", "--cache", "stats", "--days", "3"])
+        with pytest.raises(SystemExit):
+            universal_scanner.main()
+        assert calls == [["stats", "--days", "3"]]
+    
+    def test_roundtrip_into_empty_cache(self, tmp_path, cache):
+        papers = [_paper("1", authors=["Jane Doe"], references=["2"])]
+        cache.save_papers(papers)
+        cache.record_query("quantum", "arxiv", 10, 1, papers=papers)
+        path = str(tmp_path / "snap.jsonl.gz")
+        assert cache.export_snapshot(path) == {"papers": 1, "queries": 1, "connections": 0}
+        
+        other = Cache(str(tmp_path / "other.db"))
+        counts = other.import_snapshot(path)
+        assert counts["papers"] == 1 and counts["queries"] == 1
+        assert other.get_paper_by_id("1", "arxiv").references == ["2"]
+        assert [p.id for p in other.get_papers_by_author("jane doe")] == ["1"]
+        assert [p.id for p in other.get_cached("quantum", "arxiv")] == ["1"]
+        assert other.lookup("quantum", "arxiv").depth == 1
+        
+        # Importing again changes nothing: local rows are not older
+        assert other.import_snapshot(path) == {"read": 2, "papers": 0, "queries": 0,
+                                               "connections": 0}
+    
+    def test_newest_row_wins(self, tmp_path, cache):
+        cache.save_papers([_paper("1", abstract="old")])
+        path = str(tmp_path / "snap.jsonl.gz")
+        cache.export_snapshot(path)
+        
+        other = Cache(str(tmp_path / "other.db"))
+        other.save_papers([_paper("1", abstract="new")])
+        other.import_snapshot(path)
+        assert other.get_paper_by_id("1", "arxiv").abstract == "new"
+        
+        other.export_snapshot(path)
+        cache.import_snapshot(path)
+        assert cache.get_paper_by_id("1", "arxiv").abstract == "new"
+    
+    def test_rejects_foreign_file(self, tmp_path, cache):
+        import gzip
+        path = str(tmp_path / "bad.gz")
+        with gzip.open(path, "wt") as f:
+            f.write('{"format": "other"}\n')
+        with pytest.raises(ValueError):
+            cache.import_snapshot(path)
+
+
+class TestConnectionGraph:
+    """Test the persistent, incrementally updated connection graph."""
+    
+    def _papers(self):
+        return [
+            _paper("1", authors=["Jane Doe"], title="Quantum error codes"),
+            _paper("2", source="pubmed", authors=["jane  doe"], title="Protein folding"),
+            _paper("3", source="pubmed", title="Quantum error mitigation"),
+            _paper("4", source="biorxiv", title="Unrelated biology"),
+        ]
+    
+    def test_incremental_update_matches_find_connections(self, cache):
+        from synapsescanner.crossref import find_connections
+        
+        papers = self._papers()
+        cache.save_papers(papers[:2])
+        assert cache.update_connections() == 2
+        assert cache.update_connections() == 0
+        
+        cache.save_papers(papers[2:])
+        assert cache.update_connections() == 2
+        
+        stored = {(c.paper_a.id, c.paper_b.id, c.strength, c.reason)
+                  for c in cache.get_connections()}
+        expected = {(c.paper_a.id, c.paper_b.id, c.strength, c.reason)
+                    for c in find_connections(papers)}
+        assert stored == expected and len(stored) == 2
+        assert [c.paper_b.id for c in cache.get_connections(paper=("3", "pubmed"))] == ["3"]
+    
+    def test_rescoring_keeps_first_found(self, cache):
+        papers = self._papers()
+        cache.save_papers(papers)
+        cache.update_connections()
+        marker = datetime.now().isoformat()
+        
+        # An unchanged refetch stays in the graph
+        cache.save_papers(papers)
+        assert cache.update_connections() == 0
+        assert len(cache.get_connections()) == 2
+        assert cache.get_connections(since=marker) == []
+        
+        # Changed papers are rescored, but their edges are not new, even
+        # when both ends of an edge are rescored in the same update
+        cache.save_papers([_paper("1", authors=["Jane Doe"], title="Quantum error codes revisited"),
+                           _paper("2", source="pubmed", authors=["jane doe"], title="Protein folding rates")])
+        assert cache.update_connections() == 2
+        assert len(cache.get_connections()) == 2
+        assert cache.get_connections(since=marker) == []
+        
+        cache.save_papers([_paper("5", source="biorxiv", authors=["Jane Doe"])])
+        cache.update_connections()
+        new = {frozenset((c.paper_a.id, c.paper_b.id)) for c in cache.get_connections(since=marker)}
+        assert new == {frozenset(("1", "5")), frozenset(("2", "5"))}
+    
+    def test_malformed_records_name_their_line(self, tmp_path, cache):
+        import gzip
+        import json
+        from synapsescanner.cache import SNAPSHOT_FORMAT, SNAPSHOT_VERSION
+        
+        header = json.dumps({"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION})
+        good = json.dumps({"kind": "paper", "id": "1", "source": "arxiv", "title": "T"})
+        for bad in ['{"kind": "query", "query": "q", "source": "arxiv"}',
+                    '{"kind": "paper", "id": "2", "source": "arxiv", "authors": "Jane Doe"}',
+                    '{"kind": "connection", "paper_a": "1"}',
+                    '["not", "a", "record"]',
+                    '{"kind": "paper",']:
+            path = tmp_path / "bad.jsonl.gz"
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                f.write("\n".join([header, good, bad]) + "\n")
+            with pytest.raises(ValueError, match="line 3"):
+                cache.import_snapshot(str(path))
+    
+    def test_edges_in_snapshot(self, tmp_path, cache):
+        cache.save_papers(self._papers())
+        cache.update_connections()
+        path = str(tmp_path / "snap.jsonl.gz")
+        assert cache.export_snapshot(path)["connections"] == 2
+        
+        other = Cache(str(tmp_path / "other.db"))
+        assert other.import_snapshot(path)["connections"] == 2
+        assert len(other.get_connections()) == 2
+
+
+class TestDocumentFrequencies:
+    """Test incrementally maintained document frequencies."""
+    
+    def test_counts_follow_saves(self, cache):
+        from synapsescanner.crossref import AUTHORS, KEYWORDS, TITLE_WORDS
+        
+        cache.save_papers([
+            _paper("1", authors=["Jane Doe"], keywords=["Qubits", "noise"]),
+            _paper("2", source="pubmed", authors=["jane doe"], keywords=["qubits"]),
+        ])
+        df = cache.document_frequencies()
+        assert df.num_docs == 2
+        assert df.counts[(AUTHORS, "jane doe")] == 2
+        assert df.counts[(KEYWORDS, "qubits")] == 2
+        assert df.counts[(TITLE_WORDS, "paper")] == 2
+        
+        # Re-saving a paper moves its counts to its new terms
+        cache.save_papers([_paper("1", authors=["Jane Doe"], keywords=["lasers"])])
+        df = cache.document_frequencies()
+        assert df.counts[(KEYWORDS, "qubits")] == 1
+        assert (KEYWORDS, "noise") not in df.counts
+        assert df.counts[(KEYWORDS, "lasers")] == 1
+        assert df.idf(KEYWORDS, "lasers") > df.idf(AUTHORS, "jane doe")
+    
+    def test_migration_backfills_counts(self, tmp_path):
+        import sqlite3
+        db_path = str(tmp_path / "cache.db")
+        Cache(db_path).save_papers([_paper("1", keywords=["qubits"]),
+                                    _paper("2", keywords=["qubits"])])
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE keywords SET df = 0")
+            conn.execute("PRAGMA user_version = 5")
+        
+        assert Cache(db_path).document_frequencies().counts[(1, "qubits")] == 2
+
+
+class TestPatternMatches:
+    """Test stored pattern matches keyed by rule-set version."""
+    
+    def test_lookup_requires_same_version_and_text(self, cache):
+        paper = _paper("1", abstract="Quantum spin lattice")
+        cache.save_pattern_matches("v1", [(paper, ["Quantum breakthrough"], {"spin": 1})])
+        
+        assert cache.get_pattern_matches([paper], "v1") == {
+            ("1", "arxiv"): (["Quantum breakthrough"], {"spin": 1})}
+        assert cache.get_pattern_matches([paper], "v2") == {}
+        changed = _paper("1", abstract="Plasma physics")
+        assert cache.get_pattern_matches([changed], "v1") == {}
+        assert cache.get_pattern_matches([_paper("1", source="pubmed")], "v1") == {}
+    
+    def test_scan_skips_stored_papers(self, cache, monkeypatch):
+        from synapsescanner import universal_scanner
+        from synapsescanner.rules import RuleSet
+        
+        papers = [_paper("1", abstract="Quantum entanglement"), _paper("2", abstract="Spin ice")]
+        expected = universal_scanner.detect_patterns(papers)
+        assert universal_scanner.detect_patterns(papers, cache=cache) == expected
+        
+        scanned = []
+        original = RuleSet.scan
+        monkeypatch.setattr(RuleSet, "scan", lambda self, text: scanned.append(text) or original(self, text))
+        
+        papers.append(_paper("3", abstract="Metamaterial cloak"))
+        patterns = universal_scanner.detect_patterns(papers, cache=cache)
+        assert [p["pattern"] for p in patterns] == ["Quantum breakthrough", "Metamaterial lens"]
+        counter = universal_scanner.build_keyword_counter(papers, cache=cache)
+        assert counter == universal_scanner.build_keyword_counter(papers[:3])
+        assert len(scanned) == 1 + 3  # paper 3 once, then the uncached run
+        
+        # main scans once and builds both results from that scan
+        scan = universal_scanner.scan_papers(papers)
+        assert universal_scanner.detect_patterns(papers, scan=scan) == patterns
+        assert universal_scanner.build_keyword_counter(papers, scan=scan) == counter
+        assert len(scanned) == 4 + 3
+
+
+class TestMetrics:
+    """Test cache instrumentation."""
+    
+    def test_lookups_counted_and_persisted(self, cache):
+        cache.save_papers([_paper("1", abstract="x" * 100)])
+        cache.record_query("quantum", "arxiv", 10, 1)
+        cache.lookup("quantum", "arxiv", requests_per_search=3)
+        cache.lookup("missing", "arxiv")
+        
+        assert cache.metrics.session()["hits"] == 1
+        metrics = cache.get_metrics()["arxiv"]
+        assert metrics["hits"] == 1 and metrics["misses"] == 1
+        assert metrics["hit_ratio"] == 0.5
+        assert metrics["requests_saved"] == 3
+        assert metrics["bytes_saved"] > 100
+        assert metrics["p50"] is not None
+        
+        # Persisted counters accumulate across flushes
+        cache.lookup("quantum", "arxiv")
+        assert cache.get_metrics()["arxiv"]["hits"] == 2
+    
+    def test_percentiles(self):
+        from synapsescanner.cache_metrics import latency_bucket, percentiles
+        histogram = {latency_bucket(0.001): 90, latency_bucket(0.1): 10}
+        result = percentiles(histogram)
+        assert 0.8 < result["p50"] < 1.25
+        assert 80 < result["p99"] < 125
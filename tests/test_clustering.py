@@ -0,0 +1,69 @@
+"""Test topic clustering over connections."""
+import json
+
+from synapsescanner.sources import Paper, Connection
+from synapsescanner.clustering import UnionFind, cluster_connections, representative_keywords
+from synapsescanner.exporters.json import JSONExporter
+
+
+def _paper(paper_id, source="arxiv", keywords=()):
+    return Paper(id=paper_id, title=f"Paper {paper_id}", source=source, keywords=list(keywords))
+
+
+def _link(a, b, strength=5):
+    return Connection(paper_a=a, paper_b=b, strength=strength, reason="test")
+
+
+class TestClustering:
+    """Test union-find components and label propagation."""
+    
+    def test_union_find(self):
+        sets = UnionFind(5)
+        sets.union(0, 1)
+        sets.union(3, 4)
+        sets.union(1, 4)
+        assert len({sets.find(i) for i in range(5)}) == 2
+        assert sets.find(0) == sets.find(3) != sets.find(2)
+    
+    def test_components_and_threshold(self):
+        p = [_paper(str(i), "arxiv" if i % 2 else "pubmed", ["qubits", f"k{i}"]) for i in range(6)]
+        connections = [_link(p[0], p[1]), _link(p[1], p[2], 3), _link(p[3], p[4]),
+                       _link(p[4], p[5], 1)]
+        
+        clusters = cluster_connections(connections)
+        assert [sorted(x.id for x in c.papers) for c in clusters] == [["0", "1", "2"], ["3", "4", "5"]]
+        assert clusters[0].connections == 2 and clusters[0].strength == 4.0
+        assert clusters[0].keywords[0] == "qubits"
+        
+        strong = cluster_connections(connections, min_strength=5)
+        assert [sorted(x.id for x in c.papers) for c in strong] == [["0", "1"], ["3", "4"]]
+        assert cluster_connections(connections, min_size=4) == []
+    
+    def test_label_propagation_splits_bridged_groups(self):
+        a = [_paper(f"a{i}", "arxiv" if i % 2 else "pubmed") for i in range(4)]
+        b = [_paper(f"b{i}", "arxiv" if i % 2 else "pubmed") for i in range(4)]
+        connections = []
+        for group in (a, b):
+            connections += [_link(x, y, 8) for i, x in enumerate(group) for y in group[i + 1:]]
+        connections.append(_link(a[0], b[0], 1))  # weak bridge
+        
+        assert len(cluster_connections(connections)) == 1
+        communities = cluster_connections(connections, communities=True)
+        assert sorted(sorted(x.id for x in c.papers) for c in communities) == [
+            ["a0", "a1", "a2", "a3"], ["b0", "b1", "b2", "b3"]]
+    
+    def test_representative_keywords(self):
+        papers = [
+            Paper(id="1", title="Quantum error codes", keywords=["Qubits", "noise"]),
+            Paper(id="2", title="Quantum sensing", keywords=["qubits"]),
+        ]
+        assert representative_keywords(papers) == ["qubits", "quantum"]
+        assert representative_keywords(papers[:1], 2) == ["noise", "qubits"]
+    
+    def test_json_export_includes_clusters(self):
+        p = [_paper("1"), _paper("2", "pubmed")]
+        clusters = cluster_connections([_link(p[0], p[1])])
+        data = json.loads(JSONExporter().export(p, clusters=clusters))
+        assert data["cluster_count"] == 1
+        assert data["clusters"][0]["papers"] == [{"id": "1", "source": "arxiv"},
+                                                 {"id": "2", "source": "pubmed"}]
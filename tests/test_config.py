@@ -0,0 +1,44 @@
+"""Test configuration loading."""
+import json
+import sys
+
+from synapsescanner.config import Config
+from synapsescanner.sources import Paper
+
+
+class TestConfig:
+    """Test the YAML subset parser and typed settings."""
+    
+    def test_numbers_from_yaml(self, tmp_path):
+        path = tmp_path / "config.yaml"
+        path.write_text("crossref_min_similarity: 0.3\ncache_busy_timeout: 2.5\n"
+                        "crossref_top_k: 50\nname: inf\n")
+        config = Config(str(path))
+        assert config.crossref_min_similarity == 0.3
+        assert config.cache_busy_timeout == 2.5
+        assert config.crossref_top_k == 50
+        assert config._data["name"] == "inf"
+    
+    def test_tfidf_scan_from_yaml(self, tmp_path, monkeypatch, capsys):
+        from synapsescanner import universal_scanner
+        
+        path = tmp_path / "config.yaml"
+        path.write_text(Config.DEFAULT_CONFIG.replace(
+            "crossref_min_similarity: 0", "crossref_min_similarity: 0.3"))
+        config = Config(str(path))
+        papers = [
+            Paper(id="1", title="Topological qubit braiding", source="arxiv",
+                  keywords=["topological", "qubit", "braiding", "majorana"]),
+            Paper(id="2", title="Majorana qubit braiding", source="pubmed",
+                  keywords=["majorana", "qubit", "braiding", "nanowire"]),
+        ]
+        monkeypatch.setattr(universal_scanner, "get_config", lambda: config)
+        monkeypatch.setattr(universal_scanner, "run_scan", lambda args, config, silent: papers)
+        monkeypatch.setattr(sys, "argv", ["synapsescanner", "qubit", "--json", "--fresh"])
+        
+        universal_scanner.main()
+        out = capsys.readouterr().out
+        # Skip the cursor escape codes around the JSON document
+        output, _ = json.JSONDecoder().raw_decode(out[out.index("{"):])
+        assert "error" not in output
+        assert output["connection_count"] == 1
@@ -1,7 +1,46 @@
 """Test cross-reference engine."""
 import pytest
 from synapsescanner.sources import Paper
-from synapsescanner.crossref import find_connections
+from synapsescanner.crossref import (
+    SPARSE_AVAILABLE, find_connections, find_connections_approx, iter_connections,
+    extract_features, score_features, lsh_params, find_connections_tfidf,
+    DocumentFrequencies, KEYWORDS,
+    CitationIndex, find_citation_trails, normalize_paper_id,
+)
+
+
+def _reference_connection(paper_a, paper_b, keyword_threshold):
+    """The original pairwise scorer, frozen as a reference for the indexed code.
+    
+    Only change: names in the reason are sorted (they used to come in set
+    order, which is not reproducible).
+    """
+    strength = 0
+    reasons = []
+    
+    shared_authors = {a.lower() for a in paper_a.authors} & {b.lower() for b in paper_b.authors}
+    if shared_authors:
+        strength += min(len(shared_authors) * 3, 7)
+        reasons.append(f"Shared authors: {', '.join(sorted(shared_authors)[:3])}")
+    
+    shared_keywords = {k.lower() for k in paper_a.keywords} & {k.lower() for k in paper_b.keywords}
+    if len(shared_keywords) >= keyword_threshold:
+        strength += min(len(shared_keywords), 5)
+        reasons.append(f"Shared keywords: {', '.join(sorted(shared_keywords)[:5])}")
+    
+    common_words = {'the', 'a', 'an', 'and', 'or', 'of', 'in', 'on', 'to', 'for',
+                    'with', 'by', 'from', 'as', 'is', 'are', 'was', 'were',
+                    'study', 'analysis', 'research', 'using', 'based'}
+    shared_title_words = (set(paper_a.title.lower().split()) - common_words) & \
+        (set(paper_b.title.lower().split()) - common_words)
+    if len(shared_title_words) >= 2:
+        strength += min(len(shared_title_words), 3)
+        reasons.append(f"Similar topics: {', '.join(sorted(shared_title_words)[:3])}")
+    
+    strength = min(strength, 10)
+    if strength == 0:
+        return 0, ""
+    return strength, "; ".join(reasons)
 
 
 class TestCrossRef:
@@ -44,3 +83,262 @@ class TestCrossRef:
         assert connections[0].paper_a.id == "1"
         assert connections[0].paper_b.id == "2"
         assert "john smith" in connections[0].reason.lower()
+    
+    def test_matches_pairwise_comparison(self):
+        import random
+        
+        rng = random.Random(7)
+        names = [f"Author {i}" for i in range(15)]
+        words = [f"term{i}" for i in range(20)] + ["the", "study"]
+        sources = ["arxiv", "pubmed", "semantic_scholar"]
+        papers = [
+            Paper(
+                id=str(i),
+                title=" ".join(rng.sample(words, 4)).title(),
+                authors=rng.sample(names, rng.randint(0, 3)),
+                keywords=rng.sample(words, rng.randint(0, 5)),
+                source=rng.choice(sources),
+            )
+            for i in range(60)
+        ]
+        
+        expected = []
+        order = list(dict.fromkeys(p.source for p in papers))
+        for i, source_a in enumerate(order):
+            for source_b in order[i + 1:]:
+                for a in (p for p in papers if p.source == source_a):
+                    for b in (p for p in papers if p.source == source_b):
+                        strength, reason = _reference_connection(a, b, 2)
+                        if strength:
+                            expected.append((a.id, b.id, strength, reason))
+        expected.sort(key=lambda c: c[2], reverse=True)
+        
+        found = [(c.paper_a.id, c.paper_b.id, c.strength, c.reason)
+                 for c in find_connections(papers, keyword_threshold=2)]
+        assert expected and found == expected
+    
+    def test_max_posting_skips_common_features(self):
+        papers = [
+            Paper(id=str(i), title="Paper", authors=["Common Author"],
+                  source="arxiv" if i % 2 else "pubmed")
+            for i in range(6)
+        ]
+        assert len(find_connections(papers)) == 9
+        assert find_connections(papers, max_posting=5) == []
+    
+    def test_features_interned_once(self):
+        papers = [
+            Paper(id="1", title="The Quantum Error Study", authors=["Jane Doe"],
+                  keywords=["Qubits"], source="arxiv"),
+            Paper(id="2", title="Quantum error codes", authors=["JANE  DOE", " "],
+                  keywords=[" qubits"], source="pubmed"),
+        ]
+        (a, b), vocabulary = extract_features(papers)
+        assert a.authors == b.authors and a.keywords == b.keywords
+        assert vocabulary.names(a.title_words) == ["error", "quantum"]
+        assert len(vocabulary) == 5
+        
+        strength, reason = score_features(a, b, 1, vocabulary)
+        assert strength == 6
+        assert reason == ("Shared authors: jane doe; Shared keywords: qubits; "
+                          "Similar topics: error, quantum")
+    
+    def test_approximate_mode_rescored_exactly(self):
+        import random
+        
+        rng = random.Random(3)
+        words = [f"term{i}" for i in range(200)]
+        papers = []
+        for i in range(40):
+            # Pairs of near-duplicate papers across two sources
+            keywords = rng.sample(words, 8) if i % 2 == 0 else papers[-1].keywords[:7] + ["extra"]
+            papers.append(Paper(id=str(i), title=f"Paper {i}", keywords=keywords,
+                                source="arxiv" if i % 2 == 0 else "pubmed"))
+        
+        exact = [(c.paper_a.id, c.paper_b.id, c.strength, c.reason)
+                 for c in find_connections(papers)]
+        approx = [(c.paper_a.id, c.paper_b.id, c.strength, c.reason)
+                  for c in find_connections_approx(papers, similarity=0.5, num_perm=128)]
+        assert approx and set(approx) <= set(exact)
+        assert {(str(i), str(i + 1)) for i in range(0, 40, 2)} <= {c[:2] for c in approx}
+    
+    def test_lsh_params(self):
+        bands, rows = lsh_params(0.5, 128)
+        assert bands * rows == 128
+        assert abs((1 / bands) ** (1 / rows) - 0.5) < 0.1
+    
+    def test_approximate_mode_rejects_bad_bands(self):
+        papers = [Paper(id="1", title="Paper 1", keywords=["a", "b"], source="arxiv")]
+        for bands in (0, -1, 65):
+            with pytest.raises(ValueError):
+                find_connections_approx(papers, num_perm=64, bands=bands)
+        assert find_connections_approx(papers, num_perm=64, bands=64) == []
+    
+    @pytest.mark.skipif(not SPARSE_AVAILABLE, reason="numpy/scipy not installed")
+    def test_vectorized_backend_matches(self):
+        import random
+        
+        rng = random.Random(11)
+        names = [f"Author {i}" for i in range(30)]
+        words = [f"term{i}" for i in range(40)]
+        papers = [
+            Paper(id=str(i), title=" ".join(rng.sample(words, 5)),
+                  authors=rng.sample(names, 2), keywords=rng.sample(words, 6),
+                  source=rng.choice(["arxiv", "pubmed", "biorxiv"]))
+            for i in range(80)
+        ]
+        for options in ({}, {"keyword_threshold": 0}, {"max_posting": 6}):
+            python = find_connections(papers, vectorized=False, **options)
+            vectorized = find_connections(papers, vectorized=True, **options)
+            assert [(c.paper_a.id, c.paper_b.id, c.reason) for c in vectorized] == \
+                   [(c.paper_a.id, c.paper_b.id, c.reason) for c in python]
+    
+    @pytest.mark.skipif(SPARSE_AVAILABLE, reason="numpy/scipy installed")
+    def test_vectorized_requires_numpy(self):
+        with pytest.raises(ImportError):
+            find_connections([], vectorized=True)
+    
+    def test_top_k_matches_full_ranking(self):
+        import random
+        
+        rng = random.Random(5)
+        names = [f"Author {i}" for i in range(10)]
+        words = [f"term{i}" for i in range(15)]
+        papers = [
+            Paper(id=str(i), title=" ".join(rng.sample(words, 4)),
+                  authors=rng.sample(names, 2), keywords=rng.sample(words, 5),
+                  source=rng.choice(["arxiv", "pubmed", "biorxiv"]))
+            for i in range(50)
+        ]
+        key = lambda connections: [(c.paper_a.id, c.paper_b.id, c.strength) for c in connections]
+        full = find_connections(papers)
+        assert len(full) > 20
+        for k in (1, 7, 20, len(full) + 5):
+            assert key(find_connections(papers, top_k=k)) == key(full)[:k]
+        
+        strong = find_connections(papers, min_strength=6)
+        assert key(strong) == [c for c in key(full) if c[2] >= 6]
+        
+        lazy = list(iter_connections(papers))
+        assert sorted(key(lazy)) == sorted(key(full))
+    
+    def test_process_pool_matches_serial(self):
+        import random
+        
+        rng = random.Random(9)
+        names = [f"Author {i}" for i in range(12)]
+        words = [f"term{i}" for i in range(20)]
+        papers = [
+            Paper(id=str(i), title=" ".join(rng.sample(words, 4)),
+                  authors=rng.sample(names, 2), keywords=rng.sample(words, 5),
+                  source=rng.choice(["arxiv", "pubmed", "biorxiv"]))
+            for i in range(60)
+        ]
+        key = lambda connections: [(c.paper_a.id, c.paper_b.id, c.strength, c.reason)
+                                   for c in connections]
+        serial = find_connections(papers, vectorized=False)
+        assert key(find_connections(papers, workers=2)) == key(serial)
+        assert key(find_connections(papers, workers=2, top_k=10)) == key(serial)[:10]
+    
+    def test_tfidf_matches_all_pairs_cosine(self):
+        import math
+        import random
+        
+        rng = random.Random(5)
+        names = [f"Author {i}" for i in range(30)]
+        words = [f"term{i}" for i in range(40)]
+        papers = [
+            Paper(id=str(i), title=" ".join(rng.sample(words, 3)),
+                  authors=rng.sample(names, 2),
+                  keywords=["model"] + rng.sample(words, rng.randint(1, 6)),
+                  source=rng.choice(["arxiv", "pubmed", "biorxiv"]))
+            for i in range(80)
+        ]
+        features, vocabulary = extract_features(papers)
+        df = DocumentFrequencies.from_features(features, vocabulary)
+        vectors = []
+        for f in features:
+            weights = {(kind, v): df.idf(kind, vocabulary.terms[v])
+                       for kind, values in enumerate(f.kinds()) for v in values}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            vectors.append({t: w / norm for t, w in weights.items()})
+        
+        for threshold in (0.2, 0.35, 0.6):
+            expected = set()
+            for i in range(len(papers)):
+                for j in range(i + 1, len(papers)):
+                    if papers[i].source == papers[j].source:
+                        continue
+                    cosine = sum(w * vectors[j].get(t, 0) for t, w in vectors[i].items())
+                    if cosine >= threshold:
+                        expected.add(frozenset((i, j)))
+            found = find_connections_tfidf(papers, threshold)
+            assert {frozenset((int(c.paper_a.id), int(c.paper_b.id))) for c in found} == expected
+            assert [c.strength for c in found] == sorted((c.strength for c in found), reverse=True)
+        
+        assert len(find_connections_tfidf(papers, 0.2, top_k=5)) == 5
+    
+    def test_tfidf_discounts_common_terms(self):
+        common = ["model", "system", "data"]
+        papers = [
+            Paper(id="1", title="Study", keywords=common + ["lasers"], source="arxiv"),
+            Paper(id="2", title="Study", keywords=common + ["enzymes"], source="pubmed"),
+            Paper(id="3", title="Study", keywords=common + ["axion"], source="arxiv"),
+            Paper(id="4", title="Study", keywords=common + ["axion"], source="pubmed"),
+        ]
+        # Every cross-source pair shares three keywords, but only rare ones matter
+        assert len(find_connections(papers)) == 4
+        doc_freq = DocumentFrequencies(
+            num_docs=1000, counts={(KEYWORDS, term): 900 for term in common})
+        found = find_connections_tfidf(papers, 0.5, doc_freq=doc_freq)
+        assert [(c.paper_a.id, c.paper_b.id) for c in found] == [("3", "4")]
+        assert found[0].reason.startswith("TF-IDF similarity") and "axion" in found[0].reason
+
+
+class TestCitationTrails:
+    """Test indexed citation trails."""
+    
+    def test_normalize_paper_id(self):
+        assert normalize_paper_id("arXiv:2301.01234v2") == "2301.01234"
+        assert normalize_paper_id("https://arxiv.org/pdf/2301.01234v1.pdf") == "2301.01234"
+        assert normalize_paper_id("https://doi.org/10.1101/X.1") == "10.1101/x.1"
+        assert normalize_paper_id("DOI:10.1101/x.1") == "10.1101/x.1"
+        assert normalize_paper_id("PMID:12345") == "12345"
+    
+    def test_trails_match_across_id_spellings(self):
+        a = Paper(id="2301.01234v1", title="A", source="arxiv",
+                  references=["10.1101/b", "10.1101/b", "arXiv:2301.01234"])
+        b = Paper(id="doi:10.1101/B", title="B", source="biorxiv",
+                  references=["https://arxiv.org/abs/2301.05555"])
+        c = Paper(id="2301.05555", title="C", source="arxiv")
+        
+        trails = find_citation_trails([a, b, c])
+        # Duplicate references collapse, self-citations are dropped
+        assert [(x.title, y.title) for x, y in trails] == [("A", "B"), ("B", "C")]
+        
+        index = CitationIndex([a, b, c])
+        assert index.find("https://doi.org/10.1101/b") is b
+        assert index.adjacency() == {
+            ("2301.01234v1", "arxiv"): [("doi:10.1101/B", "biorxiv")],
+            ("doi:10.1101/B", "biorxiv"): [("2301.05555", "arxiv")],
+        }
+    
+    def test_multi_hop_paths(self):
+        papers = [Paper(id=str(i), title=str(i), source="arxiv") for i in range(5)]
+        # 0 -> 1 -> 2 -> 3 -> 4, plus a shortcut 0 -> 2 and a cycle 3 -> 0
+        for i, refs in enumerate([["1", "2"], ["2"], ["3"], ["4", "0"], []]):
+            papers[i].references = refs
+        index = CitationIndex(papers)
+        
+        titles = lambda trail: [p.title for p in trail]
+        paths = [titles(t) for t in index.paths(min_hops=2, max_hops=2, start=papers[0])]
+        assert paths == [["0", "1", "2"], ["0", "2", "3"]]
+        
+        everything = [titles(t) for t in index.paths(min_hops=1, max_hops=10)]
+        assert all(len(set(t)) == len(t) for t in everything)
+        assert ["0", "1", "2", "3", "4"] in everything
+        assert len(list(index.paths(min_hops=1, limit=3))) == 3
+        
+        assert titles(index.shortest_path(papers[0], papers[3])) == ["0", "2", "3"]
+        assert index.shortest_path(papers[0], papers[4], max_hops=2) is None
+        assert index.shortest_path(papers[4], papers[0]) is None
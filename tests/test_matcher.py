@@ -0,0 +1,33 @@
+"""Test the multi-pattern matcher."""
+import random
+
+import pytest
+from synapsescanner.matcher import MultiPatternMatcher
+
+
+class TestMultiPatternMatcher:
+    """Test Aho-Corasick matching against str.count semantics."""
+    
+    @pytest.mark.parametrize("automaton", [True, False])
+    def test_counts_match_str_count(self, automaton):
+        rng = random.Random(4)
+        for _ in range(300):
+            patterns = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4)))
+                        for _ in range(rng.randint(1, 8))]
+            text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 40)))
+            matcher = MultiPatternMatcher(patterns, automaton=automaton)
+            expected = {p: text.count(p) for p in patterns if p in text}
+            assert matcher.counts(text) == expected
+            assert matcher.found(text) == set(expected)
+    
+    def test_overlaps_and_case(self):
+        matcher = MultiPatternMatcher(["aa", "spin", "spintronics", "AI"], automaton=True)
+        # Non-overlapping per pattern, overlapping across patterns
+        assert matcher.counts("aaaa spintronics") == {"aa": 2, "spin": 1, "spintronics": 1}
+        assert matcher.found("machine learning ai") == set()
+    
+    def test_strategy_and_validation(self):
+        assert not MultiPatternMatcher(["a", "b"]).automaton
+        assert MultiPatternMatcher([f"term{i}" for i in range(200)]).automaton
+        with pytest.raises(ValueError):
+            MultiPatternMatcher(["ok", ""])
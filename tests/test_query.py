@@ -0,0 +1,55 @@
+"""Test canonical query normalization."""
+import pytest
+from synapsescanner.query import canonicalize_query
+from synapsescanner.cache import Cache
+from synapsescanner.sources import Paper
+
+
+class TestCanonicalizeQuery:
+    """Test canonicalize_query."""
+    
+    def test_case_whitespace_and_order(self):
+        variants = ["Quantum Entanglement", "quantum  entanglement",
+                    "entanglement quantum", "  QUANTUM\tentanglement "]
+        assert {canonicalize_query(v) for v in variants} == {"entanglement quantum"}
+    
+    def test_operators_and_phrases_keep_structure(self):
+        assert canonicalize_query('Quantum OR "Time  Crystal"') == 'quantum OR "time crystal"'
+        assert canonicalize_query("(a OR b) AND c") == "( a OR b ) AND c"
+    
+    def test_lowercase_operators_are_terms(self):
+        # PubMed and arXiv search for a lowercase "or"/"not" as a word
+        assert canonicalize_query("cats or dogs") == "cats dogs or"
+        assert canonicalize_query("cats or dogs") != canonicalize_query("cats OR dogs")
+        assert canonicalize_query("quantum not classical", "pubmed") == "classical not quantum"
+        assert canonicalize_query("(a OR b) and c") == "( a OR b ) and c"
+    
+    def test_source_specific_rules(self):
+        assert canonicalize_query("all:Quantum Dots", "arxiv") == "dots quantum"
+        assert canonicalize_query("all:quantum all:spin", "arxiv") == "quantum spin"
+        assert canonicalize_query("spin ALL:quantum", "arxiv") == "quantum spin"
+        # Other fields keep their place
+        assert canonicalize_query("ti:spin au:smith", "arxiv") == "ti:spin au:smith"
+        # bioRxiv matches the query as a phrase, so order is preserved
+        assert canonicalize_query("Gene  Editing", "biorxiv") == "gene editing"
+    
+    def test_field_tags_keep_term_order(self):
+        # Sorting would turn "smith j" into a different author search
+        assert canonicalize_query("smith j[au] 2020[dp]", "pubmed") == "smith j[au] 2020[dp]"
+        assert canonicalize_query('"Machine  Learning"[MH] review', "pubmed") == \
+            '"machine learning"[mh] review'
+        assert canonicalize_query("cancer[MeSH  Terms]", "pubmed") == "cancer[mesh terms]"
+    
+    def test_empty(self):
+        assert canonicalize_query("") == ""
+        assert canonicalize_query(None) == ""
+
+
+class TestCacheKeys:
+    """Equivalent queries share one cache entry."""
+    
+    def test_equivalent_queries_hit_same_entry(self, tmp_path):
+        cache = Cache(str(tmp_path / "cache.db"))
+        cache.save_papers([Paper(id="1", title="T", source="arxiv")])
+        cache.record_query("Quantum Entanglement", "arxiv", 10, 1)
+        assert cache.get_cached("entanglement   quantum", "arxiv") is not None
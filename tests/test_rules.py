@@ -0,0 +1,103 @@
+"""Test the breakthrough pattern rule registry."""
+import json
+import os
+
+import pytest
+from synapsescanner.matcher import MultiPatternMatcher
+from synapsescanner.rules import DEFAULT_RULES, RuleSet, get_rules
+
+
+class TestRules:
+    """Test rule loading, weighting and the mtime-keyed cache."""
+    
+    def test_defaults_without_file(self, tmp_path):
+        rules = get_rules(str(tmp_path / "missing.json"))
+        assert [r.pattern for r in rules.rules] == [r["pattern"] for r in DEFAULT_RULES]
+        fired, counts = rules.scan("entangled? no: entanglement of a spin lattice")
+        assert [r.pattern for r in fired] == ["Quantum breakthrough"]
+        assert counts == {"entanglement": 1, "spin": 1, "lattice": 1}
+        assert rules.get("AI physics").icon == "◆"
+        # The uppercase trigger never matches lowercased text
+        assert rules.scan("ai")[0] == []
+    
+    def test_weights_threshold_and_overrides(self):
+        rules = RuleSet.from_dict({
+            "keywords": ["graphene"],
+            "rules": [
+                {"pattern": "Graphene transistor", "threshold": 1.5,
+                 "triggers": ["graphene", {"term": "transistor", "weight": 0.5}]},
+                {"pattern": "Metamaterial lens", "triggers": ["cloak"]},
+            ],
+        })
+        assert len(rules) == 5
+        assert rules.scan("graphene sheet")[0] == []
+        fired, counts = rules.scan("a graphene transistor")
+        assert [r.pattern for r in fired] == ["Graphene transistor"]
+        assert counts == {"graphene": 1}
+        assert [r.pattern for r in rules.scan("metamaterial cloak")[0]] == ["Metamaterial lens"]
+        
+        only = RuleSet.from_dict({"defaults": False, "rules": [{"pattern": "X", "triggers": ["x"]}]})
+        assert [r.pattern for r in only.rules] == ["X"] and only.keywords == []
+        assert only.version != rules.version
+    
+    def test_scan_same_with_and_without_automaton(self):
+        rules = RuleSet.from_dict({"keywords": ["spin"]})
+        automaton = RuleSet.from_dict({"keywords": ["spin"]})
+        automaton.matcher = MultiPatternMatcher(automaton.matcher.patterns, automaton=True)
+        assert not rules.matcher.automaton
+        for text in ["", "spin spin lattice", "temporal metamaterial with neural spins",
+                     "quantum machine learning of dark matter plasma"]:
+            fired, counts = rules.scan(text)
+            assert (fired, counts) == automaton.scan(text)
+    
+    def test_file_terms_match_lowercased_text(self):
+        rules = RuleSet.from_dict({
+            "keywords": ["Graphene"],
+            "rules": [{"pattern": "G", "triggers": ["Graphene", {"term": "Qubit", "weight": 2}]}],
+        })
+        fired, counts = rules.scan("graphene qubit")
+        assert [r.pattern for r in fired] == ["G"]
+        assert counts == {"graphene": 1}
+        assert rules.get("G").triggers == {"graphene": 1.0, "qubit": 2.0}
+        # Built-in rules are left as they are
+        assert "AI" in rules.get("AI physics").triggers
+    
+    def test_malformed_rules(self, tmp_path):
+        for bad in [
+            {"rules": [{"pattern": "No triggers"}]},
+            {"rules": [{"triggers": ["x"]}]},
+            {"rules": {"pattern": "X", "triggers": ["x"]}},
+            {"rules": ["X"]},
+            {"rules": [{"pattern": "X", "triggers": "x"}]},
+            {"rules": [{"pattern": "X", "triggers": [{"term": "x", "weight": None}]}]},
+            {"rules": [{"pattern": "X", "triggers": ["x"], "threshold": "high"}]},
+            {"keywords": "graphene"},
+            {"keywords": [1]},
+        ]:
+            with pytest.raises(ValueError):
+                RuleSet.from_dict(bad)
+    
+    def test_invalid_file_falls_back_to_defaults(self, tmp_path, capsys):
+        path = tmp_path / "rules.json"
+        for content in ["{bad", json.dumps({"rules": [{"pattern": "No triggers"}]})]:
+            path.write_text(content)
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            rules = get_rules(str(path))
+            assert [r.pattern for r in rules.rules] == [r["pattern"] for r in DEFAULT_RULES]
+            assert "Ignoring invalid rule file" in capsys.readouterr().err
+        # Warned once per version of the file
+        assert get_rules(str(path)) is rules
+        assert capsys.readouterr().err == ""
+    
+    def test_reloads_only_when_file_changes(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps({"rules": [{"pattern": "A", "triggers": ["a"]}]}))
+        first = get_rules(str(path))
+        assert get_rules(str(path)) is first
+        
+        path.write_text(json.dumps({"rules": [{"pattern": "B", "triggers": ["bb"]}]}))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = get_rules(str(path))
+        assert second is not first and second.get("B") and not second.get("A")
@@ -0,0 +1,120 @@
+"""Test the streaming term sketches."""
+import json
+import random
+from collections import Counter
+
+import pytest
+from synapsescanner.sketches import CountMinSketch, SpaceSaving, TermSketch, paper_terms
+from synapsescanner.sources import Paper
+
+
+def _stream(seed=7, length=5000, vocabulary=500):
+    """Zipf-like stream of terms: a few heavy hitters and a long tail."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return rng.choices([f"term{i}" for i in range(vocabulary)], weights, k=length)
+
+
+def _paper(i, abstract):
+    return Paper(id=str(i), title="", abstract=abstract, authors=[],
+                 published="2026-01-01", url="", pdf_url="", source="arxiv")
+
+
+class TestCountMinSketch:
+    """Test Count-Min estimates and merging."""
+    
+    def test_estimates_bound_true_counts(self):
+        stream = _stream()
+        exact = Counter(stream)
+        sketch = CountMinSketch(width=256, depth=4)
+        for term in stream:
+            sketch.add(term)
+        
+        assert sketch.total == len(stream)
+        for term, count in exact.items():
+            estimate = sketch.estimate(term)
+            assert count <= estimate <= count + 3 * len(stream) // 256
+        assert sketch.estimate("never seen") <= 3 * len(stream) // 256
+    
+    def test_merge_equals_single_stream(self):
+        stream = _stream()
+        whole, left, right = CountMinSketch(), CountMinSketch(), CountMinSketch()
+        for i, term in enumerate(stream):
+            whole.add(term)
+            (left if i % 2 else right).add(term)
+        merged = left.merge(right)
+        assert merged.to_dict() == whole.to_dict()
+        
+        with pytest.raises(ValueError):
+            whole.merge(CountMinSketch(seed=1))
+
+
+class TestSpaceSaving:
+    """Test Space-Saving heavy hitters in bounded memory."""
+    
+    def test_heavy_hitters_within_error(self):
+        stream = _stream()
+        exact = Counter(stream)
+        summary = SpaceSaving(capacity=50)
+        for term in stream:
+            summary.add(term)
+        
+        assert len(summary) == 50
+        top = summary.top(3)
+        assert [term for term, _, _ in top] == [term for term, _ in exact.most_common(3)]
+        for term, count, error in summary.top(50):
+            assert count - error <= exact[term] <= count
+        # Anything above N / capacity must be kept
+        for term, count in exact.items():
+            if count > len(stream) / 50:
+                assert term in summary.counts
+    
+    def test_merge_keeps_guarantees(self):
+        stream = _stream(length=8000)
+        exact = Counter(stream)
+        shards = [SpaceSaving(capacity=50) for _ in range(4)]
+        for i, term in enumerate(stream):
+            shards[i % 4].add(term)
+        
+        merged = shards[0]
+        for shard in shards[1:]:
+            merged = merged.merge(shard)
+        assert len(merged) <= 50
+        for term, count, error in merged.top(10):
+            assert count - error <= exact[term] <= count
+        assert merged.top(3)[0][0] == exact.most_common(1)[0][0]
+
+
+class TestTermSketch:
+    """Test trending terms over papers."""
+    
+    def test_counts_papers_not_mentions(self):
+        papers = [
+            _paper(1, "graphene graphene graphene transistor"),
+            _paper(2, "Graphene spintronics, with the data."),
+            _paper(3, "spintronics"),
+        ]
+        assert paper_terms(papers[1]) == {"graphene", "spintronics"}
+        
+        sketch = TermSketch().add_papers(papers)
+        assert sketch.papers == 3
+        assert sketch.top(2) == [("graphene", 2), ("spintronics", 2)]
+        assert sketch.estimate("transistor") == 1
+    
+    def test_fixed_size_merge_and_round_trip(self):
+        rng = random.Random(3)
+        stream = _stream(length=20000, vocabulary=3000)
+        papers = [_paper(i, " ".join(rng.sample(stream, 8))) for i in range(400)]
+        
+        left = TermSketch(capacity=40).add_papers(papers[:200])
+        right = TermSketch(capacity=40).add_papers(papers[200:])
+        assert len(left.heavy) <= 40
+        
+        merged = left.merge(right)
+        whole = TermSketch(capacity=40).add_papers(papers)
+        assert merged.papers == 400
+        assert merged.counts.to_dict() == whole.counts.to_dict()
+        assert merged.top(3)[0] == whole.top(3)[0]
+        
+        restored = TermSketch.from_dict(json.loads(json.dumps(merged.to_dict())))
+        assert restored.top(10) == merged.top(10)
@@ -50,6 +50,19 @@ class TestPaper:
         paper = Paper.from_dict(data)
         assert paper.id == "1234.5678"
         assert paper.citations == 10
+    
+    def test_normalized_text_cached(self):
+        paper = Paper(id="1", title="Quantum Dots", abstract="Bright  Emitters")
+        assert paper.text == "quantum dots bright  emitters"
+        assert paper.tokens == ("quantum", "dots", "bright", "emitters")
+        assert paper.title_words == {"quantum", "dots"}
+        assert paper.text is paper.text
+        
+        # Replacing the title or abstract invalidates the cached views
+        paper.title = "Spin Chains"
+        assert paper.tokens[:2] == ("spin", "chains")
+        assert paper == Paper(id="1", title="Spin Chains", abstract="Bright  Emitters")
+        assert "_derived" not in repr(paper)
 
 
 class TestSources: